@@ -1,8 +1,23 @@
-from task1.task1_human_vs_llm import human_as_questioner, human_as_answerer
-from task2.task2_llm_vs_llm import play_llm_vs_llm
+"""
+Twenty Questions command line.
 
+    python -m app.app_cli                      interactive menu
+    python -m app.app_cli run-tournament --games 100 --workers 8 --out runs/mini.tqlog
+    python -m app.app_cli eval --log runs/*.tqlog
+    python -m app.app_cli run-tournament --replay runs/mini.tqcas
+
+Only argparse is imported up front; the game engine, HTTP client and .env
+are loaded by the subcommand that needs them, so --help returns at once.
+"""
+import argparse
+import os
+import sys
+
+
+def interactive() -> None:
+    from task1.task1_human_vs_llm import human_as_answerer, human_as_questioner, prompt_speculative
+    from task2.task2_llm_vs_llm import play_llm_vs_llm
 
-def main():
     print("\n===================================================")
     print(" TWENTY QUESTIONS FOR ARTIICIAL LABS          ")
     print("===================================================\n")
@@ -19,7 +34,7 @@ def main():
         if choice == "1":
             human_as_questioner()
         elif choice == "2":
-            human_as_answerer()
+            human_as_answerer(speculative=prompt_speculative())
         elif choice == "3":
             play_llm_vs_llm()
         elif choice == "4":
@@ -29,5 +44,123 @@ def main():
             print("Invalid choice. Please try again.\n")
 
 
+def run_tournament_command(args) -> int:
+    from common.game_log import GameLogWriter
+    from common.llm_client import DEFAULT_MODEL, LLMClient
+    from common.tournament import run_tournament
+
+    model = args.model or DEFAULT_MODEL
+    server = None
+    client_kwargs = {}
+    cassette = None
+    secrets = args.secrets
+    if args.record or args.replay:
+        from common.cassette import RECORD, REPLAY, Cassette
+
+        cassette = Cassette(args.record or args.replay, RECORD if args.record else REPLAY)
+        client_kwargs["cassette"] = cassette
+        if args.replay and not secrets:
+            # The secrets were drawn locally while recording; replay needs the same ones
+            secrets = cassette.recorded_secrets()
+            if secrets is None:
+                cassette.close()
+                print(f"{args.replay} has no recorded secrets; pass --secrets.", file=sys.stderr)
+                return 2
+    if args.mock and not args.replay:
+        # Offline run against the local mock Responses API
+        from common.mock_server import MockConfig, MockResponsesServer
+
+        os.environ.setdefault("CANDIDATE_API_KEY", "offline-mock")
+        server = MockResponsesServer(MockConfig(latency_median=args.mock_latency)).start()
+        client_kwargs["base_url"] = server.url
+
+    questioner = {}
+    if args.candidates:
+        from common.question_candidates import CandidateQuestioner
+
+        questioner["questioner"] = CandidateQuestioner(args.candidates)
+    log = GameLogWriter(args.out, model=model) if args.out else None
+    llm = LLMClient(model=model, pool_size=args.workers, share_pool=False, **client_kwargs)
+    try:
+        report = run_tournament(
+            args.games,
+            workers=args.workers,
+            secrets=secrets,
+            llm=llm,
+            max_questions=args.max_questions,
+            stream=args.stream,
+            game_log=log,
+            token_budgets=args.token_budgets,
+            **questioner,
+        )
+        if args.record:
+            cassette.record_secrets([r.secret_object for r in report.results])
+    finally:
+        llm.close()
+        if log is not None:
+            log.close()
+        if server is not None:
+            server.stop()
+        if cassette is not None:
+            cassette.close()
+    print(report.summary())
+    if questioner:
+        print(questioner["questioner"].stats.summary())
+    if cassette is not None:
+        print(f"Cassette: {cassette.stats}")
+    return 1 if report.num_errors == report.num_games else 0
+
+
+def eval_command(args) -> int:
+    from common.evaluator import evaluate_logs, format_table
+
+    aggregates = evaluate_logs(args.log, workers=args.workers)
+    print(format_table(aggregates))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="app_cli", description="Twenty Questions: interactive games and batch runs."
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    play = sub.add_parser("play", help="interactive menu (the default)")
+    play.set_defaults(func=lambda _args: interactive())
+
+    tour = sub.add_parser("run-tournament", help="play LLM-vs-LLM games headless")
+    tour.add_argument("--games", type=int, default=10)
+    tour.add_argument("--workers", type=int, default=4)
+    tour.add_argument("--model", help="model for both players (default: the client's)")
+    tour.add_argument("--out", help="append games to this binary game log")
+    tour.add_argument("--secrets", nargs="+", help="cycle through these secrets")
+    tour.add_argument("--max-questions", type=int, default=20)
+    tour.add_argument("--stream", action="store_true", help="stream answers, exit early")
+    tour.add_argument("--candidates", type=int, default=0, metavar="K", help="K questions per call")
+    tour.add_argument(
+        "--token-budgets", metavar="PATH", help="learn output budgets per call site, kept in PATH"
+    )
+    tour.add_argument("--mock", action="store_true", help="use the local mock API (no key)")
+    tour.add_argument("--mock-latency", type=float, default=0.0, help="mock seconds per call")
+    tape = tour.add_mutually_exclusive_group()
+    tape.add_argument("--record", metavar="PATH", help="record all LLM traffic to a cassette")
+    tape.add_argument("--replay", metavar="PATH", help="serve LLM calls from a cassette (offline)")
+    tour.set_defaults(func=run_tournament_command)
+
+    ev = sub.add_parser("eval", help="Task 3 metrics for game logs, one row per model")
+    ev.add_argument("--log", nargs="+", required=True)
+    ev.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ev.set_defaults(func=eval_command)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        interactive()
+        return 0
+    return args.func(args) or 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
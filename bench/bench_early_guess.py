@@ -0,0 +1,114 @@
+"""
+Early-guess threshold sweep: calls saved per game vs questioner win rate.
+
+    python -m bench.bench_early_guess --thresholds 0.6 0.8 0.9 0.99 --noise 0.05
+
+Plays every object in the attribute dataset with the information-gain
+questioner against the matrix oracle (answers flipped with probability
+--noise), once without an early-guess policy and once per threshold. LLM
+fallbacks go to the local mock server, so no API key is needed.
+"""
+import argparse
+import os
+import random
+import threading
+
+from common.attribute_oracle import AttributeMatrix, OracleAnswerer
+from common.early_guess import EarlyGuessPolicy, PosteriorConfidence
+from common.info_gain import InfoGainQuestioner
+from common.llm_client import LLMClient
+from common.mock_server import MockConfig, MockResponsesServer
+from common.tournament import run_tournament
+
+
+class NoisyAnswerer:
+    """
+    Oracle answers, each flipped with probability `noise`.
+    """
+
+    def __init__(self, oracle: OracleAnswerer, noise: float, seed: int):
+        self.oracle = oracle
+        self.noise = noise
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, llm, secret, question):
+        answer = self.oracle(llm, secret, question)
+        with self._lock:
+            flip = self._rng.random() < self.noise
+        if flip:
+            return "no" if answer == "yes" else "yes"
+        return answer
+
+
+def run_sweep(llm, matrix, thresholds, noise, penalty, rounds, workers, seed) -> list:
+    secrets = matrix.objects * rounds
+    rows = []
+    for threshold in [None] + list(thresholds):
+        questioner = InfoGainQuestioner(matrix)
+        policy = None
+        if threshold is not None:
+            policy = EarlyGuessPolicy(
+                PosteriorConfidence(matrix), threshold=threshold, penalty=penalty
+            )
+        report = run_tournament(
+            len(secrets),
+            workers=workers,
+            secrets=secrets,
+            llm=llm,
+            answerer=NoisyAnswerer(OracleAnswerer(matrix), noise, seed),
+            questioner=questioner,
+            guesser=questioner.final_guess,
+            early_guess=policy,
+        )
+        rows.append(
+            {
+                "threshold": "off" if threshold is None else threshold,
+                "win_rate": report.questioner_win_rate,
+                "avg_turns": report.avg_turns,
+                "avg_calls_saved": report.avg_calls_saved,
+                "wrong_early_guesses": report.wrong_early_guesses,
+            }
+        )
+    baseline = rows[0]["win_rate"]
+    for row in rows:
+        row["win_rate_delta"] = row["win_rate"] - baseline
+    return rows
+
+
+def main(argv=None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.8, 0.9, 0.99])
+    parser.add_argument("--noise", type=float, default=0.05, help="answer flip probability")
+    parser.add_argument("--penalty", type=int, default=None, help="questions forfeited per wrong early guess")
+    parser.add_argument("--rounds", type=int, default=1, help="games per dataset object")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("CANDIDATE_API_KEY", "offline-benchmark")
+    matrix = AttributeMatrix.load()
+    with MockResponsesServer(MockConfig(latency_median=0, seed=args.seed)) as server:
+        llm = LLMClient(base_url=server.url, pool_size=args.workers, share_pool=False)
+        try:
+            rows = run_sweep(
+                llm, matrix, args.thresholds, args.noise, args.penalty,
+                args.rounds, args.workers, args.seed,
+            )
+        finally:
+            llm.close()
+
+    print(f"{'threshold':>10} {'win rate':>9} {'delta':>7} {'turns':>6} {'saved':>6} {'wrong':>6}")
+    for row in rows:
+        threshold = row["threshold"]
+        label = threshold if isinstance(threshold, str) else f"{threshold:.2f}"
+        print(
+            f"{label:>10} {row['win_rate']:>9.1%} {row['win_rate_delta']:>+7.1%} "
+            f"{row['avg_turns']:>6.1f} {row['avg_calls_saved']:>6.1f} "
+            f"{row['wrong_early_guesses']:>6}"
+        )
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory per finished game: GameResult objects vs CompactGame vs binary log.
+
+    python -m bench.bench_memory --games 20000
+
+Builds synthetic 19-question games whose question strings are fresh
+objects per game (as they are when parsed from LLM replies), keeps them
+alive in each representation and reports bytes per game measured with
+tracemalloc, plus log size and the time to summarise the log via mmap.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from common.game_engine import GameResult
+from common.game_log import CompactGame, GameLogReader, GameLogWriter, StringTable
+from common.mock_server import DEFAULT_OBJECTS, DEFAULT_QUESTIONS
+
+
+def synthetic_results(games: int, questions: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(games):
+        history = [
+            # "".join makes a new str object, like text parsed out of a reply
+            ("".join(rng.choice(DEFAULT_QUESTIONS)), rng.choice(("yes", "no")))
+            for _ in range(questions)
+        ]
+        secret = rng.choice(DEFAULT_OBJECTS)
+        yield GameResult(
+            secret_object="".join(secret),
+            history=history,
+            winner=rng.choice(("player1", "player2")),
+            num_turns=questions,
+            wall_time=rng.random() * 10,
+            final_guess="".join(rng.choice(DEFAULT_OBJECTS)),
+        )
+
+
+def _measure(build) -> tuple:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, after - before
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--questions", type=int, default=19)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    _, result_bytes = _measure(
+        lambda: list(synthetic_results(args.games, args.questions, args.seed))
+    )
+
+    table = StringTable()
+    _, compact_bytes = _measure(
+        lambda: [
+            CompactGame.from_result(r, table)
+            for r in synthetic_results(args.games, args.questions, args.seed)
+        ]
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.tqlog")
+        writer = GameLogWriter(path)
+        for r in synthetic_results(args.games, args.questions, args.seed):
+            writer.append_result(r)
+        writer.close()
+        log_bytes = os.path.getsize(path)
+
+        start = time.perf_counter()
+        with GameLogReader(path) as reader:
+            summary = reader.summarize()
+        scan_seconds = time.perf_counter() - start
+
+    results = {
+        "games": args.games,
+        "result_bytes_per_game": result_bytes / args.games,
+        "compact_bytes_per_game": compact_bytes / args.games,
+        "log_bytes_per_game": log_bytes / args.games,
+        "log_scan_games_per_sec": summary.games / scan_seconds if scan_seconds else 0.0,
+    }
+    for key, value in results.items():
+        print(f"{key:>24}: {value:.1f}" if isinstance(value, float) else f"{key:>24}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
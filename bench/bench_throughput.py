@@ -0,0 +1,170 @@
+"""
+Offline throughput benchmark against the local mock Responses server.
+
+    python -m bench.bench_throughput --games 50 --workers 8 --latency 0.02
+
+Reports games/sec, p50/p99 turn latency and requests per game for full
+LLM-vs-LLM games, plus calls/sec for the individual player functions.
+With --stream, answers and final guesses are streamed and cut off early;
+--tail-chunks/--chunk-delay make the mock keep talking after its reply.
+--secret-pool draws secrets from a SecretPool instead of one object-list
+call per game. --dedup answers through a DedupAnswerer and reports its hit
+rate. --max-inflight caps the mock's concurrency (429 beyond it); --rate
+and --aimd pace the client with a token bucket / AIMD controller.
+--candidates K asks for K questions per call (CandidateQuestioner) instead
+of retrying hint-laden ones; --hint-rate makes the mock produce those.
+"""
+import argparse
+import os
+import time
+from functools import partial
+
+from common.llm_client import LLMClient
+from common.game_models import GameState
+from common.mock_server import MockConfig, MockResponsesServer
+from common.question_index import DedupAnswerer
+from common.rate_limit import ConcurrencyController, LocalTokenBucket
+from common.players import llm_answer_question, llm_choose_secret_object, llm_generate_question
+from common.question_candidates import CandidateQuestioner
+from common.secret_pool import SecretPool
+from common.tournament import run_tournament
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def bench_games(
+    server: MockResponsesServer,
+    llm: LLMClient,
+    games: int,
+    workers: int,
+    stream: bool = False,
+    secret_pool: bool = False,
+    dedup: bool = False,
+    candidates: int = 0,
+) -> dict:
+    pool = SecretPool() if secret_pool else None
+    answerer = llm_answer_question
+    if dedup:
+        answerer = DedupAnswerer(partial(llm_answer_question, stream=stream))
+    questioner = CandidateQuestioner(candidates) if candidates else llm_generate_question
+    before = server.request_count
+    report = run_tournament(
+        games,
+        workers=workers,
+        llm=llm,
+        stream=stream,
+        answerer=answerer,
+        questioner=questioner,
+        choose_secret=pool if pool is not None else llm_choose_secret_object,
+    )
+    if pool is not None:
+        pool.close()
+    turn_times = [t for r in report.results for t in r.turn_times]
+    results = {
+        "games": report.num_games,
+        "games_per_sec": report.num_games / report.wall_time if report.wall_time else 0.0,
+        "turn_p50_ms": _percentile(turn_times, 0.50) * 1000,
+        "turn_p99_ms": _percentile(turn_times, 0.99) * 1000,
+        "requests_per_game": (server.request_count - before) / max(1, report.num_games),
+        "errors": report.num_errors,
+        "rejected_429": server.rejected_count,
+    }
+    if dedup:
+        results["dedup_hit_rate"] = answerer.stats.hit_rate
+        results["dedup_calls_avoided"] = answerer.stats.calls_avoided
+    if candidates:
+        results["retries_avoided"] = questioner.stats.retries_avoided
+        results["question_fallbacks"] = questioner.stats.fallbacks
+        results["question_turn_ms"] = questioner.stats.avg_seconds * 1000
+    return results
+
+
+def bench_player_calls(llm: LLMClient, calls: int, stream: bool = False) -> dict:
+    state = GameState(history=[("Is it alive?", "yes")], num_questions_asked=1)
+    results = {}
+    for name, fn in (
+        ("answer", lambda: llm_answer_question(llm, "cat", "Is it man-made?", stream=stream)),
+        ("question", lambda: llm_generate_question(llm, state)),
+    ):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - start
+        results[f"{name}_calls_per_sec"] = calls / elapsed if elapsed else 0.0
+    return results
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02, help="median seconds per call")
+    parser.add_argument("--sigma", type=float, default=0.5, help="log-normal latency spread")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--truncation-rate", type=float, default=0.0)
+    parser.add_argument("--calls", type=int, default=20, help="player-function calls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stream", action="store_true", help="stream with early exit")
+    parser.add_argument("--tail-chunks", type=int, default=0, help="filler deltas after a reply")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="seconds between deltas")
+    parser.add_argument("--secret-pool", action="store_true", help="pool secret objects")
+    parser.add_argument("--dedup", action="store_true", help="dedup paraphrased questions")
+    parser.add_argument("--max-inflight", type=int, default=0, help="mock concurrency cap")
+    parser.add_argument("--rate", type=float, default=0.0, help="client requests/sec limit")
+    parser.add_argument("--aimd", action="store_true", help="adaptive concurrency control")
+    parser.add_argument("--candidates", type=int, default=0, help="questions per call (k)")
+    parser.add_argument("--hint-rate", type=float, default=0.0, help="mock hint-laden questions")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("CANDIDATE_API_KEY", "offline-benchmark")
+    config = MockConfig(
+        latency_median=args.latency,
+        latency_sigma=args.sigma,
+        error_rate=args.error_rate,
+        truncation_rate=args.truncation_rate,
+        seed=args.seed,
+        stream_chunk_delay=args.chunk_delay,
+        stream_tail_chunks=args.tail_chunks,
+        max_inflight=args.max_inflight,
+        hinted_question_rate=args.hint_rate,
+    )
+    with MockResponsesServer(config) as server:
+        controller = ConcurrencyController(max_limit=max(4, args.workers)) if args.aimd else None
+        llm = LLMClient(
+            base_url=server.url,
+            pool_size=args.workers,
+            share_pool=False,
+            rate_limiter=LocalTokenBucket(args.rate) if args.rate > 0 else None,
+            concurrency=controller,
+        )
+        try:
+            results = bench_games(
+                server,
+                llm,
+                args.games,
+                args.workers,
+                args.stream,
+                args.secret_pool,
+                args.dedup,
+                args.candidates,
+            )
+            results.update(bench_player_calls(llm, args.calls, args.stream))
+            if controller is not None:
+                results["aimd_final_limit"] = controller.limit
+                results["aimd_decreases"] = controller.stats.decreases
+        finally:
+            llm.close()
+
+    for key, value in results.items():
+        print(f"{key:>24}: {value:.2f}" if isinstance(value, float) else f"{key:>24}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
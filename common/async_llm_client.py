@@ -0,0 +1,164 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import requests
+
+from .llm_client import (
+    BASE_URL,
+    DEFAULT_MODEL,
+    DEFAULT_DEADLINE,
+    DEFAULT_MAX_OUTPUT_TOKENS,
+    MAX_RETRIES,
+    CallBookkeeper,
+    build_session,
+    build_payload,
+    parse_response,
+    request_headers,
+    require_api_key,
+)
+from .cassette import Cassette
+from .model_router import ModelRouter
+from .rate_limit import ConcurrencyController, LocalTokenBucket, shared_rate_limiter
+from .resilience import BackoffPolicy, post_with_policies
+from .response_cache import ResponseCache
+from .token_budget import TokenBudgeter
+
+# Upper bound on requests in flight for one client (and one event loop)
+DEFAULT_MAX_CONCURRENCY = 32
+
+
+class AsyncLLMClient:
+    """
+    asyncio counterpart of LLMClient with the same retry semantics:
+    - 'max_output_tokens' incomplete responses are retried with a doubled budget
+    - 429/5xx responses are retried with jittered backoff (Retry-After aware)
+    - other non-200 responses and incomplete statuses raise RuntimeError
+
+    Calls are bounded by a semaphore so hundreds of games can share one
+    event loop without opening hundreds of connections. The HTTP round trip
+    runs on a dedicated pooled session sized to the concurrency limit.
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        budgeter: Optional[TokenBudgeter] = None,
+        base_url: str = BASE_URL,
+        backoff: Optional[BackoffPolicy] = None,
+        deadline: float = DEFAULT_DEADLINE,
+        router: Optional[ModelRouter] = None,
+        rate_limiter: Optional[LocalTokenBucket] = None,
+        concurrency: Optional[ConcurrencyController] = None,
+        cassette: Optional[Cassette] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        replaying = cassette is not None and not cassette.recording
+        self.api_key = "" if replaying else require_api_key()
+        self.model = model
+        self.base_url = base_url
+        self.backoff = backoff or BackoffPolicy()
+        self.deadline = deadline
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.budgeter = budgeter
+        self.router = router
+        # Request pacing; defaults to the host-wide LLM_RATE_LIMIT bucket
+        self.rate_limiter = rate_limiter if rate_limiter is not None else shared_rate_limiter()
+        # Opt-in: AIMD limit on requests in flight
+        self.concurrency = concurrency
+
+        self._owns_session = session is None
+        self.session = session or build_session(pool_size=max_concurrency)
+        if cassette is not None:
+            self.session = cassette.session(None if replaying else self.session)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm-io"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore belongs to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _post(
+        self, payload: dict, headers: dict, deadline_at: float, call_site: Optional[str]
+    ) -> requests.Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: post_with_policies(
+                self.session,
+                self.base_url,
+                payload,
+                headers,
+                deadline_at,
+                self.backoff,
+                call_site=call_site,
+                rate_limiter=self.rate_limiter,
+                concurrency=self.concurrency,
+            ),
+        )
+
+    async def aask(
+        self,
+        messages,
+        max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
+        call_site: Optional[str] = None,
+        deadline: Optional[float] = None,
+        escalation: int = 0,
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """
+        Async version of LLMClient.ask. Returns the first text segment.
+        Hedging is not supported here; concurrency is bounded instead.
+        """
+        args = (messages, max_output_tokens, call_site, deadline, validate)
+        if self.router is None:
+            return await self._aask(self.model, *args)
+        model = self.router.model_for(call_site, escalation, fallback=self.model)
+        with self.router.track(call_site, model):
+            return await self._aask(model, *args)
+
+    async def _aask(
+        self,
+        model: str,
+        messages,
+        max_output_tokens: int,
+        call_site: Optional[str],
+        deadline: Optional[float],
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        book = CallBookkeeper(self, model, messages, max_output_tokens, call_site, validate)
+        cached = book.cached()
+        if cached is not None:
+            return cached
+
+        headers = request_headers(self.api_key)
+
+        async with self._get_semaphore():
+            book.begin()
+            deadline_at = time.monotonic() + (deadline or self.deadline)
+            for attempt in range(MAX_RETRIES):
+                payload = build_payload(model, messages, book.tokens)
+                sent_at = time.perf_counter()
+                resp = await self._post(payload, headers, deadline_at, call_site)
+                book.check_status(resp, sent_at)
+                data = resp.json()
+                if not book.complete(data, attempt):
+                    continue
+                return book.finish(parse_response(data, attempt))
+
+        raise RuntimeError("LLM aask() failed after retries.")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        if self._owns_session:
+            self.session.close()
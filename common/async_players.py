@@ -0,0 +1,130 @@
+"""
+asyncio versions of the player functions in common.players.
+
+Prompts, parsing and fallbacks are shared with the synchronous versions;
+only the LLM round trip is awaited (via AsyncLLMClient.aask).
+"""
+import random
+from typing import Optional
+
+from .async_llm_client import AsyncLLMClient
+from .llm_client import DEFAULT_MAX_OUTPUT_TOKENS
+from . import metrics
+from .game_models import GameState, parse_yes_no
+from .model_router import report_format
+from .players import (
+    FALLBACK_QUESTION,
+    _is_clean_question,
+    _is_guess_line,
+    _is_yes_no,
+    _rule_based_direct_guess,
+    _question_has_bad_hints,
+    _sanitize_question_text,
+    _object_list_messages,
+    _parse_object_list,
+    _secret_object_messages,
+    _answer_messages,
+    _question_messages,
+    _final_guess_messages,
+)
+
+
+async def _allm_propose_object_list(
+    llm: AsyncLLMClient, n: int = 10, escalation: int = 0
+) -> list[str]:
+    text = await llm.aask(
+        _object_list_messages(n),
+        max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+        call_site="object_list",
+        escalation=escalation,
+    )
+    candidates = _parse_object_list(text)
+    report_format(llm, "object_list", escalation, bool(candidates))
+    return candidates
+
+
+async def allm_choose_secret_object(llm: AsyncLLMClient) -> str:
+    """
+    Async version of llm_choose_secret_object.
+    """
+    candidates = await _allm_propose_object_list(llm, n=10)
+
+    if candidates:
+        return random.choice(candidates).strip()
+
+    text = await llm.aask(
+        _secret_object_messages(),
+        max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+        call_site="secret_object",
+        escalation=1,
+    )
+    return text.strip() or "apple"
+
+
+async def allm_answer_question(
+    llm: AsyncLLMClient, secret: Optional[str], question: str
+) -> str:
+    """
+    Async version of llm_answer_question.
+    """
+    rb = _rule_based_direct_guess(secret, question)
+    if rb in {"yes", "no"}:
+        return rb
+
+    messages = _answer_messages(secret, question)
+    for attempt in range(3):
+        text = await llm.aask(
+            messages,
+            max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+            call_site="answer",
+            escalation=attempt,
+            validate=_is_yes_no,
+        )
+        yn = parse_yes_no(text)
+        ok = yn in {"yes", "no"}
+        report_format(llm, "answer", attempt, ok)
+        if ok:
+            return yn
+        metrics.increment("format_retries_total", call_site="answer")
+
+    return "no"
+
+
+async def allm_generate_question(llm: AsyncLLMClient, state: GameState) -> str:
+    """
+    Async version of llm_generate_question.
+    """
+    messages = _question_messages(state)
+    for attempt in range(3):
+        text = await llm.aask(
+            messages,
+            max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+            call_site="question",
+            escalation=attempt,
+            validate=_is_clean_question,
+        )
+        q = _sanitize_question_text(text)
+        ok = not _question_has_bad_hints(q)
+        report_format(llm, "question", attempt, ok)
+        if ok:
+            return q
+        metrics.increment("format_retries_total", call_site="question")
+
+    return FALLBACK_QUESTION
+
+
+async def allm_generate_final_guess(
+    llm: AsyncLLMClient, state: GameState, escalation: int = 0
+) -> str:
+    """
+    Async version of llm_generate_final_guess.
+    """
+    text = await llm.aask(
+        _final_guess_messages(state),
+        max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+        call_site="final_guess",
+        escalation=escalation,
+        validate=_is_guess_line,
+    )
+    report_format(llm, "final_guess", escalation, _is_guess_line(text))
+    return text.strip()
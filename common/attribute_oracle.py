@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .llm_client import LLMClient
+from .players import _normalize_object, _rule_based_direct_guess, llm_answer_question
+
+DEFAULT_DATASET_PATH = os.path.join(
+    os.path.dirname(__file__), "data", "object_attributes.json"
+)
+
+# Negated or compound questions are left to the LLM. Covers negating
+# prefixes and quantifiers too ("non-living", "no legs", "without legs").
+_NEGATION_RE = re.compile(
+    r"\b(not|never|neither|nor|no|without|lack(s|ing|ed)?)\b|n't\b|\bnon-?(?=\w)"
+)
+
+# What may come before an attribute pattern in a normalised question: an
+# auxiliary, the subject and hedging words / articles ("is the object
+# usually a ..."). The pattern has to cover the rest of the question, so
+# "does it eat plants" or "does it have four legs" stay unmapped.
+_QUESTION_FRAME = (
+    r"(?:(?:is|are|does|do|did|can|could|would|will|has|have|was|were|might|may) )?"
+    r"(?:(?:it|this|that|(?:the|this) (?:object|thing|item)) )?"
+    r"(?:(?:usually|typically|commonly|generally|normally|often|mostly|mainly|"
+    r"primarily|always|considered|classified as|kind of|type of|sort of|a|an|the) )*"
+)
+
+
+class AttributeMatrix:
+    """
+    Ground-truth object x attribute table, stored bit-packed:
+    attribute_masks[j] has bit i set when object i has attribute j.
+
+    Questions are mapped to attributes with a single precompiled regex
+    (one named group per attribute) over the normalised question text.
+    A pattern must match everything after the question frame ("is it a",
+    "does it", ...), so it describes what is asked, not a keyword that
+    merely appears. `questions` optionally gives a canonical phrasing per
+    attribute.
+    """
+
+    def __init__(
+        self,
+        objects: Sequence[str],
+        attribute_patterns: Dict[str, Sequence[str]],
+        object_attributes: Dict[str, Sequence[str]],
+        questions: Optional[Dict[str, str]] = None,
+    ):
+        self.objects: List[str] = list(objects)
+        self.attributes: List[str] = list(attribute_patterns)
+        self.questions: Dict[str, str] = dict(questions or {})
+        self.object_index = {_normalize_object(o): i for i, o in enumerate(self.objects)}
+        attr_index = {a: j for j, a in enumerate(self.attributes)}
+
+        self.attribute_masks = [0] * len(self.attributes)
+        for i, obj in enumerate(self.objects):
+            for attr in object_attributes.get(obj, ()):
+                if attr not in attr_index:
+                    raise ValueError(f"Unknown attribute '{attr}' for object '{obj}'.")
+                self.attribute_masks[attr_index[attr]] |= 1 << i
+
+        alternatives = []
+        for j, attr in enumerate(self.attributes):
+            body = "|".join(f"(?:{p})" for p in attribute_patterns[attr])
+            alternatives.append(f"(?P<a{j}>{body})")
+        self._matcher = re.compile(f"{_QUESTION_FRAME}(?:{'|'.join(alternatives)})")
+        self._question_cache: Dict[str, Optional[int]] = {}
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_DATASET_PATH) -> "AttributeMatrix":
+        """
+        Load a dataset of the form
+            {"attributes": {name: [regex, ...]}, "objects": {name: [attr, ...]},
+             "questions": {name: "Is it ...?"}}   # questions is optional
+        """
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        objects = data["objects"]
+        return cls(list(objects), data["attributes"], objects, data.get("questions"))
+
+    @property
+    def all_objects_mask(self) -> int:
+        return (1 << len(self.objects)) - 1
+
+    def match_attribute(self, question: str) -> Optional[int]:
+        """
+        Return the attribute index a question asks about, or None when the
+        question is negated, qualifies the attribute ("four legs", "eat
+        plants") or mentions several attributes.
+        """
+        key = _normalize_object(question)
+        cached = self._question_cache.get(key, -1)
+        if cached != -1:
+            return cached
+
+        attr = None
+        if not _NEGATION_RE.search(question.lower()):
+            m = self._matcher.fullmatch(key)
+            if m is not None:
+                attr = int(m.lastgroup[1:])
+
+        with self._cache_lock:
+            self._question_cache[key] = attr
+        return attr
+
+    def has_attribute(self, obj_index: int, attr_index: int) -> bool:
+        return bool(self.attribute_masks[attr_index] >> obj_index & 1)
+
+    def lookup(self, secret: Optional[str], question: str) -> Optional[str]:
+        """
+        Ground-truth "yes"/"no" for (secret, question), or None if unknown.
+        """
+        if not secret:
+            return None
+        obj = self.object_index.get(_normalize_object(secret))
+        if obj is None:
+            return None
+        attr = self.match_attribute(question)
+        if attr is None:
+            return None
+        return "yes" if self.has_attribute(obj, attr) else "no"
+
+
+@dataclass
+class OracleStats:
+    oracle_answers: int = 0
+    llm_answers: int = 0
+
+    @property
+    def coverage(self) -> float:
+        total = self.oracle_answers + self.llm_answers
+        return self.oracle_answers / total if total else 0.0
+
+
+class OracleAnswerer:
+    """
+    Drop-in replacement for llm_answer_question backed by an AttributeMatrix.
+
+    Direct guesses and mapped attribute questions are answered locally;
+    anything else falls through to the LLM answerer.
+    """
+
+    def __init__(self, matrix: Optional[AttributeMatrix] = None):
+        self.matrix = matrix or AttributeMatrix.load()
+        self.stats = OracleStats()
+        self._lock = threading.Lock()
+
+    def __call__(self, llm: Optional[LLMClient], secret: Optional[str], question: str) -> str:
+        # Matrix first: "Is it an animal?" is a category, not a direct guess
+        answer = self.matrix.lookup(secret, question) or _rule_based_direct_guess(
+            secret, question
+        )
+        if answer is not None:
+            with self._lock:
+                self.stats.oracle_answers += 1
+            return answer
+        if llm is None:
+            raise RuntimeError(f"Oracle cannot answer and no LLM is set: {question!r}")
+        with self._lock:
+            self.stats.llm_answers += 1
+        return llm_answer_question(llm, secret, question)
+
+
+def score_answers(
+    matrix: AttributeMatrix, secret: str, history: Sequence[Tuple[str, str]]
+) -> Tuple[int, int]:
+    """
+    Count (correct, checkable) answers in a game history against ground truth.
+    Questions the matrix cannot map are not counted.
+    """
+    correct = checkable = 0
+    for question, answer in history:
+        truth = matrix.lookup(secret, question)
+        if truth is None:
+            continue
+        checkable += 1
+        correct += truth == answer
+    return correct, checkable
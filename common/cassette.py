@@ -0,0 +1,271 @@
+"""
+Record/replay transport for LLM clients.
+
+A Cassette in record mode sits between the client and its HTTP session and
+appends every successful request/response pair to a binary file; in
+replay mode it serves those responses back by request hash without any
+network (or API key), so a recorded tournament can be re-run in seconds
+to profile the orchestration code, or to A/B-test players, parsers and
+prompts against identical model outputs.
+
+The file is append-only:
+
+    b"TQCAS1"                                                   file header
+    [sha256: 32s][status: u16][elapsed: f32][length: u32][body]  repeated
+
+body is the zlib-compressed response body. The request hash covers the
+whole JSON payload (model, messages, token budget, stream flag) and, for
+calls made inside game_scope (run_tournament opens one per game), the
+game index, so concurrent games that send identical prompts (every
+game's first question) each replay their own responses. Replay
+memory-maps the file and builds its index from the fixed-size record
+headers alone; bodies are inflated on demand. A request recorded several
+times (the same question about the same secret in two games) is served
+back in recorded order and then cycles.
+
+Secrets picked locally (llm_choose_secret_object draws from the proposed
+list at random) are not part of any request, so a recording also stores
+the secret of each game, in game order, as one extra record under the
+reserved key SECRETS_KEY; replay plays the games on those secrets.
+"""
+import contextvars
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+MAGIC = b"TQCAS1"
+RECORD_HEADER = struct.Struct("<32sHfI")
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Pseudo-request the per-game secrets are stored under
+SECRETS_KEY = {"cassette": "secrets"}
+
+
+# Game the current call belongs to; copied into hedge and speculation threads
+_game: contextvars.ContextVar = contextvars.ContextVar("cassette_game", default=None)
+
+
+@contextmanager
+def game_scope(game):
+    """
+    Tag every request made in this context with `game` in the cassette.
+    """
+    token = _game.set(game)
+    try:
+        yield
+    finally:
+        _game.reset(token)
+
+
+def request_hash(payload: dict, game=None) -> bytes:
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    if game is not None:
+        blob += f"\0game={game}"
+    return hashlib.sha256(blob.encode("utf-8")).digest()
+
+
+def _response(url: str, status: int, body: bytes) -> requests.Response:
+    # An already-read response; json() and iter_lines() both work on it
+    resp = requests.Response()
+    resp.status_code = status
+    resp.url = url
+    resp.encoding = "utf-8"
+    resp._content = body
+    resp._content_consumed = True
+    return resp
+
+
+@dataclass
+class CassetteStats:
+    recorded: int = 0
+    hits: int = 0
+    misses: int = 0
+    repeats: int = 0  # hits served by cycling past the recorded occurrences
+
+
+class Cassette:
+    """
+    Recorded LLM traffic in one file; mode is "record" or "replay".
+
+    Pass it to LLMClient / AsyncLLMClient as cassette=. Recording keeps
+    only 200 responses, so retried 429/5xx attempts are not replayed.
+    Streamed responses are read in full while recording (early exit is
+    lost for that run) and replayed as the same event stream. In replay a
+    request that was never recorded raises RuntimeError, which the game
+    engine treats like any other failed call.
+
+    latency_scale multiplies the recorded latency of each response as a
+    sleep before it is served; 0 (the default) replays as fast as possible.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY, latency_scale: float = 0.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Cassette mode must be {RECORD!r} or {REPLAY!r}.")
+        if latency_scale < 0:
+            raise ValueError("latency_scale must not be negative.")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.stats = CassetteStats()
+        self._lock = threading.Lock()
+        self._fh = None
+        self._mm: Optional[mmap.mmap] = None
+        # request hash -> [(body offset, body length, status, elapsed)]
+        self._index: Dict[bytes, List[Tuple[int, int, int, float]]] = {}
+        self._served: Dict[bytes, int] = {}
+        if mode == RECORD:
+            self._fh = open(path, "ab")
+            if self._fh.tell() == 0:
+                self._fh.write(MAGIC)
+                self._fh.flush()
+        else:
+            self._open_replay()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+    def _open_replay(self) -> None:
+        with open(self.path, "rb") as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a cassette file.")
+            size = os.fstat(fh.fileno()).st_size
+            if size == len(MAGIC):
+                return
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = len(MAGIC)
+        end = len(self._mm)
+        while offset + RECORD_HEADER.size <= end:
+            digest, status, elapsed, length = RECORD_HEADER.unpack_from(self._mm, offset)
+            offset += RECORD_HEADER.size
+            if offset + length > end:
+                break  # torn final record from an interrupted recording
+            self._index.setdefault(digest, []).append((offset, length, status, elapsed))
+            offset += length
+
+    def session(self, inner: Optional[requests.Session] = None) -> "CassetteSession":
+        """
+        A session-like object for the client: records through `inner`, or
+        replays (inner is not used, nothing touches the network).
+        """
+        if self.recording and inner is None:
+            raise ValueError("Recording needs the real session to send requests on.")
+        return CassetteSession(self, inner if self.recording else None)
+
+    def record(self, payload: dict, status: int, body: bytes, elapsed: float) -> None:
+        self._append(request_hash(payload, _game.get()), status, body, elapsed)
+
+    def _append(self, digest: bytes, status: int, body: bytes, elapsed: float) -> None:
+        data = zlib.compress(body)
+        header = RECORD_HEADER.pack(digest, status, elapsed, len(data))
+        with self._lock:
+            # One write per record so readers never see half a header
+            self._fh.write(header + data)
+            self._fh.flush()
+            self.stats.recorded += 1
+
+    def record_secrets(self, secrets: List[Optional[str]]) -> None:
+        """
+        Store the secret of each recorded game, in game order (None for a
+        game whose secret selection failed).
+        """
+        self._append(request_hash(SECRETS_KEY), 200, json.dumps(secrets).encode("utf-8"), 0.0)
+
+    def recorded_secrets(self) -> Optional[List[Optional[str]]]:
+        """
+        The per-game secrets of the last recorded run, or None if the
+        cassette has none (an interrupted or older recording).
+        """
+        entries = self._index.get(request_hash(SECRETS_KEY))
+        if not entries:
+            return None
+        offset, length, _status, _elapsed = entries[-1]
+        return json.loads(zlib.decompress(self._mm[offset:offset + length]))
+
+    def lookup(self, payload: dict) -> Optional[Tuple[int, bytes, float]]:
+        """
+        (status, body, recorded elapsed seconds) for the next recorded
+        response to this request, or None if it was never recorded.
+        Requests recorded outside any game scope match in every game.
+        """
+        game = _game.get()
+        digest = request_hash(payload, game)
+        with self._lock:
+            entries = self._index.get(digest)
+            if not entries and game is not None:
+                digest = request_hash(payload)
+                entries = self._index.get(digest)
+            if not entries:
+                self.stats.misses += 1
+                return None
+            n = self._served.get(digest, 0)
+            self._served[digest] = n + 1
+            self.stats.hits += 1
+            if n >= len(entries):
+                self.stats.repeats += 1
+        offset, length, status, elapsed = entries[n % len(entries)]
+        return status, zlib.decompress(self._mm[offset:offset + length]), elapsed
+
+    def rewind(self) -> None:
+        """
+        Serve every request from its first recorded response again.
+        """
+        with self._lock:
+            self._served.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+
+
+class CassetteSession:
+    """
+    Stands in for requests.Session inside post_with_policies.
+    """
+
+    def __init__(self, cassette: Cassette, inner: Optional[requests.Session]):
+        self.cassette = cassette
+        self.inner = inner
+
+    def post(self, url: str, json: dict, headers=None, timeout=None, stream: bool = False):
+        if self.inner is None:
+            found = self.cassette.lookup(json)
+            if found is None:
+                raise RuntimeError("Cassette has no recorded response for this request.")
+            status, body, elapsed = found
+            if self.cassette.latency_scale:
+                time.sleep(elapsed * self.cassette.latency_scale)
+            return _response(url, status, body)
+
+        started = time.perf_counter()
+        extra = {"stream": True} if stream else {}
+        resp = self.inner.post(url, json=json, headers=headers, timeout=timeout, **extra)
+        if resp.status_code != 200:
+            return resp
+        body = resp.content  # reads a streamed body to the end
+        self.cassette.record(json, resp.status_code, body, time.perf_counter() - started)
+        return _response(url, resp.status_code, body)
+
+    def close(self) -> None:
+        if self.inner is not None:
+            self.inner.close()
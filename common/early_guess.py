@@ -0,0 +1,128 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from .attribute_oracle import AttributeMatrix
+from .game_models import GameState
+from .info_gain import DEFAULT_ANSWER_NOISE, _article, compute_posterior
+from .players import _direct_guess_target, _normalize_object
+
+# state -> (confidence in [0, 1], object the questioner would guess)
+ConfidenceScorer = Callable[[GameState], Tuple[float, Optional[str]]]
+
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_MIN_QUESTIONS = 3
+
+
+class PosteriorConfidence:
+    """
+    Confidence scorer: 1.0 once a direct guess was answered yes, otherwise
+    the top posterior probability over an AttributeMatrix (0.0 while the
+    secret looks off-matrix). Works for any questioner whose questions the
+    matrix can read, not just InfoGainQuestioner.
+
+    Category questions the matrix maps ("Is it a fruit?") never count as
+    confirmed guesses, and unknown objects only once the matrix has given up.
+    """
+
+    def __init__(
+        self, matrix: Optional[AttributeMatrix] = None, noise: float = DEFAULT_ANSWER_NOISE
+    ):
+        self.matrix = matrix or AttributeMatrix.load()
+        self.noise = noise
+
+    def confirmed_guess(self, state: GameState, off_matrix: bool) -> Optional[str]:
+        """
+        The X of an "Is it a/an/the X?" question that was answered yes, if any.
+        """
+        for question, answer in reversed(state.history):
+            if answer != "yes":
+                continue
+            target = _direct_guess_target(question)
+            if not target or self.matrix.match_attribute(question) is not None:
+                continue
+            if off_matrix or _normalize_object(target) in self.matrix.object_index:
+                return target
+        return None
+
+    def __call__(self, state: GameState) -> Tuple[float, Optional[str]]:
+        post = compute_posterior(self.matrix, state.history, self.noise)
+        confirmed = self.confirmed_guess(state, post.off_matrix)
+        if confirmed:
+            return 1.0, confirmed
+        if post.off_matrix:
+            return 0.0, None
+        best, p = post.top()
+        return p, self.matrix.objects[best]
+
+
+@dataclass
+class EarlyGuessStats:
+    decisions: int = 0
+    guesses: int = 0
+    correct: int = 0
+    wrong: int = 0
+
+
+class EarlyGuessPolicy:
+    """
+    Decides after each answered turn whether Player 2 should stop asking
+    and guess now.
+
+    The scorer's confidence must reach `threshold`, after at least
+    `min_questions` questions. By default a wrong early guess ends the game
+    like a wrong final guess. With `penalty` set, the game goes on instead:
+    the guess is recorded as an "Is it a X?" / no turn and `penalty` extra
+    questions are forfeited.
+    """
+
+    def __init__(
+        self,
+        scorer: Optional[ConfidenceScorer] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        min_questions: int = DEFAULT_MIN_QUESTIONS,
+        penalty: Optional[int] = None,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1].")
+        if penalty is not None and penalty < 0:
+            raise ValueError("penalty must be non-negative.")
+        self.scorer = scorer or PosteriorConfidence()
+        self.threshold = threshold
+        self.min_questions = min_questions
+        self.penalty = penalty
+        self.stats = EarlyGuessStats()
+        self._lock = threading.Lock()
+
+    def decide(self, state: GameState) -> Optional[str]:
+        """
+        The object to guess now, or None to keep asking.
+        """
+        if state.num_questions_asked < self.min_questions:
+            return None
+        confidence, guess = self.scorer(state)
+        with self._lock:
+            self.stats.decisions += 1
+        if guess is None or confidence < self.threshold:
+            return None
+        with self._lock:
+            self.stats.guesses += 1
+        return guess
+
+    def record(self, correct: bool) -> None:
+        with self._lock:
+            if correct:
+                self.stats.correct += 1
+            else:
+                self.stats.wrong += 1
+
+    @property
+    def ends_on_wrong_guess(self) -> bool:
+        return self.penalty is None
+
+
+def early_guess_question(guess: str) -> str:
+    """
+    History entry recording a wrong early guess in penalty mode.
+    """
+    return f"Is it {_article(guess)} {guess}?"
@@ -0,0 +1,309 @@
+"""
+Task 3 metrics over binary game logs (common/game_log.py).
+
+Each log is indexed once (a pass over its record headers) and cut into
+record-aligned byte ranges; the ranges are evaluated in a process pool,
+each reading only its own part of the memory-mapped file, and the
+per-model partial aggregates are merged at the end. Nothing is held per
+game, so logs larger than memory are fine.
+"""
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .attribute_oracle import AttributeMatrix
+from .game_log import (
+    FLAG_EARLY_GUESS,
+    FLAG_ERROR,
+    QUESTION_ID,
+    WINNERS,
+    GameLogReader,
+    LogShard,
+)
+from .info_gain import compute_posterior
+from .players import _direct_guess_target, _normalize_object, _question_has_bad_hints
+
+# A premature false guess costs this many wins in the penalised win rate:
+# a model that is often confidently wrong early is worse than a slow one
+PREMATURE_PENALTY = 3.0
+# Repeats within this many questions count as "early" redundancy
+EARLY_QUESTIONS = 10
+
+_YES_NO_START_RE = re.compile(
+    r"^\s*(is|are|does|do|did|can|could|would|will|has|have|was|were|should|might|may)\b",
+    flags=re.I,
+)
+
+_matrix: Optional[AttributeMatrix] = None
+
+
+def _ground_truth() -> AttributeMatrix:
+    # Loaded once per worker process
+    global _matrix
+    if _matrix is None:
+        _matrix = AttributeMatrix.load()
+    return _matrix
+
+
+def is_valid_question(question: str) -> bool:
+    """
+    A single yes/no question: starts with an auxiliary verb, ends with '?',
+    offers no alternatives ('... or ...') and carries no example hints.
+    """
+    q = question.strip()
+    return (
+        q.endswith("?")
+        and q.count("?") == 1
+        and bool(_YES_NO_START_RE.match(q))
+        and " or " not in q.lower()
+        and not _question_has_bad_hints(q)
+    )
+
+
+@dataclass
+class EvalAggregate:
+    """
+    Mergeable counters for one model; rates are derived properties.
+    """
+    games: int = 0
+    wins: int = 0
+    errors: int = 0
+    questions: int = 0
+    early_questions: int = 0  # questions within the first EARLY_QUESTIONS
+    questions_to_win: int = 0
+    invalid_questions: int = 0
+    redundant_questions: int = 0
+    early_redundant_questions: int = 0
+    contradictions: int = 0
+    checkable_answers: int = 0
+    correct_answers: int = 0
+    premature_false_guesses: int = 0
+    entropy_reduction: float = 0.0  # bits, summed over games
+
+    def merge(self, other: "EvalAggregate") -> "EvalAggregate":
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        return self
+
+    @staticmethod
+    def _ratio(num: float, den: float) -> float:
+        return num / den if den else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self._ratio(self.wins, self.games)
+
+    @property
+    def penalised_win_rate(self) -> float:
+        return self._ratio(self.wins - PREMATURE_PENALTY * self.premature_false_guesses, self.games)
+
+    @property
+    def avg_questions_to_win(self) -> float:
+        return self._ratio(self.questions_to_win, self.wins)
+
+    @property
+    def answer_accuracy(self) -> float:
+        return self._ratio(self.correct_answers, self.checkable_answers)
+
+    @property
+    def contradictions_per_game(self) -> float:
+        return self._ratio(self.contradictions, self.games)
+
+    @property
+    def invalid_question_rate(self) -> float:
+        return self._ratio(self.invalid_questions, self.questions)
+
+    @property
+    def redundant_question_rate(self) -> float:
+        return self._ratio(self.redundant_questions, self.questions)
+
+    @property
+    def early_redundant_question_rate(self) -> float:
+        return self._ratio(self.early_redundant_questions, self.early_questions)
+
+    @property
+    def premature_false_guess_rate(self) -> float:
+        return self._ratio(self.premature_false_guesses, self.games)
+
+    @property
+    def avg_entropy_reduction(self) -> float:
+        return self._ratio(self.entropy_reduction, self.games)
+
+
+def score_game(
+    matrix: AttributeMatrix,
+    agg: EvalAggregate,
+    secret: Optional[str],
+    history: Sequence[Tuple[str, str]],
+    winner: Optional[str],
+    flags: int,
+    wrong_early_guesses: int = 0,
+    final_guess: Optional[str] = None,
+) -> None:
+    """
+    Add one game's metrics to agg.
+
+    A premature false guess is a wrong "Is it a X?" question before the
+    game's last move (X not an attribute the matrix knows, so "Is it an
+    animal?" does not count), a wrong penalty-mode early guess, or an early
+    guess that lost the game. The forced final guess is not in the history,
+    so the last question only counts as the last move when there was none.
+    """
+    agg.games += 1
+    agg.errors += bool(flags & FLAG_ERROR)
+    if winner == "player2":
+        agg.wins += 1
+        agg.questions_to_win += len(history)
+    elif flags & FLAG_EARLY_GUESS:
+        agg.premature_false_guesses += 1
+
+    last_move = len(history) - 1 if final_guess is None else len(history)
+    wrong_direct_guesses = 0
+    seen_questions = set()
+    seen_attributes: Dict[int, str] = {}
+    for i, (question, answer) in enumerate(history):
+        agg.questions += 1
+        if i < EARLY_QUESTIONS:
+            agg.early_questions += 1
+        if not is_valid_question(question):
+            agg.invalid_questions += 1
+
+        norm = _normalize_object(question)
+        attr = matrix.match_attribute(question)
+        if answer == "no" and attr is None and i < last_move and _direct_guess_target(question):
+            wrong_direct_guesses += 1
+        if norm in seen_questions or (attr is not None and attr in seen_attributes):
+            agg.redundant_questions += 1
+            if i < EARLY_QUESTIONS:
+                agg.early_redundant_questions += 1
+        seen_questions.add(norm)
+
+        if attr is not None:
+            earlier = seen_attributes.get(attr)
+            if earlier is not None and earlier != answer:
+                agg.contradictions += 1
+            seen_attributes[attr] = answer
+            truth = matrix.lookup(secret, question)
+            if truth is not None:
+                agg.checkable_answers += 1
+                agg.correct_answers += truth == answer
+
+    # Penalty-mode guesses are also in the history as "Is it a X?", so take
+    # the larger count rather than the sum
+    agg.premature_false_guesses += max(wrong_direct_guesses, wrong_early_guesses)
+
+    if history:
+        start = math.log2(len(matrix.objects))
+        agg.entropy_reduction += start - compute_posterior(matrix, history).entropy
+
+
+def iter_log_games(
+    shard: LogShard,
+) -> Iterator[
+    Tuple[Optional[str], Optional[str], List[Tuple[str, str]], Optional[str], int, int, Optional[str]]
+]:
+    """
+    Stream (model, secret, history, winner, flags, wrong early guesses,
+    final guess) for one byte range of a log.
+    """
+    with GameLogReader(shard.path) as reader:
+        for model, game in reader.iter_shard(shard):
+            history = [
+                (reader.string(qid), "yes" if game.answers >> i & 1 else "no")
+                for i, (qid,) in enumerate(QUESTION_ID.iter_unpack(game.question_ids))
+            ]
+            yield (
+                model,
+                reader.string(game.secret_id),
+                history,
+                WINNERS[game.winner],
+                game.flags,
+                game.wrong_early_guesses,
+                reader.string(game.guess_id),
+            )
+
+
+def evaluate_shard(shard: LogShard) -> Dict[str, EvalAggregate]:
+    """
+    Per-model aggregates for one byte range of a log. Games without a
+    model tag are reported under the log's file name.
+    """
+    matrix = _ground_truth()
+    default_model = os.path.splitext(os.path.basename(shard.path))[0]
+    per_model: Dict[str, EvalAggregate] = {}
+    for model, *game in iter_log_games(shard):
+        agg = per_model.setdefault(model or default_model, EvalAggregate())
+        score_game(matrix, agg, *game)
+    return per_model
+
+
+def plan_shards(paths: Sequence[str], shards_per_log: int) -> List[LogShard]:
+    """
+    Record-aligned byte ranges for every log, about shards_per_log each.
+    """
+    tasks: List[LogShard] = []
+    for path in paths:
+        with GameLogReader(path) as reader:
+            tasks.extend(reader.shards(shards_per_log))
+    return tasks
+
+
+def merge_aggregates(partials) -> Dict[str, EvalAggregate]:
+    merged: Dict[str, EvalAggregate] = {}
+    for partial in partials:
+        for model, agg in partial.items():
+            merged.setdefault(model, EvalAggregate()).merge(agg)
+    return merged
+
+
+def evaluate_logs(
+    paths: Sequence[str], workers: int = 1, shards_per_log: Optional[int] = None
+) -> Dict[str, EvalAggregate]:
+    """
+    Evaluate every log in one pass and return aggregates keyed by model.
+
+    Each log is cut into shards_per_log byte ranges (default: workers),
+    so every byte is read by one shard; with workers > 1 the shards run in
+    a process pool.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    tasks = plan_shards(paths, shards_per_log or workers)
+    if workers == 1:
+        return merge_aggregates(map(evaluate_shard, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_aggregates(pool.map(evaluate_shard, tasks))
+
+
+def format_table(aggregates: Dict[str, EvalAggregate]) -> str:
+    """
+    One row per model, best penalised win rate first.
+    """
+    columns = (
+        ("model", "{}", None),
+        ("games", "{:d}", lambda a: a.games),
+        ("win", "{:.1%}", lambda a: a.win_rate),
+        ("penalised", "{:.1%}", lambda a: a.penalised_win_rate),
+        ("q_to_win", "{:.1f}", lambda a: a.avg_questions_to_win),
+        ("accuracy", "{:.1%}", lambda a: a.answer_accuracy),
+        ("contra/game", "{:.2f}", lambda a: a.contradictions_per_game),
+        ("invalid_q", "{:.1%}", lambda a: a.invalid_question_rate),
+        ("redundant_q", "{:.1%}", lambda a: a.redundant_question_rate),
+        ("early_redund", "{:.1%}", lambda a: a.early_redundant_question_rate),
+        ("premature", "{:.1%}", lambda a: a.premature_false_guess_rate),
+        ("bits/game", "{:.2f}", lambda a: a.avg_entropy_reduction),
+    )
+    rows = [[name for name, _, _ in columns]]
+    ordered = sorted(aggregates.items(), key=lambda kv: kv[1].penalised_win_rate, reverse=True)
+    for model, agg in ordered:
+        rows.append(
+            [model] + [fmt.format(get(agg)) for _, fmt, get in columns[1:]]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return "\n".join(
+        "  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+        for row in rows
+    )
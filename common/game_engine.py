@@ -0,0 +1,300 @@
+import time
+from functools import partial
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from . import metrics
+from .llm_client import LLMClient
+from .game_models import GameState, parse_llm_guess
+from .players import (
+    llm_choose_secret_object,
+    llm_answer_question,
+    llm_generate_question,
+    llm_generate_final_guess,
+)
+from .early_guess import EarlyGuessPolicy, early_guess_question
+from .secret_pool import SecretChooser
+from .speculation import QuestionGenerator, SpeculationStats, SpeculativeQuestioner
+from .history_context import ContextStats, HistoryContext
+
+# (llm, secret, question) -> "yes"/"no"; llm_answer_question or a stand-in
+Answerer = Callable[[LLMClient, Optional[str], str], str]
+# (llm, state, escalation=0) -> "GUESS: ..."; llm_generate_final_guess or a stand-in
+FinalGuesser = Callable[..., str]
+
+# How many times in a row a turn may fail before the game is abandoned
+MAX_CONSECUTIVE_ERRORS = 3
+
+
+@dataclass
+class GameResult:
+    """
+    Structured outcome of one headless LLM-vs-LLM game.
+    """
+    secret_object: Optional[str]
+    history: List[Tuple[str, str]] = field(default_factory=list)
+    winner: Optional[str] = None
+    num_turns: int = 0
+    retries: int = 0
+    wall_time: float = 0.0
+    final_guess: Optional[str] = None
+    error: Optional[str] = None
+    turn_times: List[float] = field(default_factory=list)
+    speculation: Optional[SpeculationStats] = None
+    context: Optional[ContextStats] = None
+    # Set when an EarlyGuessPolicy ended the game before the forced guess
+    early_guess_turn: Optional[int] = None
+    wrong_early_guesses: int = 0
+    # Question + answer calls not made compared to playing to the forced guess
+    calls_saved: int = 0
+
+
+def _no_log(_msg: str) -> None:
+    pass
+
+
+def play_llm_vs_llm_game(
+    llm: LLMClient,
+    secret: Optional[str] = None,
+    max_questions: int = 20,
+    log: Callable[[str], None] = _no_log,
+    answerer: Answerer = llm_answer_question,
+    speculative: bool = False,
+    compact_history: bool = False,
+    stream: bool = False,
+    questioner: QuestionGenerator = llm_generate_question,
+    guesser: FinalGuesser = llm_generate_final_guess,
+    early_guess: Optional[EarlyGuessPolicy] = None,
+    choose_secret: SecretChooser = llm_choose_secret_object,
+    resume: Optional[GameState] = None,
+    checkpoint: Optional[Callable[[GameState], None]] = None,
+) -> GameResult:
+    """
+    Play one LLM-vs-LLM game without any console I/O and return its result.
+
+    The same client plays both roles unless answerer replaces Player 1
+    (e.g. an OracleAnswerer). Pass log=print to get the interactive
+    transcript used by task2.
+
+    With speculative=True the questioner drafts its next question for both
+    possible answers while the answerer is still thinking. With
+    compact_history=True the questioner prompts use a HistoryContext
+    (fact summary + recent turns) instead of the full Q/A transcript.
+    With stream=True LLM answers and the final guess are streamed and cut
+    off as soon as the YES/NO or GUESS: line is complete.
+
+    questioner and guesser replace Player 2's question and final-guess
+    moves, e.g. with an InfoGainQuestioner and its final_guess. guesser is
+    called with escalation=<retry number> so an unparseable guess is
+    retried on a stronger tier of a routed client.
+    early_guess lets Player 2 guess before the last turn once the policy
+    is confident enough. choose_secret picks the secret when none is given
+    (e.g. a shared SecretPool).
+
+    resume continues a checkpointed game (its secret and history are kept,
+    nothing already answered is asked again). checkpoint is called with the
+    state after the secret is chosen and after every answered turn; an
+    exception from it aborts the game.
+    """
+    start = time.perf_counter()
+    state = GameState(max_questions=max_questions)
+    if resume is not None:
+        state.secret_object = resume.secret_object
+        state.max_questions = resume.max_questions
+        state.num_questions_asked = resume.num_questions_asked
+        state.history = list(resume.history)
+    if compact_history:
+        state.context = HistoryContext()
+    if stream and answerer is llm_answer_question:
+        answerer = partial(llm_answer_question, stream=True)
+    if stream and guesser is llm_generate_final_guess:
+        guesser = partial(llm_generate_final_guess, stream=True)
+    retries = 0
+    final_guess = None
+    error = None
+    turn_times: List[float] = []
+    early_guess_turn = None
+    wrong_early_guesses = 0
+
+    questions_played = len(state.history)
+    if state.secret_object is None:
+        try:
+            state.secret_object = secret or choose_secret(llm)
+        except RuntimeError as exc:
+            return GameResult(
+                secret_object=None,
+                error=f"secret selection failed: {exc}",
+                wall_time=time.perf_counter() - start,
+            )
+        if checkpoint is not None:
+            checkpoint(state)
+    log(f"[DEBUG] Player 1's secret object: {state.secret_object}\n")
+
+    speculator = SpeculativeQuestioner(llm, generate=questioner) if speculative else None
+    consecutive_errors = 0
+    # The prefetch executor must not outlive an aborted game (e.g. a
+    # checkpoint raising LeaseLost, or an answerer error)
+    try:
+        while not state.finished:
+            remaining = state.max_questions - state.num_questions_asked
+
+            if remaining <= 0:
+                log(
+                    "\nThe LLM questioner ran out of moves without making a guess. "
+                    "Player 1 (answerer) wins!"
+                )
+                state.winner = "player1"
+                state.finished = True
+                break
+
+            # If this is the last move, force a final guess
+            if remaining == 1:
+                log("\n[DEBUG] LLM Questioner must now make a FINAL GUESS.")
+                turn_start = time.perf_counter()
+                for attempt in range(3):
+                    if attempt:
+                        retries += 1
+                    try:
+                        llm_output = guesser(llm, state, escalation=attempt)
+                    except RuntimeError:
+                        log(
+                            "[DEBUG] LLM Questioner had trouble generating a final guess. "
+                            "Retrying..."
+                        )
+                        continue
+
+                    guess = parse_llm_guess(llm_output)
+                    if guess:
+                        final_guess = guess
+                        log(f"LLM Questioner FINAL GUESS: '{guess}'")
+                        if guess.lower() == (state.secret_object or "").lower():
+                            log("\nCorrect! Player 2 (questioner) wins!\n")
+                            state.winner = "player2"
+                        else:
+                            log(
+                                f"\nIncorrect. The secret object was '{state.secret_object}'. "
+                                "Player 1 (answerer) wins!\n"
+                            )
+                            state.winner = "player1"
+                        state.finished = True
+                        break
+
+                if not state.finished:
+                    log(
+                        "\nThe LLM Questioner failed to make a valid guess. "
+                        "Player 1 (answerer) wins by default!"
+                    )
+                    state.winner = "player1"
+                    state.finished = True
+
+                elapsed = time.perf_counter() - turn_start
+                turn_times.append(elapsed)
+                metrics.observe("turn_seconds", elapsed, phase="final_guess")
+                break  # end loop regardless
+
+            # Guess before the last turn if the questioner is already confident
+            if early_guess is not None:
+                guess = early_guess.decide(state)
+                if guess:
+                    correct = guess.lower() == (state.secret_object or "").lower()
+                    early_guess.record(correct)
+                    metrics.increment("early_guesses_total", correct=correct)
+                    log(f"LLM Questioner EARLY GUESS: '{guess}'")
+                    if correct or early_guess.ends_on_wrong_guess:
+                        final_guess = guess
+                        early_guess_turn = state.num_questions_asked
+                        if correct:
+                            log("\nCorrect! Player 2 (questioner) wins!\n")
+                            state.winner = "player2"
+                        else:
+                            log(
+                                f"\nIncorrect. The secret object was '{state.secret_object}'. "
+                                "Player 1 (answerer) wins!\n"
+                            )
+                            state.winner = "player1"
+                        state.finished = True
+                        break
+                    # Penalty mode: the guess uses up a turn plus the penalty
+                    wrong_early_guesses += 1
+                    state.history.append((early_guess_question(guess), "no"))
+                    state.num_questions_asked += 1 + early_guess.penalty
+                    log(f"Wrong early guess: {early_guess.penalty} questions forfeited.\n")
+                    if checkpoint is not None:
+                        checkpoint(state)
+                    continue
+
+            # Normal question phase (remaining > 1)
+            turn_start = time.perf_counter()
+            try:
+                if speculator is not None:
+                    llm_output = speculator.next_question(state)
+                else:
+                    llm_output = questioner(llm, state)
+            except RuntimeError as exc:
+                retries += 1
+                consecutive_errors += 1
+                if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                    error = f"question generation failed: {exc}"
+                    log("\n[DEBUG] LLM Questioner keeps failing. Abandoning the game.\n")
+                    state.finished = True
+                    break
+                log(
+                    "\n[DEBUG] LLM Questioner had trouble generating a question. "
+                    "Trying again...\n"
+                )
+                continue
+            consecutive_errors = 0
+            answer_start = time.perf_counter()
+            metrics.observe("turn_seconds", answer_start - turn_start, phase="question")
+
+            if speculator is not None:
+                speculator.prefetch(state, llm_output)
+            try:
+                answer = answerer(llm, state.secret_object, llm_output)
+            except RuntimeError:
+                retries += 1
+                log(
+                    "\n[DEBUG] LLM Answerer had trouble answering. "
+                    "Treating answer as 'NO'.\n"
+                )
+                answer = "no"
+            turn_end = time.perf_counter()
+            metrics.observe("turn_seconds", turn_end - answer_start, phase="answer")
+            turn_times.append(turn_end - turn_start)
+
+            state.num_questions_asked += 1
+            questions_played += 1
+            state.history.append((llm_output, answer))
+
+            log(f"Q{state.num_questions_asked}: {llm_output}")
+            log(f"Answerer replies: {answer.upper()}\n")
+            if checkpoint is not None:
+                checkpoint(state)
+    finally:
+        if speculator is not None:
+            speculator.close()
+
+    wall_time = time.perf_counter() - start
+    metrics.observe("game_seconds", wall_time)
+    metrics.increment("games_total", winner=state.winner or "none")
+    metrics.observe("game_turns", state.num_questions_asked)
+    calls_saved = 0
+    if early_guess_turn is not None:
+        calls_saved = 2 * max(0, state.max_questions - 1 - questions_played)
+
+    return GameResult(
+        secret_object=state.secret_object,
+        history=list(state.history),
+        winner=state.winner,
+        num_turns=state.num_questions_asked,
+        retries=retries,
+        wall_time=wall_time,
+        final_guess=final_guess,
+        error=error,
+        turn_times=turn_times,
+        speculation=speculator.stats if speculator else None,
+        context=state.context.stats if state.context else None,
+        early_guess_turn=early_guess_turn,
+        wrong_early_guesses=wrong_early_guesses,
+        calls_saved=calls_saved,
+    )
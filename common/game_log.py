@@ -0,0 +1,469 @@
+"""
+Compact storage for finished games.
+
+CompactGame keeps one game in a handful of small ints: interned string ids
+for the secret, final guess and questions (shared StringTable), the answers
+as a bitset and the winner / flags as small codes.
+
+The binary log is append-only:
+
+    b"TQLOG1"                              file header
+    [kind: u8][length: u32][payload]      repeated records
+
+kind 1 (STRING) defines the next string id as UTF-8 bytes; kind 2 (GAME)
+holds GAME_HEADER followed by one u32 question id per question (the
+header byte after num_questions counts wrong early guesses made in
+penalty mode; logs written before it existed have 0 there); kind 3
+(META) is a UTF-8 "key=value" pair that applies to the games after it
+(e.g. model=gpt-5-mini; an empty value clears it). A game
+only refers to strings defined before it, so a log can be appended to by
+one writer at a time and read while it grows. GameLogReader memory-maps the
+file and can aggregate outcomes straight from the bytes.
+"""
+import mmap
+import os
+from array import array
+import struct
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+MAGIC = b"TQLOG1"
+RECORD_HEADER = struct.Struct("<BI")
+# winner, flags, num_questions, wrong early guesses, secret id, final guess id,
+# answer bits, wall time
+GAME_HEADER = struct.Struct("<BBBBIIQf")
+QUESTION_ID = struct.Struct("<I")
+
+KIND_STRING = 1
+KIND_GAME = 2
+KIND_META = 3
+
+NO_STRING = 0xFFFFFFFF
+MAX_QUESTIONS = 64  # answers are packed into a u64
+MAX_WRONG_EARLY_GUESSES = 255  # stored in a u8
+
+WINNERS = (None, "player1", "player2", "human", "llm")
+WINNER_CODES = {name: code for code, name in enumerate(WINNERS)}
+
+FLAG_ERROR = 1
+FLAG_EARLY_GUESS = 2
+
+
+class StringTable:
+    """
+    Interns strings to dense integer ids; thread-safe.
+    """
+
+    def __init__(self, strings: Sequence[str] = ()):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for s in strings:
+            self.intern(s)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def intern(self, s: str) -> int:
+        sid = self._ids.get(s)
+        if sid is not None:
+            return sid
+        with self._lock:
+            sid = self._ids.get(s)
+            if sid is None:
+                sid = len(self.strings)
+                self.strings.append(s)
+                self._ids[s] = sid
+            return sid
+
+    def lookup(self, sid: int) -> Optional[str]:
+        return None if sid == NO_STRING else self.strings[sid]
+
+
+class CompactGame:
+    """
+    One finished game: slotted small ints plus the packed question ids.
+    """
+    __slots__ = (
+        "secret_id",
+        "guess_id",
+        "question_ids",
+        "answers",
+        "winner",
+        "flags",
+        "wall_time",
+        "wrong_early_guesses",
+    )
+
+    def __init__(
+        self,
+        secret_id: int,
+        guess_id: int,
+        question_ids: bytes,
+        answers: int,
+        winner: int,
+        flags: int = 0,
+        wall_time: float = 0.0,
+        wrong_early_guesses: int = 0,
+    ):
+        self.secret_id = secret_id
+        self.guess_id = guess_id
+        self.question_ids = question_ids  # packed u32 ids
+        self.answers = answers  # bit i set when question i was answered yes
+        self.winner = winner
+        self.flags = flags
+        self.wall_time = wall_time
+        self.wrong_early_guesses = wrong_early_guesses
+
+    @classmethod
+    def from_result(cls, result, table: StringTable) -> "CompactGame":
+        """
+        Pack a GameResult (or anything with the same fields).
+        """
+        history = result.history
+        if len(history) > MAX_QUESTIONS:
+            raise ValueError(f"Games longer than {MAX_QUESTIONS} questions cannot be packed.")
+        answers = 0
+        ids = bytearray()
+        for i, (question, answer) in enumerate(history):
+            ids += QUESTION_ID.pack(table.intern(question))
+            if answer == "yes":
+                answers |= 1 << i
+        flags = FLAG_ERROR if result.error else 0
+        if getattr(result, "early_guess_turn", None) is not None:
+            flags |= FLAG_EARLY_GUESS
+        return cls(
+            secret_id=table.intern(result.secret_object) if result.secret_object else NO_STRING,
+            guess_id=table.intern(result.final_guess) if result.final_guess else NO_STRING,
+            question_ids=bytes(ids),
+            answers=answers,
+            winner=WINNER_CODES.get(result.winner, 0),
+            flags=flags,
+            wall_time=result.wall_time,
+            wrong_early_guesses=min(
+                getattr(result, "wrong_early_guesses", 0), MAX_WRONG_EARLY_GUESSES
+            ),
+        )
+
+    @property
+    def num_questions(self) -> int:
+        return len(self.question_ids) // QUESTION_ID.size
+
+    def history(self, table: StringTable) -> List[Tuple[str, str]]:
+        return [
+            (table.strings[qid], "yes" if self.answers >> i & 1 else "no")
+            for i, (qid,) in enumerate(QUESTION_ID.iter_unpack(self.question_ids))
+        ]
+
+    def winner_name(self) -> Optional[str]:
+        return WINNERS[self.winner]
+
+
+class GameLogWriter:
+    """
+    Appends CompactGames to a binary log, writing each new string once.
+    Reopening an existing log continues its string ids; the intern table
+    needs every string already in the file, so reopening decodes them all
+    and the writer's memory grows with the number of distinct strings. With model set,
+    the games written through this writer are tagged with it; without it,
+    a reopened log gets a "model=" record so its new games are not
+    attributed to the model of an earlier session.
+    """
+
+    def __init__(self, path: str, model: Optional[str] = None):
+        self.path = path
+        self.table = StringTable()
+        self._written = 0  # strings already in the file
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            reader = GameLogReader(path)
+            self.table = StringTable(reader.strings())
+            self._written = len(self.table)
+            end = reader.valid_end()
+            reader.close()
+            self._fh = open(path, "r+b")
+            # Drop a torn record left by an interrupted append
+            self._fh.truncate(end)
+            self._fh.seek(end)
+        else:
+            self._fh = open(path, "wb")
+            self._fh.write(MAGIC)
+        reopened = self._fh.tell() > len(MAGIC)
+        self._lock = threading.Lock()
+        self.model: Optional[str] = None
+        if model is not None:
+            self.set_model(model)
+        elif reopened:
+            self._fh.write(self._record(KIND_META, b"model="))
+
+    def _record(self, kind: int, payload: bytes) -> bytes:
+        return RECORD_HEADER.pack(kind, len(payload)) + payload
+
+    def set_model(self, model: str) -> None:
+        """
+        Tag the games written from now on with `model`.
+        """
+        with self._lock:
+            if model != self.model:
+                self._fh.write(self._record(KIND_META, f"model={model}".encode("utf-8")))
+                self.model = model
+
+    def write(self, game: CompactGame, model: Optional[str] = None) -> None:
+        """
+        Append one game; with model set, tag it (and later games) with it.
+        """
+        header = GAME_HEADER.pack(
+            game.winner,
+            game.flags,
+            game.num_questions,
+            game.wrong_early_guesses,
+            game.secret_id,
+            game.guess_id,
+            game.answers,
+            game.wall_time,
+        )
+        with self._lock:
+            out = bytearray()
+            if model is not None and model != self.model:
+                out += self._record(KIND_META, f"model={model}".encode("utf-8"))
+                self.model = model
+            # Strings interned since the last write go out before the game
+            new = self.table.strings[self._written:]
+            for s in new:
+                out += self._record(KIND_STRING, s.encode("utf-8"))
+            self._written += len(new)
+            out += self._record(KIND_GAME, header + game.question_ids)
+            self._fh.write(out)
+
+    def append_result(self, result, model: Optional[str] = None) -> None:
+        self.write(CompactGame.from_result(result, self.table), model)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+@dataclass
+class LogShard:
+    """
+    A record-aligned byte range [start, end) of a log, with the model tag
+    in effect at start and the offsets / lengths of every string defined
+    before end. Small enough to send to a worker process.
+    """
+    path: str
+    start: int
+    end: int
+    model: Optional[str]
+    string_offsets: array
+    string_lengths: array
+
+
+@dataclass
+class OutcomeSummary:
+    games: int = 0
+    wins: Counter = field(default_factory=Counter)
+    total_questions: int = 0
+    errors: int = 0
+    early_guesses: int = 0
+    wrong_early_guesses: int = 0
+
+    @property
+    def avg_questions(self) -> float:
+        return self.total_questions / self.games if self.games else 0.0
+
+
+class GameLogReader:
+    """
+    Memory-mapped reader for a binary game log.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        # Offset and length of every string seen by iter_games, packed
+        self._string_offsets = array("Q")
+        self._string_lengths = array("I")
+        if self._mm[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a game log.")
+
+    def _records(
+        self, pos: int = len(MAGIC), end: Optional[int] = None
+    ) -> Iterator[Tuple[int, int, int]]:
+        """
+        (kind, payload offset, payload length) for every complete record
+        from byte pos (a record boundary) up to end.
+        """
+        mm = self._mm
+        end = len(mm) if end is None else min(end, len(mm))
+        while pos + RECORD_HEADER.size <= end:
+            kind, length = RECORD_HEADER.unpack_from(mm, pos)
+            start = pos + RECORD_HEADER.size
+            if start + length > end:
+                break  # torn tail from an interrupted append
+            yield kind, start, length
+            pos = start + length
+
+    def valid_end(self) -> int:
+        """
+        Offset just past the last complete record.
+        """
+        end = len(MAGIC)
+        for _kind, off, length in self._records():
+            end = off + length
+        return end
+
+    def strings(self) -> List[str]:
+        return [
+            bytes(self._mm[off:off + length]).decode("utf-8")
+            for kind, off, length in self._records()
+            if kind == KIND_STRING
+        ]
+
+    def summarize(self) -> OutcomeSummary:
+        """
+        Aggregate outcomes straight from the mapped bytes; no per-game
+        objects or strings are created.
+        """
+        summary = OutcomeSummary()
+        wins = [0] * len(WINNERS)
+        unpack = GAME_HEADER.unpack_from
+        mm = self._mm
+        for kind, off, _length in self._records():
+            if kind != KIND_GAME:
+                continue
+            winner, flags, num_questions, wrong_early = unpack(mm, off)[:4]
+            summary.games += 1
+            wins[winner] += 1
+            summary.total_questions += num_questions
+            summary.errors += flags & FLAG_ERROR
+            summary.early_guesses += (flags & FLAG_EARLY_GUESS) >> 1
+            summary.wrong_early_guesses += wrong_early
+        summary.wins.update({WINNERS[code]: n for code, n in enumerate(wins) if n})
+        return summary
+
+    def _game_at(self, off: int) -> CompactGame:
+        mm = self._mm
+        winner, flags, nq, wrong_early, secret_id, guess_id, answers, wall = (
+            GAME_HEADER.unpack_from(mm, off)
+        )
+        ids_start = off + GAME_HEADER.size
+        return CompactGame(
+            secret_id,
+            guess_id,
+            bytes(mm[ids_start:ids_start + nq * QUESTION_ID.size]),
+            answers,
+            winner,
+            flags,
+            wall,
+            wrong_early,
+        )
+
+    def games(self) -> Iterator[CompactGame]:
+        for kind, off, _length in self._records():
+            if kind == KIND_GAME:
+                yield self._game_at(off)
+
+    def iter_games(self, shard: int = 0, shards: int = 1) -> Iterator[Tuple[Optional[str], CompactGame]]:
+        """
+        Stream (model, game) for every shards-th game starting at `shard`.
+
+        Strings are not decoded up front: their offsets are collected as
+        the scan passes them, and string(sid) decodes on demand. Memory
+        does not grow with the number of games, only with the number of
+        distinct strings (12 bytes each for the packed offset and length).
+        """
+        model = None
+        index = 0
+        self._string_offsets = array("Q")
+        self._string_lengths = array("I")
+        for kind, off, length in self._records():
+            if kind == KIND_STRING:
+                self._string_offsets.append(off)
+                self._string_lengths.append(length)
+            elif kind == KIND_GAME:
+                if index % shards == shard:
+                    yield model, self._game_at(off)
+                index += 1
+            elif kind == KIND_META:
+                model = self._meta_model(off, length, model)
+
+    def _meta_model(self, off: int, length: int, model: Optional[str]) -> Optional[str]:
+        # The model tag after a META record (other keys leave it unchanged)
+        key, _, value = bytes(self._mm[off:off + length]).decode("utf-8").partition("=")
+        return (value or None) if key == "model" else model
+
+    def shards(self, n: int) -> List["LogShard"]:
+        """
+        Split the log into at most n record-aligned byte ranges of about
+        equal size, in one pass over the record headers. Each range carries
+        the model tag in effect at its start and the offsets of the strings
+        defined before its end, so iter_shard reads only its own bytes.
+        """
+        targets = [len(self._mm) * k // n for k in range(1, n)]
+        offsets = array("Q")
+        lengths = array("I")
+        model = None
+        starts: List[Tuple[int, Optional[str]]] = [(len(MAGIC), None)]
+        ends_strings: List[int] = []  # strings defined before each range ends
+        end = len(MAGIC)
+        for kind, off, length in self._records():
+            record_start = off - RECORD_HEADER.size
+            if targets and record_start >= targets[0]:
+                while targets and record_start >= targets[0]:
+                    targets.pop(0)
+                starts.append((record_start, model))
+                ends_strings.append(len(offsets))
+            if kind == KIND_STRING:
+                offsets.append(off)
+                lengths.append(length)
+            elif kind == KIND_META:
+                model = self._meta_model(off, length, model)
+            end = off + length
+        ends_strings.append(len(offsets))
+        bounds = [start for start, _ in starts[1:]] + [end]
+        return [
+            LogShard(self.path, start, stop, start_model, offsets[:count], lengths[:count])
+            for (start, start_model), stop, count in zip(starts, bounds, ends_strings)
+        ]
+
+    def iter_shard(self, shard: "LogShard") -> Iterator[Tuple[Optional[str], CompactGame]]:
+        """
+        Stream (model, game) for the games in one range from shards().
+        """
+        model = shard.model
+        self._string_offsets = shard.string_offsets
+        self._string_lengths = shard.string_lengths
+        for kind, off, length in self._records(shard.start, shard.end):
+            if kind == KIND_GAME:
+                yield model, self._game_at(off)
+            elif kind == KIND_META:
+                model = self._meta_model(off, length, model)
+
+    def string(self, sid: int) -> Optional[str]:
+        """
+        Decode string `sid` (valid for ids seen so far by iter_games, or
+        defined before the end of the range being read by iter_shard).
+        """
+        if sid == NO_STRING:
+            return None
+        off, length = self._string_offsets[sid], self._string_lengths[sid]
+        return bytes(self._mm[off:off + length]).decode("utf-8")
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._fh.close()
+
+    def __enter__(self) -> "GameLogReader":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
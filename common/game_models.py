@@ -1,8 +1,11 @@
+import re
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 
+from .history_context import HistoryContext
 
-@dataclass
+
+@dataclass(slots=True)
 class GameState:
     secret_object: Optional[str] = None
     max_questions: int = 20
@@ -10,6 +13,34 @@ class GameState:
     history: List[Tuple[str, str]] = field(default_factory=list)
     winner: Optional[str] = None
     finished: bool = False
+    # Optional compact rendering of history for the questioner prompts
+    context: Optional[HistoryContext] = None
+
+
+def state_to_dict(state: GameState) -> dict:
+    """
+    JSON-ready checkpoint of a game in progress. The history context is
+    left out; it is rebuilt from the history on resume.
+    """
+    return {
+        "secret_object": state.secret_object,
+        "max_questions": state.max_questions,
+        "num_questions_asked": state.num_questions_asked,
+        "history": [list(turn) for turn in state.history],
+        "winner": state.winner,
+        "finished": state.finished,
+    }
+
+
+def state_from_dict(data: dict) -> GameState:
+    return GameState(
+        secret_object=data.get("secret_object"),
+        max_questions=data.get("max_questions", 20),
+        num_questions_asked=data.get("num_questions_asked", 0),
+        history=[(q, a) for q, a in data.get("history") or []],
+        winner=data.get("winner"),
+        finished=data.get("finished", False),
+    )
 
 
 def parse_yes_no(text: str) -> Optional[str]:
@@ -34,3 +65,26 @@ def parse_llm_guess(text: str) -> Optional[str]:
     if text.upper().startswith("GUESS:"):
         return text.split(":", 1)[1].strip()
     return None
+
+
+# A leading YES/NO word that is already followed by something else, so a
+# later delta cannot turn "NO" into "NOT" or "NOTHING"
+_EARLY_YES_NO_RE = re.compile(r"^\W*(yes|no)\b(?=\W)", flags=re.I)
+_EARLY_GUESS_RE = re.compile(r"^\s*(GUESS:[^\n]*\S)[^\n]*\n", flags=re.I)
+
+
+def early_yes_no(partial: str) -> Optional[str]:
+    """
+    'yes'/'no' as soon as a streamed answer starts with a complete YES/NO
+    word, else None (keep reading).
+    """
+    m = _EARLY_YES_NO_RE.match(partial)
+    return m.group(1).lower() if m else None
+
+
+def early_guess_line(partial: str) -> Optional[str]:
+    """
+    The 'GUESS: ...' line once a streamed reply has finished it, else None.
+    """
+    m = _EARLY_GUESS_RE.match(partial)
+    return m.group(1).strip() if m else None
@@ -0,0 +1,143 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+DEFAULT_RECENT_TURNS = 4
+DEFAULT_TOKEN_CEILING = 400
+
+# Leading "Is it (a|an)" / "Does it" etc. carries no information once grouped
+_LEAD_RE = re.compile(
+    r"^\s*(?:is|does|can|could|would|will|has|was|do)\s+(?:it|you)\s+(?:an?\s+|the\s+)?",
+    flags=re.I,
+)
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def compact_question(question: str) -> str:
+    """
+    'Is it a living thing?' -> 'a living thing' style fragment for fact lists.
+    """
+    q = question.strip().rstrip("?.! ")
+    stripped = _LEAD_RE.sub("", q)
+    return stripped or q
+
+
+def full_history_str(history: List[Tuple[str, str]]) -> str:
+    if not history:
+        return "No questions have been asked yet."
+    return "\n".join(f"{i+1}. Q: {q}  A: {a}" for i, (q, a) in enumerate(history))
+
+
+@dataclass
+class ContextStats:
+    renders: int = 0
+    full_tokens: int = 0
+    compact_tokens: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.full_tokens - self.compact_tokens
+
+
+@dataclass
+class HistoryContext:
+    """
+    Compact, incrementally maintained rendering of GameState.history for
+    the questioner prompts.
+
+    The last `recent_turns` Q/A pairs are kept verbatim; older ones are
+    folded into two fact lists (YES / NO) as they scroll out of the window.
+    If the rendering still exceeds token_ceiling (estimated), the oldest
+    facts are dropped and counted; if it is not shorter than the full
+    transcript, the full transcript is used. Only turns appended since the
+    previous render are folded; a history that is not an extension of the last
+    one (e.g. a speculative branch) triggers a rebuild.
+    """
+    recent_turns: int = DEFAULT_RECENT_TURNS
+    token_ceiling: int = DEFAULT_TOKEN_CEILING
+    stats: ContextStats = field(default_factory=ContextStats)
+
+    _folded: int = 0
+    _synced: List[Tuple[str, str]] = field(default_factory=list)
+    _yes: List[str] = field(default_factory=list)
+    _no: List[str] = field(default_factory=list)
+
+    def copy(self) -> "HistoryContext":
+        """
+        Independent clone (e.g. for a speculative branch) with its own
+        stats, so renders of discarded branches are not counted as savings.
+        """
+        clone = HistoryContext(self.recent_turns, self.token_ceiling)
+        clone._folded = self._folded
+        clone._synced = list(self._synced)
+        clone._yes = list(self._yes)
+        clone._no = list(self._no)
+        return clone
+
+    def _reset(self) -> None:
+        self._folded = 0
+        self._synced = []
+        self._yes = []
+        self._no = []
+
+    def _sync(self, history: List[Tuple[str, str]]) -> None:
+        n = len(self._synced)
+        if len(history) < n or history[:n] != self._synced:
+            self._reset()
+            n = 0
+        self._synced.extend(history[n:])
+
+        fold_upto = max(0, len(history) - self.recent_turns)
+        for q, a in history[self._folded:fold_upto]:
+            (self._yes if a == "yes" else self._no).append(compact_question(q))
+        self._folded = max(self._folded, fold_upto)
+
+    def render(self, history: List[Tuple[str, str]]) -> str:
+        """
+        Prompt text for the given history (which must be GameState.history).
+        """
+        self._sync(history)
+        full = full_history_str(history)
+        if not self._folded:
+            text = full
+        else:
+            yes, no = list(self._yes), list(self._no)
+            text = self._format(history, yes, no, dropped=0)
+            dropped = 0
+            while _estimate_tokens(text) > self.token_ceiling and (yes or no):
+                # Drop the oldest fact from the longer list
+                (yes if len(yes) >= len(no) else no).pop(0)
+                dropped += 1
+                text = self._format(history, yes, no, dropped)
+            # Early on the fact header can cost more than it saves
+            if len(full) <= len(text):
+                text = full
+
+        self.stats.renders += 1
+        self.stats.full_tokens += _estimate_tokens(full)
+        self.stats.compact_tokens += _estimate_tokens(text)
+        return text
+
+    def _format(
+        self, history: List[Tuple[str, str]], yes: List[str], no: List[str], dropped: int
+    ) -> str:
+        lines = []
+        if self._folded:
+            lines.append(f"Facts from Q1-{self._folded}:")
+            lines.append("  YES: " + ("; ".join(yes) or "-"))
+            lines.append("  NO: " + ("; ".join(no) or "-"))
+            if dropped:
+                lines.append(f"  ({dropped} older facts omitted)")
+        for i in range(self._folded, len(history)):
+            q, a = history[i]
+            lines.append(f"{i+1}. Q: {q}  A: {a}")
+        return "\n".join(lines)
+
+
+def render_history(history: List[Tuple[str, str]], context: Optional[HistoryContext]) -> str:
+    if context is None:
+        return full_history_str(history)
+    return context.render(history)
@@ -0,0 +1,280 @@
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from . import metrics
+from .attribute_oracle import AttributeMatrix
+from .game_models import GameState
+from .llm_client import LLMClient
+from .players import (
+    _direct_guess_target,
+    _normalize_object,
+    llm_generate_final_guess,
+    llm_generate_question,
+)
+
+# "Is it" at the start of an LLM wording, replaced by "Is the object"
+_IS_IT_RE = re.compile(r"^(\W*)([Ii])s it\b")
+
+# Probability that an answer contradicts the matrix (answerer mistakes,
+# borderline objects). Keeps one wrong answer from ruling a candidate out.
+DEFAULT_ANSWER_NOISE = 0.05
+# The secret is probably not in the matrix once even the best candidate
+# contradicts this many answers
+OFF_MATRIX_CONTRADICTIONS = 2
+
+
+def _bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _binary_entropy(p: float) -> float:
+    if p <= 0.0 or p >= 1.0:
+        return 0.0
+    return -(p * math.log2(p) + (1 - p) * math.log2(1 - p))
+
+
+def _article(noun: str) -> str:
+    return "an" if noun[:1].lower() in "aeiou" else "a"
+
+
+@dataclass
+class Posterior:
+    """
+    Belief over the matrix's objects after a game history.
+
+    weights[i] is P(secret == objects[i]); contradictions[i] counts answers
+    object i disagrees with. asked_attributes / guessed_objects record what
+    the history already covered, so it is not asked again.
+    """
+    weights: List[float]
+    contradictions: List[int]
+    asked_attributes: Set[int] = field(default_factory=set)
+    guessed_objects: int = 0  # bitmask
+
+    @property
+    def entropy(self) -> float:
+        return -sum(w * math.log2(w) for w in self.weights if w > 0)
+
+    def top(self) -> Tuple[int, float]:
+        best = max(range(len(self.weights)), key=self.weights.__getitem__)
+        return best, self.weights[best]
+
+    @property
+    def off_matrix(self) -> bool:
+        return min(self.contradictions) >= OFF_MATRIX_CONTRADICTIONS
+
+
+def compute_posterior(
+    matrix: AttributeMatrix,
+    history: Sequence[Tuple[str, str]],
+    noise: float = DEFAULT_ANSWER_NOISE,
+) -> Posterior:
+    """
+    Posterior from every (question, answer) the matrix can interpret:
+    direct guesses ("Is it a cat?") and mapped attribute questions. Each
+    contradicted answer multiplies an object's weight by noise / (1 - noise).
+    """
+    n = len(matrix.objects)
+    everything = matrix.all_objects_mask
+    misses = [0] * n
+    asked: Set[int] = set()
+    guessed = 0
+
+    for question, answer in history:
+        if answer not in ("yes", "no"):
+            continue
+        target = _direct_guess_target(question)
+        obj = matrix.object_index.get(_normalize_object(target)) if target else None
+        if obj is not None:
+            guessed |= 1 << obj
+            agree = 1 << obj
+        else:
+            attr = matrix.match_attribute(question)
+            if attr is None:
+                continue
+            asked.add(attr)
+            agree = matrix.attribute_masks[attr]
+        disagree = everything & ~agree if answer == "yes" else agree
+        for i in _bits(disagree):
+            misses[i] += 1
+
+    ratio = noise / (1 - noise)
+    weights = [ratio ** k for k in misses]
+    total = sum(weights)
+    return Posterior([w / total for w in weights], misses, asked, guessed)
+
+
+def expected_gain(p_yes: float, noise: float = DEFAULT_ANSWER_NOISE) -> float:
+    """
+    Expected information (bits) from a question that is true for p_yes of
+    the posterior mass, when answers are flipped with probability noise.
+    """
+    q = (1 - noise) * p_yes + noise * (1 - p_yes)
+    return _binary_entropy(q) - _binary_entropy(noise)
+
+
+def best_question(
+    matrix: AttributeMatrix, posterior: Posterior, noise: float = DEFAULT_ANSWER_NOISE
+) -> Tuple[Optional[int], Optional[int], float]:
+    """
+    (attribute index, object index, gain) of the most informative question
+    not asked yet; exactly one of the indices is set (both None if nothing
+    is left). Attribute questions win ties with direct guesses.
+    """
+    weights = posterior.weights
+    best_attr, best_obj, best_gain = None, None, -1.0
+    for j, mask in enumerate(matrix.attribute_masks):
+        if j in posterior.asked_attributes:
+            continue
+        gain = expected_gain(sum(weights[i] for i in _bits(mask)), noise)
+        if gain > best_gain:
+            best_attr, best_gain = j, gain
+    for i, w in enumerate(weights):
+        if posterior.guessed_objects >> i & 1:
+            continue
+        gain = expected_gain(w, noise)
+        if gain > best_gain:
+            best_attr, best_obj, best_gain = None, i, gain
+    return best_attr, best_obj, best_gain
+
+
+@dataclass
+class InfoGainStats:
+    matrix_questions: int = 0
+    llm_phrased: int = 0  # attribute chosen locally, worded by the LLM
+    llm_fallbacks: int = 0  # off-matrix or matrix exhausted
+    matrix_guesses: int = 0
+    llm_guesses: int = 0
+    expected_bits: float = 0.0  # summed over matrix questions
+
+    @property
+    def llm_calls_saved(self) -> int:
+        return self.matrix_questions + self.matrix_guesses
+
+
+class InfoGainQuestioner:
+    """
+    Player 2 strategy that searches a local AttributeMatrix instead of
+    asking the LLM for a free-form question every turn.
+
+    Each turn the posterior over the matrix's objects is rebuilt from
+    GameState.history and the question (attribute or direct guess) with the
+    largest expected information gain is asked, using the dataset's
+    canonical wording. The LLM is only used to word attributes that have no
+    canonical question, and as a fallback when the secret looks off-matrix
+    or every matrix question has been asked.
+
+    Use as a question generator, (llm, state) -> question, and pass
+    final_guess as the engine's guesser.
+    """
+
+    def __init__(
+        self,
+        matrix: Optional[AttributeMatrix] = None,
+        noise: float = DEFAULT_ANSWER_NOISE,
+    ):
+        self.matrix = matrix or AttributeMatrix.load()
+        self.noise = noise
+        self.stats = InfoGainStats()
+        self._phrasings: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def posterior(self, state: GameState) -> Posterior:
+        return compute_posterior(self.matrix, state.history, self.noise)
+
+    def _count(self, name: str, source: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+        metrics.increment("info_gain_moves_total", source=source)
+
+    def _wording(self, text: str, attr: int) -> Optional[str]:
+        text = text.strip()
+        question = text.splitlines()[0].strip() if text else ""
+        if _direct_guess_target(question):
+            # Answerers treat "Is it an animal?" as a guess of the object
+            # "animal"; ask about the object instead, as the dataset does
+            question = _IS_IT_RE.sub(r"\1\2s the object", question, count=1)
+            if _direct_guess_target(question):
+                return None
+        # Only keep wordings the matrix reads back as the same attribute
+        if self.matrix.match_attribute(question) != attr:
+            return None
+        return question
+
+    def _phrase(self, llm: LLMClient, attr: int) -> Optional[str]:
+        name = self.matrix.attributes[attr]
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    "Write ONE short yes/no question for a Twenty Questions game. "
+                    "Output only the question, ending with '?'."
+                ),
+            },
+            {
+                "role": "user",
+                "content": f"Ask whether the secret object has this property: {name.replace('_', ' ')}",
+            },
+        ]
+        question = self._wording(
+            llm.ask(
+                messages,
+                call_site="question",
+                validate=lambda t: self._wording(t, attr) is not None,
+            ),
+            attr,
+        )
+        if question is None:
+            return None
+        with self._lock:
+            self._phrasings[attr] = question
+        return question
+
+    def __call__(self, llm: LLMClient, state: GameState) -> str:
+        post = self.posterior(state)
+        attr = obj = None
+        gain = 0.0
+        if not post.off_matrix:
+            attr, obj, gain = best_question(self.matrix, post, self.noise)
+
+        if attr is not None or obj is not None:
+            if obj is not None:
+                name = self.matrix.objects[obj]
+                self._count("matrix_questions", "matrix")
+                question = f"Is it {_article(name)} {name}?"
+            else:
+                name = self.matrix.attributes[attr]
+                # Canonical wording, or one the LLM produced earlier
+                question = self.matrix.questions.get(name) or self._phrasings.get(attr)
+                if question is not None:
+                    self._count("matrix_questions", "matrix")
+                else:
+                    question = self._phrase(llm, attr)
+                    if question is not None:
+                        self._count("llm_phrased", "llm_phrased")
+            if question is not None:
+                with self._lock:
+                    self.stats.expected_bits += gain
+                return question
+
+        self._count("llm_fallbacks", "llm_fallback")
+        return llm_generate_question(llm, state)
+
+    def final_guess(self, llm: LLMClient, state: GameState, escalation: int = 0) -> str:
+        """
+        'GUESS: <most likely object>', or the LLM's guess when off-matrix
+        (escalation is passed on to it).
+        """
+        post = self.posterior(state)
+        if post.off_matrix:
+            self._count("llm_guesses", "llm_guess")
+            return llm_generate_final_guess(llm, state, escalation=escalation)
+        best, _ = post.top()
+        self._count("matrix_guesses", "matrix_guess")
+        return f"GUESS: {self.matrix.objects[best]}"
@@ -1,18 +1,370 @@
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+from .cassette import Cassette
+from .resilience import BackoffPolicy, HedgePolicy, post_with_policies
+from .response_cache import UNCACHED_CALL_SITES, ResponseCache, cache_key
+from .model_router import ModelRouter
+from .rate_limit import ConcurrencyController, LocalTokenBucket, shared_rate_limiter
+from .token_budget import TokenBudgeter
 
-load_dotenv()
+_env_loaded = False
 
 BASE_URL = "https://candidate-llm.extraction.artificialos.com/v1/responses"
 DEFAULT_MODEL = "gpt-5-mini-2025-08-07"
-TIMEOUT = 30
+# Wall-clock budget for one ask() call, including backoff and token retries
+DEFAULT_DEADLINE = 60.0
 
 # Large enough for reasoning + final answer
 DEFAULT_MAX_OUTPUT_TOKENS = 512
 MAX_RETRIES = 3
 MAX_HARD_LIMIT = 4096
 
+# Connection pooling: one keep-alive pool per process, shared across threads
+DEFAULT_POOL_SIZE = 10
+DEFAULT_POOL_BLOCK = True
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def build_session(
+    pool_size: int = DEFAULT_POOL_SIZE, pool_block: bool = DEFAULT_POOL_BLOCK
+) -> requests.Session:
+    """
+    Build a requests.Session with a keep-alive connection pool.
+
+    pool_size caps the number of open connections to the API host;
+    with pool_block=True extra threads wait for a free connection instead
+    of opening (and then discarding) throwaway ones.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_size, pool_block=pool_block
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def get_shared_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Return the process-wide pooled session, creating it on first use.
+    The first caller decides the pool size.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = build_session(pool_size=pool_size)
+        return _shared_session
+
+
+def close_shared_session() -> None:
+    """
+    Close the process-wide session (e.g. at the end of a tournament run).
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
+
+
+def load_env() -> None:
+    """
+    Load .env into the environment, once per process. Called when a client
+    first needs its configuration rather than at import, so importing this
+    module (e.g. for `app_cli --help`) stays cheap.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _env_loaded = True
+
+
+def require_api_key() -> str:
+    """
+    Read CANDIDATE_API_KEY from the environment or fail with a clear message.
+    """
+    load_env()
+    api_key = os.getenv("CANDIDATE_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "CANDIDATE_API_KEY is not set. "
+            "Set it in your environment or .env file."
+        )
+    return api_key
+
+
+def request_headers(api_key: str) -> dict:
+    return {
+        "Content-Type": "application/json",
+        "x-api-key": api_key,
+    }
+
+
+def initial_token_budget(max_output_tokens: Optional[int]) -> int:
+    tokens = max(128, max_output_tokens or DEFAULT_MAX_OUTPUT_TOKENS)
+    return min(tokens, MAX_HARD_LIMIT)
+
+
+def next_token_budget(tokens: int, default: int, attempt: int) -> int:
+    """
+    Budget for the retry after a truncated attempt: double it, but never
+    below the default ladder (default x2, x4, ...), so a low learned
+    starting budget cannot lower the largest budget the retries reach.
+    """
+    return min(max(tokens * 2, default << (attempt + 1)), MAX_HARD_LIMIT)
+
+
+def build_payload(model: str, messages, tokens: int) -> dict:
+    return {
+        "model": model,
+        "input": messages,
+        "max_output_tokens": min(tokens, MAX_HARD_LIMIT),
+    }
+
+
+def estimate_tokens(messages) -> int:
+    """
+    Rough prompt size in tokens (~4 characters per token). Good enough for
+    comparing strategies; the proxy does not report exact usage to callers.
+    """
+    return sum(len(m.get("content") or "") for m in messages) // 4
+
+
+def output_tokens_used(data: dict) -> Optional[int]:
+    """
+    Output token count from the response's usage block, if present.
+    """
+    used = (data.get("usage") or {}).get("output_tokens")
+    return used if isinstance(used, int) else None
+
+
+def observe_usage(data: dict, call_site: Optional[str]) -> None:
+    """
+    Feed the usage block (if any) of a response into the metrics sinks.
+    """
+    usage = data.get("usage") or {}
+    for field in ("input_tokens", "output_tokens"):
+        value = usage.get(field)
+        if isinstance(value, int):
+            metrics.observe(f"llm_{field}", value, call_site=call_site)
+
+
+def is_truncated(data: dict) -> bool:
+    """
+    True if a Responses API body was cut off by max_output_tokens.
+    """
+    status = data.get("status")
+    reason = (data.get("incomplete_details") or {}).get("reason")
+    return bool(status) and status != "completed" and reason == "max_output_tokens"
+
+
+def parse_response(data: dict, attempt: int) -> Optional[str]:
+    """
+    Interpret a decoded Responses API body.
+
+    Returns the first text segment, or None when the response was cut off
+    by max_output_tokens and the caller should retry with a bigger budget.
+    Raises RuntimeError for any other incomplete status or unexpected shape.
+    """
+    status = data.get("status")
+    if status and status != "completed":
+        reason = (data.get("incomplete_details") or {}).get("reason")
+        if reason == "max_output_tokens" and attempt < MAX_RETRIES - 1:
+            return None
+        raise RuntimeError(
+            f"LLM response not completed. status={status}, "
+            f"details={data.get('incomplete_details')}"
+        )
+
+    # Try to parse output[*].content[*].text
+    outputs = data.get("output", [])
+    for item in outputs:
+        content_list = item.get("content") or []
+        for c in content_list:
+            text = c.get("text")
+            if isinstance(text, str):
+                return text.strip()
+
+    # Fallback: some variants expose text here
+    text_block = data.get("text", {}).get("content")
+    if isinstance(text_block, str):
+        return text_block.strip()
+
+    # If we get here, structure is unexpected
+    raise RuntimeError(f"Unexpected API output structure: {data}")
+
+
+def iter_sse_events(resp: requests.Response) -> Iterator[dict]:
+    """
+    Decode the `data:` lines of a server-sent-events response body.
+    """
+    for line in resp.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        body = line[len("data:"):].strip()
+        if body == "[DONE]":
+            return
+        try:
+            yield json.loads(body)
+        except ValueError as exc:
+            raise RuntimeError(f"Malformed stream event: {body!r}") from exc
+
+
+@dataclass
+class StreamResult:
+    """
+    Outcome of LLMClient.ask_stream().
+
+    value is what the early-exit callback returned, or None when the
+    response ran to completion (parse text instead).
+    time_to_answer is when the caller had what it needed; time_to_full is
+    when the whole response had arrived, or None if the stream was closed
+    early.
+    """
+    text: str
+    value: Optional[str]
+    time_to_answer: float
+    time_to_full: Optional[float]
+
+    @property
+    def early_exit(self) -> bool:
+        return self.time_to_full is None
+
+
+class CallBookkeeper:
+    """
+    Per-call bookkeeping shared by LLMClient.ask / ask_stream and
+    AsyncLLMClient.aask, so each only sends requests and reads bodies:
+    the response cache, the token budget (learned start, doubling ladder,
+    budgeter samples) and the status / usage / latency metrics.
+
+    client is anything with cache and budgeter attributes.
+    """
+
+    def __init__(
+        self,
+        client,
+        model: str,
+        messages,
+        max_output_tokens: int,
+        call_site: Optional[str],
+        validate: Optional[Callable[[str], bool]] = None,
+    ):
+        self.call_site = call_site
+        self.validate = validate
+        self.cache = client.cache
+        self.budgeter = client.budgeter if call_site else None
+        self.tokens = initial_token_budget(max_output_tokens)
+        self.default_tokens = self.tokens
+        self.start_tokens = self.tokens
+        self.key = None
+        if self.cache is not None and call_site not in UNCACHED_CALL_SITES:
+            self.key = cache_key(model, messages, self.tokens)
+        self.started = time.perf_counter()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def cached(self) -> Optional[str]:
+        """
+        The cached reply for this call, if any.
+        """
+        if self.key is None:
+            return None
+        text = self.cache.get(self.key)
+        if text is not None:
+            metrics.increment("llm_cache_hits_total", call_site=self.call_site)
+        return text
+
+    def begin(self) -> None:
+        """
+        Start the call proper (after a cache miss) at the learned budget.
+        """
+        if self.budgeter is not None:
+            self.tokens = self.budgeter.initial_budget(
+                self.call_site, self.tokens, MAX_HARD_LIMIT
+            )
+        self.start_tokens = self.tokens
+        self.started = time.perf_counter()
+
+    def check_status(self, resp: requests.Response, sent_at: Optional[float] = None) -> None:
+        """
+        Raise RuntimeError for a non-200 reply; with sent_at (perf_counter),
+        also observe the request latency.
+        """
+        if sent_at is not None:
+            metrics.observe(
+                "llm_request_seconds",
+                time.perf_counter() - sent_at,
+                call_site=self.call_site,
+                status=resp.status_code,
+            )
+        if resp.status_code != 200:
+            metrics.increment("llm_errors_total", call_site=self.call_site, status=resp.status_code)
+            raise RuntimeError(f"API error {resp.status_code}: {resp.text}")
+
+    def complete(self, data: dict, attempt: int) -> bool:
+        """
+        Account for one decoded response body. Returns False when it was
+        cut off by max_output_tokens and should be retried (tokens is
+        raised for the retry). Raises RuntimeError for any other incomplete
+        status, or a cut-off on the last attempt.
+        """
+        observe_usage(data, self.call_site)
+        status = data.get("status")
+        if status and status != "completed":
+            if self.budgeter is not None and attempt == MAX_RETRIES - 1 and is_truncated(data):
+                # Cut off even at the last budget: it needed at least this much
+                self.budgeter.record(
+                    self.call_site,
+                    self.tokens,
+                    truncations=attempt + 1,
+                    default=self.default_tokens,
+                    start_budget=self.start_tokens,
+                )
+            parse_response(data, attempt)  # raises unless a retry is left
+            metrics.increment("llm_truncation_retries_total", call_site=self.call_site)
+            self.tokens = next_token_budget(self.tokens, self.default_tokens, attempt)
+            return False
+        used = output_tokens_used(data)
+        # Without a usage block there is nothing to learn: the budget sent is
+        # not what the reply used
+        if self.budgeter is not None and used is not None:
+            self.budgeter.record(
+                self.call_site,
+                used,
+                truncations=attempt,
+                default=self.default_tokens,
+                start_budget=self.start_tokens,
+            )
+        return True
+
+    def finish(self, text: str) -> str:
+        """
+        Observe the call latency and cache text if the caller's validate
+        accepts it.
+        """
+        metrics.observe("llm_call_seconds", self.elapsed(), call_site=self.call_site)
+        if self.key is not None and (self.validate is None or self.validate(text)):
+            self.cache.put(self.key, text)
+        return text
+
 
 class LLMClient:
     """
@@ -21,78 +373,259 @@ class LLMClient:
     - Safe token defaults
     - Retry on 'max_output_tokens' incomplete errors
     - Robust parsing of the 'output' structure
+    - Pooled keep-alive HTTP transport (shared across threads by default)
+    - Jittered exponential backoff on 429/5xx, honouring Retry-After
+    - Per-call deadlines and optional hedged requests
+    - Streaming with an early-exit callback (ask_stream)
+    - Optional per-call-site model routing with escalation (ModelRouter)
+    - Shared token-bucket pacing and AIMD concurrency control (rate_limit)
+    - Record/replay of all traffic through a Cassette
     """
 
-    def __init__(self, model: str = DEFAULT_MODEL):
-        api_key = os.getenv("CANDIDATE_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "CANDIDATE_API_KEY is not set. "
-                "Set it in your environment or .env file."
-            )
-        self.api_key = api_key
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        session: Optional[requests.Session] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        share_pool: bool = True,
+        cache: Optional[ResponseCache] = None,
+        budgeter: Optional[TokenBudgeter] = None,
+        base_url: str = BASE_URL,
+        backoff: Optional[BackoffPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+        deadline: float = DEFAULT_DEADLINE,
+        router: Optional[ModelRouter] = None,
+        rate_limiter: Optional[LocalTokenBucket] = None,
+        concurrency: Optional[ConcurrencyController] = None,
+        cassette: Optional[Cassette] = None,
+    ):
+        # Replaying a cassette needs neither the network nor a key
+        replaying = cassette is not None and not cassette.recording
+        self.api_key = "" if replaying else require_api_key()
         self.model = model
+        self.base_url = base_url
+        self.deadline = deadline
+        # Retry 429/5xx by default; pass BackoffPolicy(max_attempts=1) to disable
+        self.backoff = backoff or BackoffPolicy()
+        # Opt-in: duplicate slow requests after the adaptive p95 delay
+        self.hedge = hedge
+        self._hedge_executor = (
+            ThreadPoolExecutor(max_workers=2 * pool_size, thread_name_prefix="llm-hedge")
+            if hedge is not None
+            else None
+        )
+        # Opt-in: identical (model, messages, budget) calls are served locally
+        self.cache = cache
+        # Opt-in: learned starting token budget per call site
+        self.budgeter = budgeter
+        # Opt-in: model per call site, escalating on format retries
+        self.router = router
+        # Request pacing; defaults to the host-wide LLM_RATE_LIMIT bucket
+        self.rate_limiter = rate_limiter if rate_limiter is not None else shared_rate_limiter()
+        # Opt-in: AIMD limit on requests in flight
+        self.concurrency = concurrency
 
-    def ask(self, messages, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS) -> str:
+        # Reuse TCP+TLS connections between turns instead of a handshake per call
+        self._owns_session = False
+        if session is not None:
+            self.session = session
+        elif share_pool:
+            self.session = get_shared_session(pool_size=pool_size)
+        else:
+            self.session = build_session(pool_size=pool_size)
+            self._owns_session = True
+        # Opt-in: record every response to, or replay it from, a cassette
+        if cassette is not None:
+            self.session = cassette.session(None if replaying else self.session)
+
+    def close(self) -> None:
+        """
+        Close the client's private session. Shared sessions are left open.
+        """
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if self._owns_session:
+            self.session.close()
+
+    def ask(
+        self,
+        messages,
+        max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
+        call_site: Optional[str] = None,
+        deadline: Optional[float] = None,
+        escalation: int = 0,
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> str:
         """
         Call the Responses API with a list of messages:
             [{"role": "system", "content": "..."}, {"role": "user", "content": "..."}]
 
         Automatically retries if the response is 'incomplete' due to max_output_tokens.
         Returns the first text segment from the 'output' list.
+
+        call_site names the caller ("answer", "question", ...) so a budgeter
+        can pick a starting token budget learned for that kind of call.
+        deadline (seconds) overrides the client's per-call deadline.
+        escalation (the caller's format-retry attempt) picks a stronger
+        router tier; it is ignored without a router.
+        validate is the caller's format check: with a cache, only replies it
+        accepts are stored, so a malformed reply is not served again to the
+        caller's retry. Object-list calls are never cached.
         """
-        tokens = max(128, max_output_tokens or DEFAULT_MAX_OUTPUT_TOKENS)
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.api_key,
-        }
+        model = self.model_for(call_site, escalation)
+        args = (model, messages, max_output_tokens, call_site, deadline, validate)
+        if self.router is None:
+            return self._ask(*args)
+        with self.router.track(call_site, model):
+            return self._ask(*args)
 
-        for attempt in range(MAX_RETRIES):
-            if tokens > MAX_HARD_LIMIT:
-                tokens = MAX_HARD_LIMIT
+    def model_for(self, call_site: Optional[str], escalation: int = 0) -> str:
+        if self.router is None:
+            return self.model
+        return self.router.model_for(call_site, escalation, fallback=self.model)
+
+    def _ask(
+        self,
+        model: str,
+        messages,
+        max_output_tokens: int,
+        call_site: Optional[str],
+        deadline: Optional[float],
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        book = CallBookkeeper(self, model, messages, max_output_tokens, call_site, validate)
+        cached = book.cached()
+        if cached is not None:
+            return cached
+        book.begin()
 
-            payload = {
-                "model": self.model,
-                "input": messages,
-                "max_output_tokens": tokens,
-            }
+        headers = request_headers(self.api_key)
+        deadline_at = time.monotonic() + (deadline or self.deadline)
 
-            resp = requests.post(
-                BASE_URL, json=payload, headers=headers, timeout=TIMEOUT
+        for attempt in range(MAX_RETRIES):
+            sent_at = time.perf_counter()
+            resp = post_with_policies(
+                self.session,
+                self.base_url,
+                build_payload(model, messages, book.tokens),
+                headers,
+                deadline_at,
+                self.backoff,
+                hedge=self.hedge,
+                executor=self._hedge_executor,
+                call_site=call_site,
+                rate_limiter=self.rate_limiter,
+                concurrency=self.concurrency,
             )
+            book.check_status(resp, sent_at)
+            data = resp.json()
+            if not book.complete(data, attempt):
+                continue  # cut off by the token limit, retry with more
+            return book.finish(parse_response(data, attempt))
 
-            if resp.status_code != 200:
-                raise RuntimeError(f"API error {resp.status_code}: {resp.text}")
+        raise RuntimeError("LLM ask() failed after retries.")
 
-            data = resp.json()
+    def ask_stream(
+        self,
+        messages,
+        max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
+        call_site: Optional[str] = None,
+        deadline: Optional[float] = None,
+        early_exit: Optional[Callable[[str], Optional[str]]] = None,
+        escalation: int = 0,
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> StreamResult:
+        """
+        Like ask(), but requests a streamed response and feeds the text
+        received so far to early_exit after every delta. As soon as it
+        returns something other than None the stream is closed and that
+        value is returned without waiting for the rest of the response.
 
-            status = data.get("status")
-            if status and status != "completed":
-                reason = (data.get("incomplete_details") or {}).get("reason")
-                # If we hit the token limit, retry with more
-                if reason == "max_output_tokens" and attempt < MAX_RETRIES - 1:
-                    tokens = min(tokens * 2, MAX_HARD_LIMIT)
-                    continue
-                raise RuntimeError(
-                    f"LLM response not completed. status={status}, "
-                    f"details={data.get('incomplete_details')}"
-                )
+        Only complete responses that pass validate are cached, and only
+        complete responses are fed to the budgeter. Hedging is not applied
+        to streams.
+        """
+        model = self.model_for(call_site, escalation)
+        args = (model, messages, max_output_tokens, call_site, deadline, early_exit, validate)
+        if self.router is None:
+            return self._ask_stream(*args)
+        with self.router.track(call_site, model):
+            return self._ask_stream(*args)
 
-            # Try to parse output[*].content[*].text
-            outputs = data.get("output", [])
-            for item in outputs:
-                content_list = item.get("content") or []
-                for c in content_list:
-                    text = c.get("text")
-                    if isinstance(text, str):
-                        return text.strip()
+    def _ask_stream(
+        self,
+        model: str,
+        messages,
+        max_output_tokens: int,
+        call_site: Optional[str],
+        deadline: Optional[float],
+        early_exit: Optional[Callable[[str], Optional[str]]],
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> StreamResult:
+        book = CallBookkeeper(self, model, messages, max_output_tokens, call_site, validate)
+        cached = book.cached()
+        if cached is not None:
+            elapsed = book.elapsed()
+            return StreamResult(cached, None, elapsed, elapsed)
+        book.begin()
 
-            # Fallback: some variants expose text here
-            text_block = data.get("text", {}).get("content")
-            if isinstance(text_block, str):
-                return text_block.strip()
+        headers = request_headers(self.api_key)
+        deadline_at = time.monotonic() + (deadline or self.deadline)
 
-            # If we get here, structure is unexpected
-            raise RuntimeError(f"Unexpected API output structure: {data}")
+        for attempt in range(MAX_RETRIES):
+            payload = build_payload(model, messages, book.tokens)
+            payload["stream"] = True
 
-        raise RuntimeError("LLM ask() failed after retries.")
+            resp = post_with_policies(
+                self.session,
+                self.base_url,
+                payload,
+                headers,
+                deadline_at,
+                self.backoff,
+                call_site=call_site,
+                stream=True,
+                rate_limiter=self.rate_limiter,
+                concurrency=self.concurrency,
+            )
+            book.check_status(resp)
+
+            parts = []
+            final = None
+            try:
+                for event in iter_sse_events(resp):
+                    kind = event.get("type")
+                    if kind == "response.output_text.delta":
+                        parts.append(event.get("delta") or "")
+                        if early_exit is None:
+                            continue
+                        value = early_exit("".join(parts))
+                        if value is not None:
+                            elapsed = book.elapsed()
+                            metrics.increment("llm_stream_early_exits_total", call_site=call_site)
+                            metrics.observe(
+                                "llm_time_to_answer_seconds", elapsed, call_site=call_site
+                            )
+                            metrics.observe("llm_call_seconds", elapsed, call_site=call_site)
+                            return StreamResult("".join(parts), value, elapsed, None)
+                    elif kind in ("response.completed", "response.incomplete", "response.failed"):
+                        final = event.get("response") or {}
+                        break
+                    elif kind == "error":
+                        raise RuntimeError(f"LLM stream error: {event}")
+            finally:
+                # Closing mid-body drops the connection rather than reading the rest
+                resp.close()
+
+            if final is None:
+                raise RuntimeError("LLM stream ended without a final response event.")
+            if not book.complete(final, attempt):
+                continue
+
+            elapsed = book.elapsed()
+            metrics.observe("llm_time_to_answer_seconds", elapsed, call_site=call_site)
+            metrics.observe("llm_time_to_full_seconds", elapsed, call_site=call_site)
+            text = book.finish("".join(parts).strip())
+            return StreamResult(text, None, elapsed, elapsed)
+
+        raise RuntimeError("LLM ask_stream() failed after retries.")
@@ -0,0 +1,186 @@
+"""
+Lightweight metrics for the LLM hot path.
+
+Code calls observe()/increment() unconditionally; with no sink installed
+these return after a single truthiness check, so instrumentation is
+effectively free unless someone is listening. Install sinks with
+add_sink(): InMemorySink (histograms + counters, p50/p99, Prometheus text
+export) or JsonlSink (one JSON event per line).
+"""
+import bisect
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_sinks: list = []
+
+
+def add_sink(sink) -> None:
+    _sinks.append(sink)
+
+
+def remove_sink(sink) -> None:
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def clear_sinks() -> None:
+    _sinks.clear()
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """
+    Record one sample of a histogram metric (e.g. latency, token count).
+    """
+    if not _sinks:
+        return
+    for sink in _sinks:
+        sink.observe(name, value, labels)
+
+
+def increment(name: str, amount: float = 1, **labels) -> None:
+    """
+    Add to a counter metric.
+    """
+    if not _sinks:
+        return
+    for sink in _sinks:
+        sink.increment(name, amount, labels)
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket containing the q-th quantile.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class InMemorySink:
+    """
+    Aggregates metrics in process. Names ending in '_seconds' use latency
+    buckets; other histograms use power-of-two count buckets.
+    """
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, labels: Dict[str, object]) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                buckets = LATENCY_BUCKETS if name.endswith("_seconds") else COUNT_BUCKETS
+                hist = self.histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def increment(self, name: str, amount: float, labels: Dict[str, object]) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def counter(self, name: str, **labels) -> float:
+        """
+        Counter value; labels not given are summed over.
+        """
+        wanted = set(_label_key(labels))
+        return sum(
+            v for (n, key), v in self.counters.items() if n == name and wanted <= set(key)
+        )
+
+    def percentile(self, name: str, q: float, **labels) -> Optional[float]:
+        hist = self.histograms.get((name, _label_key(labels)))
+        return hist.percentile(q) if hist else None
+
+    def prometheus_text(self) -> str:
+        """
+        Render everything in the Prometheus text exposition format.
+        """
+        def fmt(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = key + extra
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted({n for n, _ in self.counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (n, key), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{name}{fmt(key)} {value:g}")
+            for name in sorted({n for n, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, key), hist in sorted(self.histograms.items(), key=lambda kv: kv[0]):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, c in zip(hist.buckets, hist.counts):
+                        cumulative += c
+                        lines.append(
+                            f"{name}_bucket{fmt(key, (('le', f'{bound:g}'),))} {cumulative}"
+                        )
+                    lines.append(f"{name}_bucket{fmt(key, (('le', '+Inf'),))} {hist.count}")
+                    lines.append(f"{name}_sum{fmt(key)} {hist.total:g}")
+                    lines.append(f"{name}_count{fmt(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+class JsonlSink:
+    """
+    Appends every observation as a JSON line: {"ts", "type", "name", "value", "labels"}.
+    """
+
+    def __init__(self, path: str):
+        self._fh = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def _write(self, kind: str, name: str, value: float, labels: Dict[str, object]) -> None:
+        line = json.dumps(
+            {"ts": time.time(), "type": kind, "name": name, "value": value, "labels": labels}
+        )
+        with self._lock:
+            self._fh.write(line + "\n")
+
+    def observe(self, name: str, value: float, labels: Dict[str, object]) -> None:
+        self._write("histogram", name, value, labels)
+
+    def increment(self, name: str, amount: float, labels: Dict[str, object]) -> None:
+        self._write("counter", name, amount, labels)
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
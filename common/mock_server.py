@@ -0,0 +1,251 @@
+"""
+Local stand-in for the Responses API, for offline benchmarks and tests.
+
+Speaks the same /v1/responses shape LLMClient parses (status,
+incomplete_details, output[].content[].text, usage) with configurable
+latency, error and truncation rates and scripted replies. Requests with
+"stream": true get server-sent events (output_text deltas, then a final
+response.completed / response.incomplete event).
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Sequence
+
+DEFAULT_OBJECTS = (
+    "cat", "apple", "chair", "bicycle", "guitar", "banana", "hammer", "dog",
+    "smartphone", "tree", "horse", "carrot", "lamp", "spoon", "piano", "boat",
+    "penguin", "bread", "clock", "umbrella", "book", "pencil", "shark", "rose",
+    "laptop", "toaster", "orange", "scissors", "ball", "elephant",
+)
+DEFAULT_QUESTIONS = (
+    "Is it alive?",
+    "Is it man-made?",
+    "Can you hold it in your hand?",
+    "Is it edible?",
+    "Is it found in a house?",
+    "Does it have legs?",
+    "Is it electronic?",
+    "Is it made of metal?",
+)
+
+
+@dataclass
+class MockConfig:
+    latency_median: float = 0.02  # seconds
+    latency_sigma: float = 0.5  # log-normal spread; 0 for fixed latency
+    error_rate: float = 0.0
+    error_status: int = 500
+    truncation_rate: float = 0.0
+    objects: Sequence[str] = DEFAULT_OBJECTS
+    questions: Sequence[str] = DEFAULT_QUESTIONS
+    # Scripted YES/NO replies, consumed in order; random once exhausted
+    answers: List[str] = field(default_factory=list)
+    seed: Optional[int] = None
+    # Generation speed: pause per output chunk (a word or so). Filler chunks
+    # after YES/NO replies mimic an answerer that keeps explaining itself;
+    # unstreamed replies wait for all chunks, streamed ones see them arrive.
+    stream_chunk_delay: float = 0.0
+    stream_tail_chunks: int = 0
+    # Requests served at once before answering 429 (0 = unlimited), like a
+    # proxy with a concurrency cap
+    max_inflight: int = 0
+    # Share of generated questions that carry an example hint, which the
+    # questioner's format check rejects
+    hinted_question_rate: float = 0.0
+
+
+def _chunks(text: str) -> List[str]:
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def _stream_events(body: dict):
+    """
+    SSE events for a complete (status, body) reply.
+    """
+    text = ""
+    for item in body.get("output") or []:
+        for c in item.get("content") or []:
+            text += c.get("text") or ""
+    for chunk in _chunks(text):
+        yield {"type": "response.output_text.delta", "delta": chunk}
+    kind = "response.completed" if body.get("status") == "completed" else "response.incomplete"
+    yield {"type": kind, "response": body}
+
+
+def _reply_text(config: MockConfig, rng: random.Random, system: str, user: str) -> str:
+    if "numbered item" in system:
+        rows = [line for line in user.splitlines() if line.strip()]
+        return "\n".join(
+            f"{i + 1}. {rng.choice(['YES', 'NO'])}" for i in range(len(rows))
+        )
+    if "final guess" in system:
+        return f"GUESS: {rng.choice(config.objects)}"
+    if "Secret object:" in user:
+        if config.answers:
+            return config.answers.pop(0)
+        return rng.choice(["YES", "NO"])
+    if "Propose" in user:
+        m = re.search(r"Propose (\d+)", user)
+        n = int(m.group(1)) if m else 10
+        m = re.search(r"Do NOT propose any of these: (.*)\.", user)
+        excluded = set(m.group(1).split(", ")) if m else set()
+        allowed = [o for o in config.objects if o not in excluded]
+        return "\n".join(rng.sample(allowed, min(n, len(allowed))))
+    if "choosing a secret object" in system:
+        return rng.choice(config.objects)
+    m = re.search(r"produce (\d+) different candidate questions", user)
+    n = int(m.group(1)) if m else 1
+    return "\n".join(_question(config, rng) for _ in range(n))
+
+
+def _question(config: MockConfig, rng: random.Random) -> str:
+    question = rng.choice(config.questions)
+    if config.hinted_question_rate and rng.random() < config.hinted_question_rate:
+        return question.rstrip("?") + f", like a {rng.choice(config.objects)}?"
+    return question
+
+
+class MockResponsesServer:
+    """
+    Threaded HTTP server answering POST /v1/responses. Use as a context
+    manager; `url` is the endpoint to pass as LLMClient(base_url=...).
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.request_count = 0
+        self.rejected_count = 0
+        self.peak_inflight = 0
+        self._inflight = 0
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/responses"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real proxy
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def log_message(self, *_args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                status, body = server.respond(payload, self.path)
+                if payload.get("stream") and status == 200:
+                    self._send_stream(body)
+                    return
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, body: dict) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for i, event in enumerate(_stream_events(body)):
+                        if i and server.config.stream_chunk_delay > 0:
+                            time.sleep(server.config.stream_chunk_delay)
+                        data = f"data: {json.dumps(event)}\n\n".encode("utf-8")
+                        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client closed the stream early
+                    self.close_connection = True
+
+        return Handler
+
+    def respond(self, payload: dict, path: str = "/v1/responses"):
+        """
+        Build (status, body) for one request. Sleeps for the sampled latency.
+        """
+        cfg = self.config
+        with self._lock:
+            self.request_count += 1
+            if cfg.max_inflight and self._inflight >= cfg.max_inflight:
+                self.rejected_count += 1
+                return 429, {"error": "too many concurrent requests"}
+            self._inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self._inflight)
+        try:
+            return self._respond(payload, path)
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    def _respond(self, payload: dict, path: str):
+        cfg = self.config
+        with self._lock:
+            rng_value = self._rng.random()
+            truncate = self._rng.random() < cfg.truncation_rate
+            latency = cfg.latency_median
+            if cfg.latency_sigma > 0 and cfg.latency_median > 0:
+                latency = self._rng.lognormvariate(math.log(cfg.latency_median), cfg.latency_sigma)
+            messages = payload.get("input") or []
+            system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+            user = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+            text = _reply_text(cfg, self._rng, system, user)
+            if "Secret object:" in user and "numbered item" not in system:
+                text += " ..." * cfg.stream_tail_chunks
+        if not payload.get("stream"):
+            latency += cfg.stream_chunk_delay * len(_chunks(text))
+
+        if latency > 0:
+            time.sleep(latency)
+
+        if not path.rstrip("/").endswith("/v1/responses"):
+            return 404, {"error": "not found"}
+        if rng_value < cfg.error_rate:
+            return cfg.error_status, {"error": "injected failure"}
+
+        budget = int(payload.get("max_output_tokens") or 0)
+        input_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+        if truncate and budget < 4096:
+            return 200, {
+                "status": "incomplete",
+                "incomplete_details": {"reason": "max_output_tokens"},
+                "output": [],
+                "usage": {"input_tokens": input_tokens, "output_tokens": budget},
+            }
+        return 200, {
+            "status": "completed",
+            "output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}],
+            "usage": {"input_tokens": input_tokens, "output_tokens": max(1, len(text) // 4)},
+        }
+
+    def start(self) -> "MockResponsesServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockResponsesServer":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class TierStats:
+    calls: int = 0
+    errors: int = 0  # calls that raised (API errors, deadlines, truncation)
+    total_seconds: float = 0.0
+    # Reported by the players: did the reply pass the format check?
+    format_ok: int = 0
+    format_failures: int = 0
+
+    @property
+    def avg_seconds(self) -> float:
+        ok = self.calls - self.errors
+        return self.total_seconds / ok if ok else 0.0
+
+    @property
+    def success_rate(self) -> float:
+        """
+        Share of replies that were usable: format checks when the caller
+        reports them, otherwise calls that did not raise.
+        """
+        checked = self.format_ok + self.format_failures
+        if checked:
+            return self.format_ok / checked
+        return (self.calls - self.errors) / self.calls if self.calls else 0.0
+
+
+class ModelRouter:
+    """
+    Picks the model for each LLM call from its call site ("answer",
+    "question", "final_guess", "object_list", ...) and escalation level.
+
+    routes maps a call site to its tiers, cheapest first; sites without a
+    route use default_tiers, or the client's own model when that is empty.
+    escalation n selects tier n (clamped to the last one): the players pass
+    their format-retry attempt, so a reply that fails the YES/NO or
+    question check is retried on a stronger model.
+    Latency, errors and format outcomes are kept per (call site, model) so
+    the table can be tuned from data (see report()).
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, Sequence[str]]] = None,
+        default_tiers: Sequence[str] = (),
+    ):
+        self.routes: Dict[str, List[str]] = {site: list(t) for site, t in (routes or {}).items()}
+        self.default_tiers = list(default_tiers)
+        for site, tiers in self.routes.items():
+            if not tiers:
+                raise ValueError(f"Route for {site!r} has no models.")
+        self.stats: Dict[Tuple[str, str], TierStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "ModelRouter":
+        """
+        Read {"routes": {site: [models...]}, "default": [models...]}.
+        """
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        return cls(data.get("routes") or {}, data.get("default") or ())
+
+    def tiers(self, call_site: Optional[str]) -> List[str]:
+        return self.routes.get(call_site or "", self.default_tiers)
+
+    def model_for(self, call_site: Optional[str], escalation: int = 0, fallback: str = "") -> str:
+        """
+        Model for this call; fallback (the client's own model) when neither
+        the site nor the default has tiers.
+        """
+        tiers = self.tiers(call_site)
+        if not tiers:
+            return fallback
+        return tiers[min(max(escalation, 0), len(tiers) - 1)]
+
+    def _tier(self, call_site: Optional[str], model: str) -> TierStats:
+        # Caller holds self._lock
+        return self.stats.setdefault((call_site or "", model), TierStats())
+
+    @contextmanager
+    def track(self, call_site: Optional[str], model: str) -> Iterator[None]:
+        """
+        Time one call on `model`; an exception counts as an error.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            with self._lock:
+                tier = self._tier(call_site, model)
+                tier.calls += 1
+                tier.errors += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            tier = self._tier(call_site, model)
+            tier.calls += 1
+            tier.total_seconds += elapsed
+
+    def record_format(self, call_site: str, escalation: int, ok: bool, fallback: str = "") -> None:
+        """
+        Record whether the reply of a call made at `escalation` was usable.
+        """
+        model = self.model_for(call_site, escalation, fallback)
+        with self._lock:
+            tier = self._tier(call_site, model)
+            if ok:
+                tier.format_ok += 1
+            else:
+                tier.format_failures += 1
+
+    def report(self) -> List[dict]:
+        """
+        One row per (call site, model), for logging or tuning the routes.
+        """
+        with self._lock:
+            items = sorted(self.stats.items())
+            return [
+                {
+                    "call_site": site,
+                    "model": model,
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "avg_seconds": s.avg_seconds,
+                    "success_rate": s.success_rate,
+                }
+                for (site, model), s in items
+            ]
+
+
+def report_format(llm, call_site: str, escalation: int, ok: bool) -> None:
+    """
+    Tell the client's router (if any) how a player's format check went.
+    """
+    router = getattr(llm, "router", None)
+    if router is not None:
+        router.record_format(call_site, escalation, ok, fallback=llm.model)
@@ -1,9 +1,15 @@
 import re
 import random
-from typing import Optional
+from typing import Optional, Sequence
 
 from .llm_client import LLMClient, DEFAULT_MAX_OUTPUT_TOKENS
-from .game_models import GameState, parse_yes_no
+from . import metrics
+from .game_models import GameState, early_guess_line, early_yes_no, parse_llm_guess, parse_yes_no
+from .history_context import render_history
+from .model_router import report_format
+
+# Used when the questioner keeps producing hint-laden questions
+FALLBACK_QUESTION = "Is it something you can hold in your hand?"
 
 
 def _normalize_object(name: str) -> str:
@@ -13,6 +19,17 @@ def _normalize_object(name: str) -> str:
     return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
 
 
+def _direct_guess_target(question: str) -> Optional[str]:
+    """
+    The X in "is it a/an/the X?", or None if the question is not of that form.
+    """
+    # Pattern: "is it a cat", "is it an apple", "is it the Eiffel Tower?"
+    m = re.search(r"\bis it\s+(?:an?|the)\s+(.+?)[\?\.\!]*$", question.strip(), flags=re.I)
+    if not m:
+        return None
+    return m.group(1).strip() or None
+
+
 def _rule_based_direct_guess(secret: Optional[str], question: str) -> Optional[str]:
     """
     If the question is of the form "is it a/an/the X", handle it rule-based
@@ -26,13 +43,7 @@ def _rule_based_direct_guess(secret: Optional[str], question: str) -> Optional[s
     if not secret:
         return None
 
-    q = question.strip()
-    # Pattern: "is it a cat", "is it an apple", "is it the Eiffel Tower?"
-    m = re.search(r"\bis it\s+(?:an?|the)\s+(.+?)[\?\.\!]*$", q, flags=re.I)
-    if not m:
-        return None
-
-    guess_raw = m.group(1).strip()
+    guess_raw = _direct_guess_target(question)
     if not guess_raw:
         return None
 
@@ -73,10 +84,19 @@ def _sanitize_question_text(q: str) -> str:
     return q
 
 
-def _llm_propose_object_list(llm: LLMClient, n: int = 10) -> list[str]:
-    """
-    Ask the LLM to propose a list of distinct, common objects, then parse them.
-    """
+def _is_yes_no(text: str) -> bool:
+    return parse_yes_no(text) in {"yes", "no"}
+
+
+def _is_clean_question(text: str) -> bool:
+    return bool(text.strip()) and not _question_has_bad_hints(_sanitize_question_text(text))
+
+
+def _is_guess_line(text: str) -> bool:
+    return parse_llm_guess(text.strip()) is not None
+
+
+def _object_list_messages(n: int, exclude: Sequence[str] = ()) -> list[dict]:
     system = (
         "You are helping choose a secret object for a Twenty Questions game.\n"
         "RULES:\n"
@@ -86,17 +106,20 @@ def _llm_propose_object_list(llm: LLMClient, n: int = 10) -> list[str]:
         "  - Output ONLY object names, one per line.\n"
     )
     user = f"Propose {n} different secret objects."
+    if exclude:
+        user += "\nDo NOT propose any of these: " + ", ".join(exclude) + "."
+
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
 
-    text = llm.ask(
-        [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-        max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
-    )
 
+def _parse_object_list(text: str) -> list[str]:
+    """
+    Split an object-list reply into names, deduplicated while preserving order.
+    """
     raw_lines = [line.strip() for line in text.splitlines() if line.strip()]
-    # Deduplicate while preserving order
     seen = set()
     candidates: list[str] = []
     for item in raw_lines:
@@ -109,19 +132,26 @@ def _llm_propose_object_list(llm: LLMClient, n: int = 10) -> list[str]:
     return candidates
 
 
-def llm_choose_secret_object(llm: LLMClient) -> str:
+def _llm_propose_object_list(
+    llm: LLMClient, n: int = 10, exclude: Sequence[str] = (), escalation: int = 0
+) -> list[str]:
     """
-    Choose a secret object, giving the LLM a chance to diversify:
-    - LLM proposes a list of candidate objects.
-    - We pick one uniformly at random.
-    - If parsing fails, fall back to a simple single-object prompt.
+    Ask the LLM to propose a list of distinct, common objects, then parse them.
+    exclude lists objects the model is asked not to propose; escalation is
+    the retry number, so a routed client can move to a stronger tier.
     """
-    candidates = _llm_propose_object_list(llm, n=10)
+    text = llm.ask(
+        _object_list_messages(n, exclude),
+        max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+        call_site="object_list",
+        escalation=escalation,
+    )
+    candidates = _parse_object_list(text)
+    report_format(llm, "object_list", escalation, bool(candidates))
+    return candidates
 
-    if candidates:
-        return random.choice(candidates).strip()
 
-    # Fallback: single-object choice
+def _secret_object_messages() -> list[dict]:
     system = (
         "You are Player 1 choosing a secret object for a Twenty Questions game.\n"
         "RULES YOU MUST FOLLOW:\n"
@@ -134,31 +164,35 @@ def llm_choose_secret_object(llm: LLMClient) -> str:
     )
     user = "Choose your secret object now."
 
-    text = llm.ask(
-        [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-        max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
-    )
-    return text.strip() or "apple"  # hard fallback if everything else fails
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
 
 
-def llm_answer_question(llm: LLMClient, secret: Optional[str], question: str) -> str:
+def llm_choose_secret_object(llm: LLMClient) -> str:
     """
-    LLM as Player 1: answers a yes/no question about the secret object.
-
-    - First tries a rule-based override for direct guesses like "is it an apple".
-      This guarantees logical consistency for that pattern.
-    - Otherwise, uses the LLM with a strong system prompt.
+    Choose a secret object, giving the LLM a chance to diversify:
+    - LLM proposes a list of candidate objects.
+    - We pick one uniformly at random.
+    - If parsing fails, fall back to a simple single-object prompt.
     """
+    candidates = _llm_propose_object_list(llm, n=10)
 
-    # 1) Rule-based override for direct guesses like "is it an apple?"
-    rb = _rule_based_direct_guess(secret, question)
-    if rb in {"yes", "no"}:
-        return rb
+    if candidates:
+        return random.choice(candidates).strip()
 
-    # 2) Fallback to LLM
+    # Fallback: single-object choice, escalated since the list did not parse
+    text = llm.ask(
+        _secret_object_messages(),
+        max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+        call_site="secret_object",
+        escalation=1,
+    )
+    return text.strip() or "apple"  # hard fallback if everything else fails
+
+
+def _answer_messages(secret: Optional[str], question: str) -> list[dict]:
     system = (
         "You are Player 1 in a Twenty Questions game.\n"
         "The secret object will be provided to you.\n"
@@ -177,39 +211,92 @@ def llm_answer_question(llm: LLMClient, secret: Optional[str], question: str) ->
     )
     user = f"Secret object: {secret}\nQuestion: {question}"
 
-    # Try a few times to get a clean YES/NO
-    for _ in range(3):
-        text = llm.ask(
-            [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
-        )
-        yn = parse_yes_no(text)
-        if yn in {"yes", "no"}:
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+
+def llm_answer_question(
+    llm: LLMClient, secret: Optional[str], question: str, stream: bool = False
+) -> str:
+    """
+    LLM as Player 1: answers a yes/no question about the secret object.
+
+    - First tries a rule-based override for direct guesses like "is it an apple".
+      This guarantees logical consistency for that pattern.
+    - Otherwise, uses the LLM with a strong system prompt.
+    - With stream=True the response is streamed and closed as soon as it
+      starts with a complete YES/NO word.
+    """
+
+    # 1) Rule-based override for direct guesses like "is it an apple?"
+    rb = _rule_based_direct_guess(secret, question)
+    if rb in {"yes", "no"}:
+        return rb
+
+    # 2) Fallback to LLM
+    messages = _answer_messages(secret, question)
+
+    # Try a few times to get a clean YES/NO; with a model router each
+    # retry escalates to a stronger tier
+    for attempt in range(3):
+        if stream:
+            result = llm.ask_stream(
+                messages,
+                max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+                call_site="answer",
+                early_exit=early_yes_no,
+                escalation=attempt,
+                validate=_is_yes_no,
+            )
+            yn = result.value or parse_yes_no(result.text)
+        else:
+            text = llm.ask(
+                messages,
+                max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+                call_site="answer",
+                escalation=attempt,
+                validate=_is_yes_no,
+            )
+            yn = parse_yes_no(text)
+        ok = yn in {"yes", "no"}
+        report_format(llm, "answer", attempt, ok)
+        if ok:
             return yn
+        metrics.increment("format_retries_total", call_site="answer")
 
     # If the model still fails, be conservative
     return "no"
 
 
-def llm_generate_question(llm: LLMClient, state: GameState) -> str:
-    """
-    Generate the NEXT yes/no question while there is more than one question remaining.
-    This function is never used for the final forced guess.
+def _history_str(state: GameState) -> str:
+    return render_history(state.history, state.context)
 
-    We keep full history to give the model maximum context, but keep the
-    instructions strict to avoid weird emergent behaviour.
+
+def _question_messages(state: GameState, candidates: int = 1) -> list[dict]:
+    """
+    Prompt for Player 2's next question; with candidates > 1 the model is
+    asked for that many alternatives, one per line.
     """
-    if not state.history:
-        history_str = "No questions have been asked yet."
+    history_str = _history_str(state)
+    remaining = state.max_questions - state.num_questions_asked
+
+    if candidates > 1:
+        output_format = (
+            "OUTPUT FORMAT:\n"
+            f"  - Respond with {candidates} DIFFERENT questions, one per line, each ending with '?'.\n"
+            "  - Put your best question first.\n"
+            "  - No explanations, no numbering, no additional text.\n"
+        )
+        request = f"Now produce {candidates} different candidate questions following the rules above."
     else:
-        history_str = "\n".join(
-            f"{i+1}. Q: {q}  A: {a}" for i, (q, a) in enumerate(state.history)
+        output_format = (
+            "OUTPUT FORMAT:\n"
+            "  - Respond with a SINGLE question ending with '?'.\n"
+            "  - No explanations, no numbering, no additional text.\n"
         )
-
-    remaining = state.max_questions - state.num_questions_asked
+        request = "Now produce your next yes/no question following the rules above."
 
     system = (
         "You are Player 2 in a Twenty Questions game.\n"
@@ -225,48 +312,22 @@ def llm_generate_question(llm: LLMClient, state: GameState) -> str:
         "  - Do NOT include parentheses with examples.\n"
         "  - The question MUST be answerable with YES or NO.\n"
         "\n"
-        "OUTPUT FORMAT:\n"
-        "  - Respond with a SINGLE question ending with '?'.\n"
-        "  - No explanations, no numbering, no additional text.\n"
+        + output_format
     )
     user = (
         f"Game history so far:\n{history_str}\n\n"
         f"Questions remaining before you are forced to guess: {remaining}\n\n"
-        "Now produce your next yes/no question following the rules above."
+        + request
     )
 
-    # Try a few times to get a clean, non-guessy question
-    for _ in range(3):
-        text = llm.ask(
-            [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
-        )
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
 
-        q = _sanitize_question_text(text)
 
-        if not _question_has_bad_hints(q):
-            return q
-
-    # If we still get sneaky guesses stuff, fall back to a very generic question
-    return "Is it something you can hold in your hand?"
-
-
-def llm_generate_final_guess(llm: LLMClient, state: GameState) -> str:
-    """
-    Generate the FINAL guess when there are no questions left.
-    This is called by the orchestrator when remaining == 1.
-
-    The model is forced to output a single GUESS: line.
-    """
-    if not state.history:
-        history_str = "No questions have been asked yet."
-    else:
-        history_str = "\n".join(
-            f"{i+1}. Q: {q}  A: {a}" for i, (q, a) in enumerate(state.history)
-        )
+def _final_guess_messages(state: GameState) -> list[dict]:
+    history_str = _history_str(state)
 
     system = (
         "You are Player 2 in a Twenty Questions game.\n"
@@ -289,11 +350,73 @@ def llm_generate_final_guess(llm: LLMClient, state: GameState) -> str:
         "Based on this history, make your single best guess of the secret object now."
     )
 
-    text = llm.ask(
-        [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-        max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
-    )
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+
+def llm_generate_question(llm: LLMClient, state: GameState) -> str:
+    """
+    Generate the NEXT yes/no question while there is more than one question remaining.
+    This function is never used for the final forced guess.
+
+    We keep full history to give the model maximum context, but keep the
+    instructions strict to avoid weird emergent behaviour.
+    """
+    messages = _question_messages(state)
+
+    # Try a few times to get a clean, non-guessy question
+    for attempt in range(3):
+        text = llm.ask(
+            messages,
+            max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+            call_site="question",
+            escalation=attempt,
+            validate=_is_clean_question,
+        )
+
+        q = _sanitize_question_text(text)
+
+        ok = not _question_has_bad_hints(q)
+        report_format(llm, "question", attempt, ok)
+        if ok:
+            return q
+        metrics.increment("format_retries_total", call_site="question")
+
+    # If we still get sneaky guesses stuff, fall back to a very generic question
+    return FALLBACK_QUESTION
+
+
+def llm_generate_final_guess(
+    llm: LLMClient, state: GameState, stream: bool = False, escalation: int = 0
+) -> str:
+    """
+    Generate the FINAL guess when there are no questions left.
+    This is called by the orchestrator when remaining == 1.
+
+    The model is forced to output a single GUESS: line. With stream=True
+    the stream is closed once that line is complete. escalation is the
+    engine's retry number, so an unparseable guess is retried on a
+    stronger tier of a routed client.
+    """
+    if stream:
+        result = llm.ask_stream(
+            _final_guess_messages(state),
+            max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+            call_site="final_guess",
+            escalation=escalation,
+            early_exit=early_guess_line,
+            validate=_is_guess_line,
+        )
+        text = result.value or result.text
+    else:
+        text = llm.ask(
+            _final_guess_messages(state),
+            max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+            call_site="final_guess",
+            escalation=escalation,
+            validate=_is_guess_line,
+        )
+    report_format(llm, "final_guess", escalation, _is_guess_line(text))
     return text.strip()
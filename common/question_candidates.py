@@ -0,0 +1,155 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Sequence
+
+from . import metrics
+from .game_models import GameState
+from .llm_client import DEFAULT_MAX_OUTPUT_TOKENS, LLMClient
+from .model_router import report_format
+from .players import (
+    FALLBACK_QUESTION,
+    _direct_guess_target,
+    _question_has_bad_hints,
+    _question_messages,
+    _sanitize_question_text,
+)
+from .question_index import question_signature
+
+DEFAULT_CANDIDATES = 5
+# Attempts the sequential chain in llm_generate_question makes per turn
+SEQUENTIAL_ATTEMPTS = 3
+# Direct guesses ("Is it a cat?") only rule out one object; they rank low
+# until this few questions are left
+DIRECT_GUESS_TURNS = 3
+
+_LIST_MARKER_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def parse_candidates(text: str) -> List[str]:
+    """
+    One sanitised question per non-empty line, list markers removed.
+    """
+    questions = []
+    for line in text.splitlines():
+        line = _LIST_MARKER_RE.sub("", line).strip()
+        if line:
+            questions.append(_sanitize_question_text(line))
+    return questions
+
+
+def _overlap(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def score_candidate(question: str, asked: Sequence[FrozenSet[str]], remaining: int) -> float:
+    """
+    Local estimate of how useful a question is, higher is better:
+    novelty (1 - the largest content-word overlap with an asked question)
+    plus expected split (low for direct guesses while many questions
+    remain, and for "A or B" questions that have no clean yes/no).
+    """
+    tokens = frozenset(question_signature(question)[0])
+    novelty = 1.0 - max((_overlap(tokens, prev) for prev in asked), default=0.0)
+    split = 1.0
+    if _direct_guess_target(question) and remaining > DIRECT_GUESS_TURNS:
+        split = 0.2
+    elif " or " in question.lower():
+        split = 0.5
+    return novelty + split
+
+
+@dataclass
+class CandidateStats:
+    turns: int = 0
+    candidates: int = 0  # questions the model proposed
+    rejected: int = 0  # hint-laden, empty or repeated within the reply
+    fallbacks: int = 0  # turns where no candidate survived
+    # Extra calls the sequential chain would have made: the first candidate
+    # stands in for its single-question reply, each bad one for a retry
+    retries_avoided: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.turns if self.turns else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"candidates: {self.turns} turns, {self.retries_avoided} retries avoided, "
+            f"{self.fallbacks} fallbacks, {self.avg_seconds * 1000:.0f} ms/turn"
+        )
+
+
+class CandidateQuestioner:
+    """
+    Question generator (same signature as llm_generate_question) that asks
+    for k candidate questions in one call instead of retrying one at a time.
+
+    Candidates are cleaned with the player's sanitiser, dropped if they
+    carry example hints, and ranked with score_candidate, so questions
+    already asked come last; the model's own order breaks ties. If none survives
+    the turn falls back to FALLBACK_QUESTION without another call, so every
+    turn costs exactly one request.
+    """
+
+    def __init__(self, k: int = DEFAULT_CANDIDATES):
+        if k < 2:
+            raise ValueError("k must be at least 2; use llm_generate_question for one.")
+        self.k = k
+        self.stats = CandidateStats()
+        self._lock = threading.Lock()
+
+    def __call__(self, llm: LLMClient, state: GameState) -> str:
+        start = time.perf_counter()
+        text = llm.ask(
+            _question_messages(state, candidates=self.k),
+            max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+            call_site="question_candidates",
+            validate=lambda t: self.choose(parse_candidates(t), state)[0] is not None,
+        )
+        question, proposed, rejected, leading_bad = self.choose(parse_candidates(text), state)
+        report_format(llm, "question_candidates", 0, question is not None)
+        avoided = min(leading_bad, SEQUENTIAL_ATTEMPTS - 1)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats.turns += 1
+            self.stats.candidates += proposed
+            self.stats.rejected += rejected
+            self.stats.retries_avoided += avoided
+            self.stats.total_seconds += elapsed
+            if question is None:
+                self.stats.fallbacks += 1
+        metrics.observe("question_turn_seconds", elapsed, mode="candidates")
+        if avoided:
+            metrics.increment("format_retries_avoided_total", avoided, call_site="question")
+        return question or FALLBACK_QUESTION
+
+    def choose(self, candidates: List[str], state: GameState):
+        """
+        (best question or None, proposed, rejected, leading bad candidates).
+        """
+        asked = [frozenset(question_signature(q)[0]) for q, _ in state.history]
+        remaining = state.max_questions - state.num_questions_asked
+        best: Optional[str] = None
+        best_score = float("-inf")
+        seen = set()
+        rejected = 0
+        leading_bad = 0
+        for i, q in enumerate(candidates[: self.k]):
+            signature = question_signature(q)
+            bad = _question_has_bad_hints(q) or len(q) <= 1
+            if bad and i == leading_bad:
+                leading_bad += 1
+            if bad or signature in seen:
+                rejected += 1
+                continue
+            seen.add(signature)
+            # A small bonus for the model's own ranking breaks ties
+            score = score_candidate(q, asked, remaining) + 0.01 * (self.k - i)
+            if score > best_score:
+                best, best_score = q, score
+        return best, len(candidates[: self.k]), rejected, leading_bad
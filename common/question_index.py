@@ -0,0 +1,227 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from . import metrics
+from .game_engine import Answerer
+from .players import _normalize_object, llm_answer_question
+
+# Minimum character-trigram Jaccard similarity for a fuzzy match
+DEFAULT_THRESHOLD = 0.9
+
+# Words that carry no meaning in a yes/no question about "it"
+_STOPWORDS = frozenset(
+    "a an the its s is are was were be being does do did can could would will "
+    "has have had should might may object thing things something kind type sort "
+    "this that considered generally usually typically normally".split()
+)
+_NEGATIONS = frozenset({"not", "no", "never", "isn", "doesn", "cannot", "don", "t"})
+# Tokens that give a question its direction: who does what to whom, where,
+# and which way a comparison goes. They are kept in order in the signature
+# and must match exactly, so "Is it bigger than a cat?" never answers
+# "Is a cat bigger than it?" and "live in water" never answers "live on water".
+_ROLES = frozenset({"it", "you", "your"})
+_STRUCTURE = _ROLES | frozenset(
+    "in on at by with without for to of from into onto inside outside under "
+    "over above below near than more less fewer bigger smaller heavier lighter "
+    "taller shorter longer faster slower older younger".split()
+)
+# "the object" / "this thing" is just another way of saying "it"
+_SUBJECT_RE = re.compile(r"\b(?:the|this|that) (?:object|thing|item)\b")
+# Paraphrases that should land on the same token. Only same-direction
+# rewordings: folding "eaten"/"edible" onto "eat" would make
+# "Is it eaten by people?" answer "Does it eat people?"
+_SYNONYMS = {
+    "living": "alive",
+    "manmade": "man made",
+    "artificial": "man made",
+    "human made": "man made",
+    "larger": "bigger",
+    "large": "big",
+    "little": "small",
+}
+_SYNONYM_RE = re.compile(r"\b(" + "|".join(sorted(map(re.escape, _SYNONYMS), key=len, reverse=True)) + r")\b")
+_SLOT = "_"
+
+
+def _stem(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def question_signature(question: str) -> Tuple[Tuple[str, ...], bool]:
+    """
+    (tokens, negated) for a question: normalized, synonyms folded,
+    stopwords dropped and plurals stemmed. Word order is kept, so the
+    roles of "it" and the other nouns survive.
+    """
+    text = _SUBJECT_RE.sub("it", _normalize_object(question))
+    text = _SYNONYM_RE.sub(lambda m: _SYNONYMS[m.group(1)], text)
+    tokens = text.split()
+    negated = any(t in _NEGATIONS for t in tokens)
+    content = tuple(
+        t if t in _STRUCTURE else _stem(t)
+        for t in tokens
+        if t not in _STOPWORDS and t not in _NEGATIONS
+    )
+    return content, negated
+
+
+def _skeleton(tokens: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    The structural tokens of a signature with every content word replaced
+    by a slot: fuzzy matches may only differ inside the slots.
+    """
+    return tuple(t if t in _STRUCTURE else _SLOT for t in tokens)
+
+
+def _trigrams(tokens: Tuple[str, ...]) -> Set[str]:
+    grams: Set[str] = set()
+    for token in tokens:
+        if token in _STRUCTURE:
+            continue
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class _Entry:
+    tokens: Tuple[str, ...]
+    skeleton: Tuple[str, ...]
+    negated: bool
+    grams: Set[str]
+    answer: str
+
+
+class _SecretIndex:
+    """
+    Answered questions for one secret: an exact map on signatures plus an
+    inverted trigram index to find fuzzy candidates.
+    """
+
+    def __init__(self):
+        self.exact: Dict[Tuple[Tuple[str, ...], bool], _Entry] = {}
+        self.by_gram: Dict[str, List[_Entry]] = {}
+
+    def find(
+        self, tokens: Tuple[str, ...], negated: bool, threshold: float
+    ) -> Tuple[Optional[_Entry], bool]:
+        """
+        (entry, exact) for the best match, or (None, False).
+        """
+        entry = self.exact.get((tokens, negated))
+        if entry is not None:
+            return entry, True
+        skeleton = _skeleton(tokens)
+        grams = _trigrams(tokens)
+        best, best_score = None, threshold
+        seen = set()
+        for gram in grams:
+            for cand in self.by_gram.get(gram, ()):
+                if id(cand) in seen or cand.negated != negated or cand.skeleton != skeleton:
+                    continue
+                seen.add(id(cand))
+                score = _jaccard(grams, cand.grams)
+                if score >= best_score:
+                    best, best_score = cand, score
+        return best, False
+
+    def add(self, tokens: Tuple[str, ...], negated: bool, answer: str) -> _Entry:
+        entry = _Entry(tokens, _skeleton(tokens), negated, _trigrams(tokens), answer)
+        self.exact[(tokens, negated)] = entry
+        for gram in entry.grams:
+            self.by_gram.setdefault(gram, []).append(entry)
+        return entry
+
+
+@dataclass
+class DedupStats:
+    lookups: int = 0
+    exact_hits: int = 0
+    fuzzy_hits: int = 0
+    conflicts: int = 0  # concurrent duplicates the model answered differently
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.fuzzy_hits
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def calls_avoided(self) -> int:
+        return self.hits
+
+
+class DedupAnswerer:
+    """
+    Answerer (same signature as llm_answer_question) that remembers every
+    answer per secret and serves paraphrases of an answered question
+    ("Is it alive?" / "Is it a living thing?") without another call.
+
+    Questions match when their signatures (see question_signature) are
+    equal, or when they share the same structure ("it", prepositions and
+    comparisons in the same order) and their content words' character
+    trigrams reach `threshold` Jaccard similarity; a negated question
+    never matches a plain one. The index outlives single games, so repeated secrets across
+    a tournament also hit, and a repeated question always gets the same
+    answer.
+    """
+
+    def __init__(self, answerer: Answerer = llm_answer_question, threshold: float = DEFAULT_THRESHOLD):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1].")
+        self.answerer = answerer
+        self.threshold = threshold
+        self.stats = DedupStats()
+        self._indexes: Dict[str, _SecretIndex] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, llm, secret: Optional[str], question: str) -> str:
+        tokens, negated = question_signature(question)
+        key = _normalize_object(secret or "")
+        with self._lock:
+            self.stats.lookups += 1
+            index = self._indexes.setdefault(key, _SecretIndex())
+            entry, exact = index.find(tokens, negated, self.threshold) if tokens else (None, False)
+            if entry is not None:
+                if exact:
+                    self.stats.exact_hits += 1
+                else:
+                    self.stats.fuzzy_hits += 1
+        if entry is not None:
+            metrics.increment("question_dedup_hits_total", exact=exact)
+            return entry.answer
+
+        answer = self.answerer(llm, secret, question)
+        if not tokens:
+            return answer
+        with self._lock:
+            # Another game may have answered a duplicate in the meantime;
+            # keep the first answer so both games see the same one
+            entry, _ = index.find(tokens, negated, self.threshold)
+            if entry is None:
+                index.add(tokens, negated, answer)
+            elif entry.answer != answer:
+                self.stats.conflicts += 1
+                answer = entry.answer
+        return answer
+
+    def clear(self, secret: Optional[str] = None) -> None:
+        with self._lock:
+            if secret is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(_normalize_object(secret), None)
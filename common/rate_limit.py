@@ -0,0 +1,289 @@
+"""
+Client-side request pacing shared by every LLMClient.
+
+- LocalTokenBucket: token bucket for the threads of one process.
+- FileTokenBucket: the same bucket kept in a small file under an exclusive
+  flock, so every process on the host that opens the same path draws from
+  one budget (tournament workers, several CLI runs at once).
+- ConcurrencyController: AIMD limit on requests in flight. The limit grows
+  by one per window of healthy calls and is cut multiplicatively on
+  429/5xx, connection errors or latency well above the observed baseline,
+  so concurrency settles near what the endpoint sustains.
+
+Setting LLM_RATE_LIMIT (requests/second, optionally LLM_RATE_BURST and
+LLM_RATE_LIMIT_FILE) makes every LLMClient on the host share one
+FileTokenBucket without any code changes.
+"""
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+DEFAULT_BURST = 10
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 64
+# Multiplicative decrease factor on overload
+DEFAULT_BACKOFF_FACTOR = 0.5
+# Latency above this multiple of the baseline counts as overload
+DEFAULT_LATENCY_TOLERANCE = 2.0
+# Smoothing for the recent and the baseline latency moving averages
+RECENT_ALPHA = 0.2
+BASELINE_ALPHA = 0.02
+# Healthy calls needed before latency can signal overload
+MIN_LATENCY_SAMPLES = 20
+
+# tokens (float), last refill (wall-clock seconds)
+_BUCKET_STATE = struct.Struct("<dd")
+
+_shared_bucket: Optional["FileTokenBucket"] = None
+_shared_bucket_lock = threading.Lock()
+
+
+class LocalTokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second on average, with
+    bursts of up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: int = DEFAULT_BURST):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """
+        Take a token if one is available; otherwise the seconds to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def acquire(self, deadline_at: Optional[float] = None) -> float:
+        """
+        Block until a request may go out; returns the seconds waited.
+        deadline_at is a time.monotonic() value; RuntimeError if the wait
+        would pass it.
+        """
+        waited = 0.0
+        while True:
+            wait_for = self._take()
+            if wait_for <= 0.0:
+                return waited
+            if deadline_at is not None and time.monotonic() + wait_for >= deadline_at:
+                raise RuntimeError("LLM call deadline exceeded waiting for the rate limiter.")
+            time.sleep(wait_for)
+            waited += wait_for
+
+
+class FileTokenBucket(LocalTokenBucket):
+    """
+    Token bucket whose state lives in `path`, shared by every process (and
+    thread) that uses the same file. Needs fcntl, i.e. a POSIX system.
+    """
+
+    def __init__(self, path: str, rate: float, burst: int = DEFAULT_BURST):
+        super().__init__(rate, burst)
+        try:
+            import fcntl
+        except ImportError as exc:
+            raise RuntimeError("FileTokenBucket needs fcntl (POSIX only).") from exc
+        self._fcntl = fcntl
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _take(self) -> float:
+        fcntl = self._fcntl
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                raw = os.pread(self._fd, _BUCKET_STATE.size, 0)
+                if len(raw) == _BUCKET_STATE.size:
+                    tokens, updated = _BUCKET_STATE.unpack(raw)
+                else:
+                    tokens, updated = float(self.burst), now
+                # max(0, ...) guards against the wall clock stepping back
+                tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+                wait_for = 0.0
+                if tokens >= 1.0:
+                    tokens -= 1.0
+                else:
+                    wait_for = (1.0 - tokens) / self.rate
+                os.pwrite(self._fd, _BUCKET_STATE.pack(tokens, now), 0)
+                return wait_for
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+@dataclass
+class ConcurrencyStats:
+    calls: int = 0
+    increases: int = 0
+    decreases: int = 0
+    overloads: int = 0  # calls that signalled overload
+    waits: int = 0  # acquisitions that had to queue for a slot
+    peak_limit: int = 0
+
+
+class ConcurrencyController:
+    """
+    AIMD limit on requests in flight.
+
+    Each completed call reports its latency and whether it succeeded. After
+    `limit` healthy calls, if the limit was fully used meanwhile, it grows
+    by one (additive increase). A failed call (429/5xx, connection error), or recent
+    latency above latency_tolerance x the slow-moving baseline, multiplies
+    the limit by backoff_factor. Calls that were already in
+    flight at a cut cannot cut again, so one burst of failures is a
+    single decrease.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = DEFAULT_MIN_CONCURRENCY,
+        max_limit: int = DEFAULT_MAX_CONCURRENCY,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+    ):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Need 1 <= min_limit <= initial <= max_limit.")
+        if not 0.0 < backoff_factor < 1.0:
+            raise ValueError("backoff_factor must be in (0, 1).")
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.stats = ConcurrencyStats(peak_limit=initial)
+        self._in_flight = 0
+        self._healthy = 0
+        self._limit_reached = False
+        self._since_cut = 0  # calls completed since the last decrease
+        # Calls sent before a cut may still fail; they don't cut again
+        self._cut_window = 0
+        self._recent: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._samples = 0
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, deadline_at: Optional[float] = None) -> None:
+        with self._cond:
+            if self._in_flight >= self.limit:
+                self.stats.waits += 1
+            while self._in_flight >= self.limit:
+                timeout = None if deadline_at is None else deadline_at - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    raise RuntimeError("LLM call deadline exceeded waiting for a request slot.")
+                self._cond.wait(timeout)
+            self._in_flight += 1
+            if self._in_flight >= self.limit:
+                self._limit_reached = True
+
+    def release(self, latency: float, ok: bool) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self.stats.calls += 1
+            self._since_cut += 1
+            if ok:
+                ok = self._latency_ok(latency)
+            if ok:
+                self._healthy += 1
+                # No credit for headroom that was never used
+                grow = self._healthy >= self.limit and self._limit_reached
+                if grow and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._healthy = 0
+                    self._limit_reached = False
+                    self.stats.increases += 1
+                    self.stats.peak_limit = max(self.stats.peak_limit, self.limit)
+            else:
+                self.stats.overloads += 1
+                self._healthy = 0
+                if self._since_cut > self._cut_window:
+                    self._cut_window = self.limit
+                    self.limit = max(self.min_limit, int(self.limit * self.backoff_factor))
+                    self._since_cut = 0
+                    self.stats.decreases += 1
+                    # Judge the new level on its own latencies
+                    self._recent = self._baseline
+            self._cond.notify_all()
+
+    def _latency_ok(self, latency: float) -> bool:
+        # Caller holds self._cond
+        self._samples += 1
+        if self._recent is None:
+            self._recent = self._baseline = latency
+            return True
+        self._recent += RECENT_ALPHA * (latency - self._recent)
+        self._baseline += BASELINE_ALPHA * (latency - self._baseline)
+        if self._samples < MIN_LATENCY_SAMPLES:
+            return True
+        return self._recent <= self._baseline * self.latency_tolerance
+
+    @contextmanager
+    def slot(self, deadline_at: Optional[float] = None) -> Iterator["_SlotOutcome"]:
+        """
+        Hold one in-flight slot; set outcome.ok = False for an overload.
+        Exceptions count as failures.
+        """
+        self.acquire(deadline_at)
+        outcome = _SlotOutcome()
+        start = time.monotonic()
+        try:
+            yield outcome
+        except BaseException:
+            outcome.ok = False
+            raise
+        finally:
+            self.release(time.monotonic() - start, outcome.ok)
+
+
+class _SlotOutcome:
+    __slots__ = ("ok",)
+
+    def __init__(self):
+        self.ok = True
+
+
+def shared_rate_limiter() -> Optional[FileTokenBucket]:
+    """
+    The host-wide bucket configured through LLM_RATE_LIMIT, or None when
+    the variable is unset. Created once per process.
+    """
+    global _shared_bucket
+    rate = os.getenv("LLM_RATE_LIMIT")
+    if not rate:
+        return None
+    with _shared_bucket_lock:
+        if _shared_bucket is None:
+            try:
+                rate_value = float(rate)
+                burst = int(os.getenv("LLM_RATE_BURST") or DEFAULT_BURST)
+            except ValueError as exc:
+                raise ValueError("LLM_RATE_LIMIT / LLM_RATE_BURST must be numbers.") from exc
+            path = os.getenv("LLM_RATE_LIMIT_FILE") or os.path.join(
+                tempfile.gettempdir(), "llm_rate_limit.bucket"
+            )
+            _shared_bucket = FileTokenBucket(path, rate_value, burst)
+        return _shared_bucket
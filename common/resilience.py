@@ -0,0 +1,303 @@
+import contextvars
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Callable, Deque, List, Optional
+
+import requests
+
+from . import metrics
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP date).
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class BackoffPolicy:
+    """
+    Jittered exponential backoff for 429/5xx responses and connection
+    errors. A Retry-After header overrides the computed delay (capped at
+    max_delay). max_attempts counts the first request.
+    """
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        hinted = parse_retry_after(retry_after)
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        # "Full jitter": uniform in [0, base * 2^attempt]
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    fired: int = 0
+    hedge_wins: int = 0
+    # Per hedged call: (latency we saw, latency the primary would have had)
+    outcomes: List[tuple] = field(default_factory=list)
+
+    def p99_saved(self) -> float:
+        """
+        Estimated p99 reduction on hedged calls (seconds).
+        """
+        if not self.outcomes:
+            return 0.0
+        seen = sorted(o[0] for o in self.outcomes)
+        without = sorted(o[1] for o in self.outcomes)
+        idx = max(0, math.ceil(0.99 * len(seen)) - 1)
+        return without[idx] - seen[idx]
+
+
+class HedgePolicy:
+    """
+    Fires a duplicate request when the first one has not answered within
+    the running `quantile` (p95 by default) of recent latencies. The first
+    successful response wins; the loser is left to finish in the background
+    and its latency is only used for the saved-time estimate.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+    ):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.stats = HedgeStats()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """
+        Current hedge delay, or None while there is too little data.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        idx = min(len(ordered) - 1, math.ceil(self.quantile * len(ordered)) - 1)
+        return max(self.min_delay, ordered[idx])
+
+    def _count(self, **changes) -> None:
+        with self._lock:
+            for name, amount in changes.items():
+                setattr(self.stats, name, getattr(self.stats, name) + amount)
+
+
+def _close_response(fut: Future) -> None:
+    # The losing request cannot be aborted mid-flight; release its connection
+    if not fut.cancelled() and fut.exception() is None:
+        fut.result().close()
+
+
+def _hedged_post(
+    post: Callable[[float], requests.Response],
+    timeout: float,
+    hedge: HedgePolicy,
+    executor: Executor,
+    call_site: Optional[str],
+) -> requests.Response:
+    hedge._count(calls=1)
+    delay = hedge.delay()
+    if delay is None or delay >= timeout:
+        return post(timeout)
+
+    start = time.monotonic()
+    # Each attempt runs in the caller's context (e.g. its cassette game scope)
+    primary = executor.submit(contextvars.copy_context().run, post, timeout)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    hedge._count(fired=1)
+    metrics.increment("llm_hedges_fired_total", call_site=call_site)
+    backup = executor.submit(contextvars.copy_context().run, post, max(0.001, timeout - delay))
+    pending = {primary, backup}
+    winner: Optional[Future] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is None and fut.result().status_code == 200:
+                winner = fut
+                break
+        if winner is not None:
+            break
+    if winner is None:
+        # Both failed: surface the primary's outcome
+        return primary.result()
+
+    loser = backup if winner is primary else primary
+    loser.add_done_callback(_close_response)
+
+    seen = time.monotonic() - start
+    if winner is backup:
+        hedge._count(hedge_wins=1)
+        metrics.increment("llm_hedge_wins_total", call_site=call_site)
+
+        def _record(fut: Future) -> None:
+            primary_latency = time.monotonic() - start
+            with hedge._lock:
+                hedge.stats.outcomes.append((seen, primary_latency))
+
+        primary.add_done_callback(_record)
+    else:
+        with hedge._lock:
+            hedge.stats.outcomes.append((seen, seen))
+    return winner.result()
+
+
+def _release_on_close(resp: requests.Response, release: Callable[[], None]) -> None:
+    # Runs release once, on the first close() (callers close streams in a finally)
+    close = resp.close
+    once = threading.Lock()
+
+    def close_and_release() -> None:
+        try:
+            close()
+        finally:
+            if once.acquire(blocking=False):
+                release()
+
+    resp.close = close_and_release
+
+
+def _post_streamed(
+    send: Callable[[float], requests.Response],
+    timeout: float,
+    deadline_at: float,
+    concurrency,
+) -> requests.Response:
+    """
+    send() under a concurrency slot that outlives the headers: a streamed
+    200 is still in flight until its body is read, so the slot (and the
+    latency AIMD sees) runs until the response is closed. Other statuses
+    have nothing left to stream and release at once.
+    """
+    concurrency.acquire(deadline_at)
+    start = time.monotonic()
+    try:
+        resp = send(max(0.001, min(timeout, deadline_at - time.monotonic())))
+    except BaseException:
+        concurrency.release(time.monotonic() - start, False)
+        raise
+    ok = resp.status_code not in RETRYABLE_STATUSES
+
+    def release() -> None:
+        concurrency.release(time.monotonic() - start, ok)
+
+    if resp.status_code == 200:
+        _release_on_close(resp, release)
+    else:
+        release()
+    return resp
+
+
+def post_with_policies(
+    session: requests.Session,
+    url: str,
+    payload: dict,
+    headers: dict,
+    deadline_at: float,
+    backoff: Optional[BackoffPolicy],
+    hedge: Optional[HedgePolicy] = None,
+    executor: Optional[Executor] = None,
+    call_site: Optional[str] = None,
+    stream: bool = False,
+    rate_limiter=None,
+    concurrency=None,
+) -> requests.Response:
+    """
+    POST with a per-call deadline (time.monotonic() based), backoff on
+    retryable statuses / connection errors, and optional hedging.
+    With stream=True the body is left unread for the caller to iterate.
+    Every attempt (hedges included) first takes a rate_limiter token and,
+    with a ConcurrencyController, holds one of its slots while in flight;
+    a streamed 200 keeps its slot until the caller closes the response.
+
+    Returns the final response (which may still be a non-200 once retries
+    or time run out). Raises RuntimeError if no response arrived in time.
+    """
+    attempts = backoff.max_attempts if backoff else 1
+    extra = {"stream": True} if stream else {}
+
+    def send(timeout: float) -> requests.Response:
+        started = time.monotonic()
+        resp = session.post(url, json=payload, headers=headers, timeout=timeout, **extra)
+        if hedge is not None and resp.status_code == 200:
+            hedge.record_latency(time.monotonic() - started)
+        return resp
+
+    def post(timeout: float) -> requests.Response:
+        if rate_limiter is not None:
+            waited = rate_limiter.acquire(deadline_at)
+            if waited:
+                metrics.observe("llm_rate_limit_wait_seconds", waited, call_site=call_site)
+        if concurrency is None:
+            return send(max(0.001, min(timeout, deadline_at - time.monotonic())))
+        if stream:
+            return _post_streamed(send, timeout, deadline_at, concurrency)
+        with concurrency.slot(deadline_at) as outcome:
+            resp = send(max(0.001, min(timeout, deadline_at - time.monotonic())))
+            outcome.ok = resp.status_code not in RETRYABLE_STATUSES
+            return resp
+
+    last_resp: Optional[requests.Response] = None
+    for attempt in range(attempts):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise RuntimeError("LLM call deadline exceeded.")
+        try:
+            if hedge is not None and executor is not None:
+                resp = _hedged_post(post, remaining, hedge, executor, call_site)
+            else:
+                resp = post(remaining)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            if attempt == attempts - 1:
+                raise RuntimeError(f"LLM request failed: {exc}") from exc
+            retry_after = None
+        else:
+            if resp.status_code not in RETRYABLE_STATUSES or attempt == attempts - 1:
+                return resp
+            last_resp = resp
+            retry_after = resp.headers.get("Retry-After")
+
+        wait_for = backoff.delay(attempt, retry_after)
+        if time.monotonic() + wait_for >= deadline_at:
+            if last_resp is not None:
+                return last_resp
+            raise RuntimeError("LLM call deadline exceeded while backing off.")
+        metrics.increment("llm_backoff_retries_total", call_site=call_site)
+        time.sleep(wait_for)
+
+    raise RuntimeError("LLM request failed after retries.")
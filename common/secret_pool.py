@@ -0,0 +1,159 @@
+import json
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional
+
+from .llm_client import LLMClient
+from .players import _llm_propose_object_list, _normalize_object, llm_choose_secret_object
+
+# llm -> secret object; llm_choose_secret_object or a SecretPool
+SecretChooser = Callable[[LLMClient], str]
+
+DEFAULT_BATCH_SIZE = 10
+# Start a background refill when fewer candidates than this are left
+DEFAULT_LOW_WATER = 5
+# Secrets served recently are not handed out again within this many games
+DEFAULT_RECENT_WINDOW = 20
+# Blocking refills to try before falling back to a single-object prompt
+MAX_SYNC_REFILLS = 3
+
+
+@dataclass
+class PoolStats:
+    served: int = 0
+    waits: int = 0  # takes that found the pool empty and waited for a refill
+    refills: int = 0
+    repeats_dropped: int = 0  # proposals already pooled or recently used
+    fallbacks: int = 0
+
+
+class SecretPool:
+    """
+    Pool of deduplicated secret-object candidates, drop-in for
+    llm_choose_secret_object (call it with the LLM client).
+
+    Each object-list call fills the pool with up to batch_size candidates
+    instead of using one and discarding the rest. When fewer than low_water
+    remain, a refill runs in a background thread, so games normally start
+    without waiting on the LLM. Objects served in the last recent_window
+    games are excluded from refills. With a path, the pool and the recent
+    list are kept in a JSON file between runs.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        low_water: int = DEFAULT_LOW_WATER,
+        recent_window: int = DEFAULT_RECENT_WINDOW,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.stats = PoolStats()
+        self._pool: List[str] = []
+        self._recent: Deque[str] = deque(maxlen=recent_window)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="secret-pool")
+        self._refill: Optional[Future] = None
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pool)
+
+    def _start_refill(self, llm: LLMClient, escalation: int = 0) -> Future:
+        # Caller holds self._lock; at most one refill is in flight
+        if self._refill is None or self._refill.done():
+            self._refill = self._executor.submit(self._fill, llm, escalation)
+        return self._refill
+
+    def _fill(self, llm: LLMClient, escalation: int = 0) -> int:
+        with self._lock:
+            exclude = list(self._pool) + list(self._recent)
+        names = _llm_propose_object_list(
+            llm, n=self.batch_size, exclude=exclude, escalation=escalation
+        )
+        added = 0
+        with self._lock:
+            known = {_normalize_object(name) for name in self._pool} | set(self._recent)
+            for name in names:
+                norm = _normalize_object(name)
+                if norm in known:
+                    self.stats.repeats_dropped += 1
+                    continue
+                known.add(norm)
+                self._pool.append(name.strip())
+                added += 1
+            self.stats.refills += 1
+        self._autosave()
+        return added
+
+    def prefill(self, llm: LLMClient) -> Future:
+        """
+        Start filling the pool in the background (e.g. before a tournament).
+        """
+        with self._lock:
+            return self._start_refill(llm)
+
+    def take(self, llm: LLMClient) -> str:
+        """
+        Hand out one secret object, refilling the pool as needed.
+        """
+        # Each synchronous refill after an empty one goes up a model tier
+        for attempt in range(MAX_SYNC_REFILLS):
+            with self._lock:
+                if self._pool:
+                    name = self._pool.pop(random.randrange(len(self._pool)))
+                    self._recent.append(_normalize_object(name))
+                    self.stats.served += 1
+                    if len(self._pool) < self.low_water:
+                        self._start_refill(llm)
+                    break
+                self.stats.waits += 1
+                refill = self._start_refill(llm, escalation=attempt)
+            refill.result()  # LLM failures surface as RuntimeError
+        else:
+            # The model keeps proposing objects we just used
+            with self._lock:
+                self.stats.fallbacks += 1
+            return llm_choose_secret_object(llm)
+        self._autosave()
+        return name
+
+    __call__ = take
+
+    def _autosave(self) -> None:
+        if self.path:
+            self.save()
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the secret pool.")
+        with self._lock:
+            data = {"pool": list(self._pool), "recent": list(self._recent)}
+        with self._save_lock:
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp, path)
+
+    def load(self, path: str) -> None:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        with self._lock:
+            self._pool = list(data.get("pool", []))
+            self._recent.extend(data.get("recent", []))
+
+    def close(self) -> None:
+        """
+        Stop background refills (one already running is left to finish).
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,118 @@
+import contextvars
+import dataclasses
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from .llm_client import LLMClient, estimate_tokens
+from .game_models import GameState
+from .players import _question_messages, llm_generate_question
+
+# (llm, state) -> next question
+QuestionGenerator = Callable[[LLMClient, GameState], str]
+
+
+@dataclass
+class SpeculationStats:
+    prefetched: int = 0
+    used: int = 0
+    discarded: int = 0
+    discarded_prompt_tokens: int = 0  # estimated cost of wasted generations
+
+    def summary(self) -> str:
+        return (
+            f"speculation: {self.used} used, {self.discarded} discarded "
+            f"(~{self.discarded_prompt_tokens} prompt tokens wasted)"
+        )
+
+
+class SpeculativeQuestioner:
+    """
+    Generates the next question for both possible answers while the
+    current answer is still pending.
+
+    Call prefetch(state, question) right after asking `question`, then
+    next_question(state) once the answer is in the history. The branch
+    matching the real answer is used; the other one is cancelled if it has
+    not started yet, and discarded otherwise.
+    """
+
+    def __init__(self, llm: LLMClient, generate: QuestionGenerator = llm_generate_question):
+        self.llm = llm
+        self.generate = generate
+        self.stats = SpeculationStats()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculate")
+        self._lock = threading.Lock()
+        self._question: Optional[str] = None
+        self._branches: Dict[str, Future] = {}
+        self._branch_states: Dict[str, GameState] = {}
+
+    def prefetch(self, state: GameState, question: str) -> None:
+        """
+        Start generating follow-ups for `question` answered yes and no.
+        Skipped when the next move will be the forced final guess.
+        """
+        self._discard_all()
+        if state.max_questions - (state.num_questions_asked + 1) <= 1:
+            return
+
+        self._question = question
+        for answer in ("yes", "no"):
+            branch = dataclasses.replace(
+                state,
+                history=state.history + [(question, answer)],
+                num_questions_asked=state.num_questions_asked + 1,
+                context=state.context.copy() if state.context else None,
+            )
+            self._branch_states[answer] = branch
+            self._branches[answer] = self._executor.submit(
+                contextvars.copy_context().run, self.generate, self.llm, branch
+            )
+        with self._lock:
+            self.stats.prefetched += 2
+
+    def next_question(self, state: GameState) -> str:
+        """
+        Return the next question, from a prefetched branch when one matches.
+        """
+        if self._branches and state.history:
+            last_q, last_a = state.history[-1]
+            future = self._branches.pop(last_a, None)
+            if (
+                future is not None
+                and last_q == self._question
+                and state.num_questions_asked
+                == self._branch_states[last_a].num_questions_asked
+            ):
+                self._discard_all()
+                question = future.result()
+                # Only a prefetch that produced a question counts as used
+                with self._lock:
+                    self.stats.used += 1
+                return question
+            if future is not None:
+                self._discard(last_a, future)
+        self._discard_all()
+        return self.generate(self.llm, state)
+
+    def _discard(self, answer: str, future: Future) -> None:
+        cancelled = future.cancel()
+        branch = self._branch_states.pop(answer, None)
+        with self._lock:
+            self.stats.discarded += 1
+            if branch is not None and not cancelled:
+                self.stats.discarded_prompt_tokens += estimate_tokens(
+                    _question_messages(branch)
+                )
+
+    def _discard_all(self) -> None:
+        for answer, future in list(self._branches.items()):
+            self._discard(answer, future)
+        self._branches.clear()
+        self._branch_states.clear()
+        self._question = None
+
+    def close(self) -> None:
+        self._discard_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,119 @@
+import json
+import math
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Optional
+
+# Samples kept per call site; old behaviour ages out as prompts change
+DEFAULT_WINDOW = 200
+# Need this many observations before trusting the learned budget
+MIN_SAMPLES = 10
+DEFAULT_QUANTILE = 0.95
+DEFAULT_HEADROOM = 1.25
+BUDGET_STEP = 64
+MIN_BUDGET = 128
+
+
+@dataclass
+class SiteStats:
+    calls: int = 0
+    truncation_retries: int = 0
+    # Calls whose usage exceeded the caller's default budget: each of these
+    # would have cost at least one extra round trip without learning
+    retries_avoided: int = 0
+
+
+class TokenBudgeter:
+    """
+    Learns a starting max_output_tokens per call site ("answer",
+    "question", ...) from observed output token usage.
+
+    The starting budget is a high quantile of recent usage plus headroom,
+    rounded up to BUDGET_STEP, so truncation retries become rare without
+    asking for far more tokens than a call needs. Samples and counters can
+    be saved to / loaded from a JSON file between runs.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        window: int = DEFAULT_WINDOW,
+        quantile: float = DEFAULT_QUANTILE,
+        headroom: float = DEFAULT_HEADROOM,
+    ):
+        self.path = path
+        self.window = window
+        self.quantile = quantile
+        self.headroom = headroom
+        self.samples: Dict[str, Deque[int]] = {}
+        self.stats: Dict[str, SiteStats] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def _site(self, call_site: str) -> Deque[int]:
+        if call_site not in self.samples:
+            self.samples[call_site] = deque(maxlen=self.window)
+            self.stats.setdefault(call_site, SiteStats())
+        return self.samples[call_site]
+
+    def initial_budget(self, call_site: str, default: int, hard_limit: int) -> int:
+        """
+        Starting budget for the next call at this site (default until
+        enough samples have been seen).
+        """
+        with self._lock:
+            samples = sorted(self._site(call_site))
+        if len(samples) < MIN_SAMPLES:
+            return default
+        idx = min(len(samples) - 1, math.ceil(self.quantile * len(samples)) - 1)
+        budget = samples[idx] * self.headroom
+        budget = math.ceil(budget / BUDGET_STEP) * BUDGET_STEP
+        return max(MIN_BUDGET, min(budget, hard_limit))
+
+    def record(
+        self,
+        call_site: str,
+        used_tokens: int,
+        truncations: int,
+        default: int,
+        start_budget: int,
+    ) -> None:
+        """
+        Record one call: tokens the reply actually used (from the usage
+        block) and how many truncation retries it took. A call cut off on
+        every attempt is recorded with its last budget, which it needed at
+        least. Only a call that finished first time over the default
+        budget counts as a retry avoided.
+        """
+        with self._lock:
+            self._site(call_site).append(used_tokens)
+            stats = self.stats[call_site]
+            stats.calls += 1
+            stats.truncation_retries += truncations
+            if not truncations and used_tokens > default and start_budget > default:
+                stats.retries_avoided += 1
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving token budgets.")
+        with self._lock:
+            data = {
+                site: {"samples": list(samples), "stats": asdict(self.stats[site])}
+                for site, samples in self.samples.items()
+            }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> None:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        with self._lock:
+            for site, entry in data.items():
+                self.samples[site] = deque(entry.get("samples", []), maxlen=self.window)
+                self.stats[site] = SiteStats(**entry.get("stats", {}))
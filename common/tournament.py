@@ -0,0 +1,182 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from .llm_client import LLMClient, DEFAULT_MODEL
+from .game_engine import Answerer, FinalGuesser, GameResult, play_llm_vs_llm_game
+from .players import (
+    llm_answer_question,
+    llm_choose_secret_object,
+    llm_generate_final_guess,
+    llm_generate_question,
+)
+from .early_guess import EarlyGuessPolicy
+from .cassette import game_scope
+from .game_log import GameLogWriter
+from .secret_pool import SecretChooser
+from .speculation import QuestionGenerator
+from .token_budget import TokenBudgeter
+
+DEFAULT_WORKERS = 4
+
+
+@dataclass
+class TournamentReport:
+    """
+    Per-game results plus aggregate throughput for one tournament run.
+    """
+    results: List[GameResult] = field(default_factory=list)
+    wall_time: float = 0.0
+    workers: int = DEFAULT_WORKERS
+
+    @property
+    def num_games(self) -> int:
+        return len(self.results)
+
+    @property
+    def games_per_minute(self) -> float:
+        if self.wall_time <= 0:
+            return 0.0
+        return self.num_games * 60.0 / self.wall_time
+
+    @property
+    def questioner_win_rate(self) -> float:
+        if not self.results:
+            return 0.0
+        wins = sum(1 for r in self.results if r.winner == "player2")
+        return wins / len(self.results)
+
+    @property
+    def avg_turns(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(r.num_turns for r in self.results) / len(self.results)
+
+    @property
+    def speculation_wasted_tokens(self) -> int:
+        return sum(
+            r.speculation.discarded_prompt_tokens for r in self.results if r.speculation
+        )
+
+    @property
+    def prompt_tokens_saved(self) -> int:
+        return sum(r.context.tokens_saved for r in self.results if r.context)
+
+    @property
+    def early_guess_rate(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(1 for r in self.results if r.early_guess_turn is not None) / len(self.results)
+
+    @property
+    def avg_calls_saved(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(r.calls_saved for r in self.results) / len(self.results)
+
+    @property
+    def wrong_early_guesses(self) -> int:
+        return sum(
+            r.wrong_early_guesses + (r.early_guess_turn is not None and r.winner != "player2")
+            for r in self.results
+        )
+
+    @property
+    def num_errors(self) -> int:
+        return sum(1 for r in self.results if r.error)
+
+    def summary(self) -> str:
+        return (
+            f"{self.num_games} games in {self.wall_time:.1f}s "
+            f"with {self.workers} workers "
+            f"({self.games_per_minute:.1f} games/min), "
+            f"questioner win rate {self.questioner_win_rate:.0%}, "
+            f"avg turns {self.avg_turns:.1f}, errors {self.num_errors}"
+        )
+
+
+def run_tournament(
+    num_games: int,
+    workers: int = DEFAULT_WORKERS,
+    model: str = DEFAULT_MODEL,
+    secrets: Optional[Sequence[str]] = None,
+    llm: Optional[LLMClient] = None,
+    max_questions: int = 20,
+    answerer: Answerer = llm_answer_question,
+    speculative: bool = False,
+    compact_history: bool = False,
+    stream: bool = False,
+    questioner: QuestionGenerator = llm_generate_question,
+    guesser: FinalGuesser = llm_generate_final_guess,
+    early_guess: Optional[EarlyGuessPolicy] = None,
+    choose_secret: SecretChooser = llm_choose_secret_object,
+    game_log: Optional[GameLogWriter] = None,
+    token_budgets: Optional[str] = None,
+) -> TournamentReport:
+    """
+    Play num_games headless LLM-vs-LLM games on a thread pool.
+
+    Games are I/O bound, so threads sharing LLMClient's pooled session are
+    enough to keep `workers` requests in flight. All games share one client
+    (pass llm to override it; model is ignored then). If secrets is given,
+    game i uses secrets[i % len(secrets)]; otherwise choose_secret picks
+    each secret (pass a SecretPool to avoid an object-list call per game).
+    With game_log, every finished game is also appended to a binary log.
+    Each game runs in its own cassette game_scope, so a recorded tournament
+    replays game by game whatever the worker count. With token_budgets,
+    a TokenBudgeter loaded from that JSON file picks each call site's
+    starting output budget (unless llm already has one) and is saved back
+    when the tournament ends. Results are returned in game order.
+    """
+    if num_games < 0:
+        raise ValueError("num_games must be non-negative.")
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+
+    budgeter = TokenBudgeter(token_budgets) if token_budgets else None
+    owns_llm = llm is None
+    if owns_llm:
+        # A private pool sized to the worker count, so no worker waits on a connection
+        llm = LLMClient(model=model, pool_size=workers, share_pool=False, budgeter=budgeter)
+    elif budgeter is not None:
+        if llm.budgeter is None:
+            llm.budgeter = budgeter
+        else:
+            budgeter = None  # the caller's budgeter is theirs to save
+
+    def play(i: int) -> GameResult:
+        secret = secrets[i % len(secrets)] if secrets else None
+        with game_scope(i):
+            result = play_llm_vs_llm_game(
+                llm,
+                secret=secret,
+                max_questions=max_questions,
+                answerer=answerer,
+                speculative=speculative,
+                compact_history=compact_history,
+                stream=stream,
+                questioner=questioner,
+                guesser=guesser,
+                early_guess=early_guess,
+                choose_secret=choose_secret,
+            )
+        if game_log is not None:
+            game_log.append_result(result)
+        return result
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(play, range(num_games)))
+    finally:
+        if owns_llm:
+            llm.close()
+        if budgeter is not None:
+            budgeter.save()
+
+    return TournamentReport(
+        results=results,
+        wall_time=time.perf_counter() - start,
+        workers=workers,
+    )
@@ -0,0 +1,333 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .cassette import game_scope
+from .game_engine import GameResult, play_llm_vs_llm_game
+from .game_log import GameLogWriter
+from .game_models import GameState, state_from_dict, state_to_dict
+from .llm_client import LLMClient
+
+# A worker that has not checkpointed or heartbeat for this long is presumed
+# dead and its job goes back to the queue
+DEFAULT_LEASE_SECONDS = 300.0
+# Leases handed out per job before it is marked failed
+DEFAULT_MAX_ATTEMPTS = 3
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class LeaseLost(RuntimeError):
+    """
+    The job's lease expired and was taken over (or it was already acked).
+    """
+
+
+@dataclass
+class Lease:
+    job_id: int
+    model: str
+    secret: str
+    seed: int
+    token: str
+    attempt: int
+    # Last checkpoint of an interrupted game, if any
+    state: Optional[GameState] = None
+
+
+class WorkQueue:
+    """
+    Durable queue of (model, secret, seed) game jobs in one SQLite file.
+    seed numbers the repeated games of one (model, secret); run_worker
+    plays each job in its own cassette game_scope, so recorded replicates
+    replay separately whatever order they are leased in.
+
+    Workers lease a job, checkpoint the GameState after every turn and ack
+    the result. Every lease carries a fresh token and all writes are
+    fenced on it, so a worker whose lease expired can neither checkpoint
+    nor ack; the next worker resumes from the last checkpoint. Acked jobs
+    are never leased again.
+
+    The file uses SQLite's rollback journal (not WAL) so workers on several
+    machines can share it over a network filesystem with working locks.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " secret TEXT NOT NULL,"
+            " seed INTEGER NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " lease_owner TEXT,"
+            " lease_token TEXT,"
+            " lease_expires REAL,"
+            " checkpoint TEXT,"
+            " result TEXT,"
+            " error TEXT,"
+            " updated_at REAL,"
+            " UNIQUE (model, secret, seed))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    def _write(self, sql: str, params: tuple) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def enqueue(self, jobs: Iterable[Tuple[str, str, int]]) -> int:
+        """
+        Add (model, secret, seed) jobs; ones already queued are skipped, so
+        re-running the enqueue step is safe. Returns how many were added.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (model, secret, seed, updated_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    [(model, secret, seed, now) for model, secret, seed in jobs],
+                )
+                added = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def lease(self, owner: str) -> Optional[Lease]:
+        """
+        Take the oldest pending (or expired) job, or None if there is none.
+        """
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases that used up their attempts give up for good
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = 'lease expired', updated_at = ?"
+                    " WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (FAILED, now, LEASED, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, model, secret, seed, attempts, checkpoint FROM jobs"
+                    " WHERE status = ? OR (status = ? AND lease_expires < ?)"
+                    " ORDER BY id LIMIT 1",
+                    (PENDING, LEASED, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?,"
+                        " lease_token = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                        (LEASED, owner, token, now + self.lease_seconds, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job_id, model, secret, seed, attempts, checkpoint = row
+        state = state_from_dict(json.loads(checkpoint)) if checkpoint else None
+        return Lease(job_id, model, secret, seed, token, attempts + 1, state)
+
+    def heartbeat(self, lease: Lease) -> bool:
+        """
+        Extend the lease; False if it was lost.
+        """
+        return self._write(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ? AND lease_token = ?",
+            (time.time() + self.lease_seconds, lease.job_id, LEASED, lease.token),
+        ) == 1
+
+    def checkpoint(self, lease: Lease, state: GameState) -> None:
+        """
+        Save the game so far (and extend the lease). Raises LeaseLost.
+        """
+        now = time.time()
+        changed = self._write(
+            "UPDATE jobs SET checkpoint = ?, lease_expires = ?, updated_at = ?"
+            " WHERE id = ? AND status = ? AND lease_token = ?",
+            (
+                json.dumps(state_to_dict(state)),
+                now + self.lease_seconds,
+                now,
+                lease.job_id,
+                LEASED,
+                lease.token,
+            ),
+        )
+        if changed != 1:
+            raise LeaseLost(f"Lease on job {lease.job_id} was lost.")
+
+    def ack(self, lease: Lease, result: dict) -> bool:
+        """
+        Mark the job done with its result; False if the lease was lost
+        (another worker owns the job now, so the result must be dropped).
+        """
+        return self._write(
+            "UPDATE jobs SET status = ?, result = ?, lease_token = NULL, updated_at = ?"
+            " WHERE id = ? AND status = ? AND lease_token = ?",
+            (DONE, json.dumps(result), time.time(), lease.job_id, LEASED, lease.token),
+        ) == 1
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        """
+        Give the job back after an error; it is retried until max_attempts.
+        """
+        status = FAILED if lease.attempt >= self.max_attempts else PENDING
+        return self._write(
+            "UPDATE jobs SET status = ?, error = ?, lease_token = NULL, updated_at = ?"
+            " WHERE id = ? AND status = ? AND lease_token = ?",
+            (status, error, time.time(), lease.job_id, LEASED, lease.token),
+        ) == 1
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+            return dict(rows.fetchall())
+
+    def results(self) -> Iterable[Tuple[str, str, int, dict]]:
+        """
+        (model, secret, seed, result) for every finished job.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT model, secret, seed, result FROM jobs WHERE status = ? ORDER BY id",
+                (DONE,),
+            ).fetchall()
+        return [(model, secret, seed, json.loads(result)) for model, secret, seed, result in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def result_to_dict(result: GameResult) -> dict:
+    return {
+        "secret_object": result.secret_object,
+        "history": [list(turn) for turn in result.history],
+        "winner": result.winner,
+        "num_turns": result.num_turns,
+        "retries": result.retries,
+        "wall_time": result.wall_time,
+        "final_guess": result.final_guess,
+        "error": result.error,
+        "early_guess_turn": result.early_guess_turn,
+        "wrong_early_guesses": result.wrong_early_guesses,
+    }
+
+
+def result_from_dict(data: dict) -> GameResult:
+    return GameResult(
+        secret_object=data["secret_object"],
+        history=[tuple(turn) for turn in data["history"]],
+        winner=data["winner"],
+        num_turns=data["num_turns"],
+        retries=data["retries"],
+        wall_time=data["wall_time"],
+        final_guess=data["final_guess"],
+        error=data["error"],
+        early_guess_turn=data.get("early_guess_turn"),
+        wrong_early_guesses=data.get("wrong_early_guesses", 0),
+    )
+
+
+def export_results(queue: WorkQueue, game_log: GameLogWriter) -> int:
+    """
+    Append every finished job's game to game_log, one game per job, and
+    return how many were written. The queue is the record of finished
+    games; this rebuilds a log with none missing and none twice.
+    """
+    written = 0
+    for model, _secret, _seed, result in queue.results():
+        game_log.append_result(result_from_dict(result), model=model)
+        written += 1
+    game_log.flush()
+    return written
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def run_worker(
+    queue: WorkQueue,
+    llm_factory: Callable[[str], LLMClient] = lambda model: LLMClient(model=model),
+    owner: Optional[str] = None,
+    max_jobs: Optional[int] = None,
+    game_log: Optional[GameLogWriter] = None,
+    **game_kwargs,
+) -> int:
+    """
+    Lease and play jobs until the queue is drained (or max_jobs are done).
+    Returns the number of games this worker acked.
+
+    Interrupted games resume from their checkpoint. A finished game is
+    acked first, which stores its result in the queue, so it is never
+    played again; only then is it appended to game_log. A crash in between
+    leaves the game out of that log, never in it twice; export_results
+    rebuilds a complete log from the queue. game_kwargs are passed on to
+    play_llm_vs_llm_game.
+    """
+    owner = owner or default_owner()
+    clients: Dict[str, LLMClient] = {}
+    done = 0
+    try:
+        while max_jobs is None or done < max_jobs:
+            lease = queue.lease(owner)
+            if lease is None:
+                break
+            llm = clients.get(lease.model)
+            if llm is None:
+                llm = clients[lease.model] = llm_factory(lease.model)
+            try:
+                with game_scope(f"{lease.model}/{lease.secret}/{lease.seed}"):
+                    result = play_llm_vs_llm_game(
+                        llm,
+                        secret=lease.secret,
+                        resume=lease.state,
+                        checkpoint=lambda state, lease=lease: queue.checkpoint(lease, state),
+                        **game_kwargs,
+                    )
+            except LeaseLost:
+                continue
+            except Exception as exc:
+                queue.fail(lease, f"{type(exc).__name__}: {exc}")
+                continue
+            if result.error and result.winner is None:
+                queue.fail(lease, result.error)
+                continue
+            if not queue.ack(lease, result_to_dict(result)):
+                continue  # taken over; the new owner finishes and logs the game
+            done += 1
+            if game_log is not None:
+                game_log.append_result(result, model=lease.model)
+                game_log.flush()
+    finally:
+        for llm in clients.values():
+            llm.close()
+    return done
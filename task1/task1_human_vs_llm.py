@@ -1,4 +1,5 @@
 import re
+from typing import Optional
 
 from common.llm_client import LLMClient
 from common.game_models import GameState, parse_yes_no, parse_llm_guess
@@ -9,6 +10,8 @@ from common.players import (
     llm_generate_final_guess,
 )
 from common.players import _normalize_object  # reuse same normalization
+from common.early_guess import EarlyGuessPolicy, early_guess_question
+from common.speculation import SpeculativeQuestioner
 
 
 def _extract_direct_guess_from_question(question: str) -> str | None:
@@ -112,10 +115,16 @@ def human_as_questioner():
         print(f"LLM answers: {answer.upper()}\n")
 
 
-def human_as_answerer():
+def human_as_answerer(
+    speculative: bool = False, early_guess: Optional[EarlyGuessPolicy] = None
+):
     """
     Human is Player 1 (answerer), LLM is Player 2 (questioner).
     The orchestrator guarantees that the final move is always a GUESS, not a question.
+
+    With speculative=True the LLM drafts its next question for both a YES
+    and a NO answer while the human is still typing. With an early_guess
+    policy the LLM may guess before its last turn once it is confident.
     """
     print("\n=== Task 1 — Mode B: LLM asks questions, you think of the object ===\n")
 
@@ -128,78 +137,123 @@ def human_as_answerer():
         secret = None
 
     state = GameState(secret_object=secret)
+    speculator = SpeculativeQuestioner(llm) if speculative else None
     print("\nThe LLM will now try to guess your object by asking yes/no questions.")
     print("Please answer with 'yes' or 'no'.\n")
 
-    while not state.finished:
-        remaining = state.max_questions - state.num_questions_asked
+    try:
+        while not state.finished:
+            remaining = state.max_questions - state.num_questions_asked
 
-        if remaining <= 0:
-            print("\nThe LLM ran out of moves without guessing. You win!")
-            state.winner = "human"
-            state.finished = True
-            break
+            if remaining <= 0:
+                print("\nThe LLM ran out of moves without guessing. You win!")
+                state.winner = "human"
+                state.finished = True
+                break
 
-        # If this is the last allowed move, force a final guess
-        if remaining == 1:
-            print("\nThe LLM must now make a FINAL GUESS.")
-            for attempt in range(3):
-                try:
-                    llm_output = llm_generate_final_guess(llm, state)
-                except RuntimeError:
+            # If this is the last allowed move, force a final guess
+            if remaining == 1:
+                print("\nThe LLM must now make a FINAL GUESS.")
+                for attempt in range(3):
+                    try:
+                        llm_output = llm_generate_final_guess(llm, state)
+                    except RuntimeError:
+                        print(
+                            "The AI had trouble generating a final guess. Retrying..."
+                        )
+                        continue
+
+                    guess = parse_llm_guess(llm_output)
+                    if guess:
+                        print(f"\nThe LLM makes a final guess: '{guess}'")
+                        confirmation = input("Is this correct? (yes/no): ").strip()
+                        yn = parse_yes_no(confirmation)
+                        if yn == "yes":
+                            print("\nThe LLM guessed correctly. It wins!\n")
+                            state.winner = "llm"
+                        else:
+                            print("\nThe LLM guessed incorrectly. You win!\n")
+                            state.winner = "human"
+                        state.finished = True
+                        break
+
+                if not state.finished:
                     print(
-                        "The AI had trouble generating a final guess. Retrying..."
+                        "\nThe LLM failed to make a valid guess after several attempts. You win!"
                     )
-                    continue
+                    state.winner = "human"
+                    state.finished = True
+
+                break  # end game loop regardless
 
-                guess = parse_llm_guess(llm_output)
+            # Guess before the last turn if the LLM is already confident
+            if early_guess is not None:
+                guess = early_guess.decide(state)
                 if guess:
-                    print(f"\nThe LLM makes a final guess: '{guess}'")
+                    print(f"\nThe LLM is confident and guesses early: '{guess}'")
                     confirmation = input("Is this correct? (yes/no): ").strip()
-                    yn = parse_yes_no(confirmation)
-                    if yn == "yes":
+                    correct = parse_yes_no(confirmation) == "yes"
+                    early_guess.record(correct)
+                    if correct:
                         print("\nThe LLM guessed correctly. It wins!\n")
                         state.winner = "llm"
-                    else:
+                        state.finished = True
+                        break
+                    if early_guess.ends_on_wrong_guess:
                         print("\nThe LLM guessed incorrectly. You win!\n")
                         state.winner = "human"
-                    state.finished = True
-                    break
+                        state.finished = True
+                        break
+                    print(f"Wrong guess: the LLM forfeits {early_guess.penalty} questions.")
+                    state.history.append((early_guess_question(guess), "no"))
+                    state.num_questions_asked += 1 + early_guess.penalty
+                    continue
 
-            if not state.finished:
+            # Normal question phase (remaining > 1)
+            try:
+                if speculator is not None:
+                    llm_output = speculator.next_question(state)
+                else:
+                    llm_output = llm_generate_question(llm, state)
+            except RuntimeError:
                 print(
-                    "\nThe LLM failed to make a valid guess after several attempts. You win!"
+                    "\nThe AI had trouble generating a question. "
+                    "We'll try again.\n"
                 )
-                state.winner = "human"
-                state.finished = True
-
-            break  # end game loop regardless
-
-        # Normal question phase (remaining > 1)
-        try:
-            llm_output = llm_generate_question(llm, state)
-        except RuntimeError:
-            print(
-                "\nThe AI had trouble generating a question. "
-                "We'll try again.\n"
-            )
-            continue
-
-        print(f"\nLLM Question {state.num_questions_asked + 1}: {llm_output}")
-        while True:
-            human_answer = input("Your answer (yes/no): ").strip()
-            yn = parse_yes_no(human_answer)
-            if yn is None:
-                print("Please answer with 'yes' or 'no'.")
                 continue
-            break
 
-        state.history.append((llm_output, yn))
-        state.num_questions_asked += 1
+            print(f"\nLLM Question {state.num_questions_asked + 1}: {llm_output}")
+            if speculator is not None:
+                speculator.prefetch(state, llm_output)
+            while True:
+                human_answer = input("Your answer (yes/no): ").strip()
+                yn = parse_yes_no(human_answer)
+                if yn is None:
+                    print("Please answer with 'yes' or 'no'.")
+                    continue
+                break
 
+            state.history.append((llm_output, yn))
+            state.num_questions_asked += 1
+    finally:
+        # Also on Ctrl-C or an LLM error: stop the prefetch threads
+        if speculator is not None:
+            speculator.close()
+    if speculator is not None:
+        print(f"[{speculator.stats.summary()}]")
     print("Game over.\n")
 
 
+def prompt_speculative() -> bool:
+    """
+    Ask whether the LLM may draft its next question while the human answers.
+    """
+    reply = input(
+        "Let the LLM prepare its next question while you answer? (yes/no, default no): "
+    ).strip()
+    return parse_yes_no(reply) == "yes"
+
+
 def main():
     print("\n=== Task 1 — Human vs LLM ===\n")
     print("Choose your role:")
@@ -210,7 +264,7 @@ def main():
     if choice == "1":
         human_as_questioner()
     elif choice == "2":
-        human_as_answerer()
+        human_as_answerer(speculative=prompt_speculative())
     else:
         print("Invalid choice. Exiting.")
 
@@ -0,0 +1,25 @@
+"""
+Task 3 metrics for one or more binary game logs, one row per model.
+
+    python -m task3.task3_evaluate runs/*.tqlog --workers 4
+"""
+import argparse
+import os
+
+from common.evaluator import evaluate_logs, format_table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("logs", nargs="+", help="game logs written by run_tournament(game_log=...)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, default=None, help="shards per log (default: workers)")
+    args = parser.parse_args(argv)
+
+    aggregates = evaluate_logs(args.logs, workers=args.workers, shards_per_log=args.shards)
+    print(format_table(aggregates))
+    return aggregates
+
+
+if __name__ == "__main__":
+    main()
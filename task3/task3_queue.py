@@ -0,0 +1,91 @@
+"""
+Resumable large evaluation runs on a shared SQLite work queue.
+
+    python -m task3.task3_queue enqueue runs/queue.db --models gpt-5-mini-2025-08-07 --seeds 10
+    python -m task3.task3_queue work runs/queue.db --log runs/worker1.tqlog --threads 8
+    python -m task3.task3_queue status runs/queue.db
+    python -m task3.task3_queue export runs/queue.db runs/all.tqlog
+
+Start as many `work` processes as you like, on any machine that sees the
+queue file; each game is checkpointed every turn, so killed workers lose
+at most one turn. A finished game is acked (its result stored in the
+queue) before it is appended to the worker's log, so it is never played
+twice; a worker killed in between leaves that game out of its log. For
+evaluation, `export` writes every finished job's game exactly once to a
+fresh log, taken from the queue.
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from common.attribute_oracle import AttributeMatrix
+from common.game_log import GameLogWriter
+from common.work_queue import DEFAULT_LEASE_SECONDS, WorkQueue, export_results, run_worker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="add (model, secret, seed) jobs")
+    enqueue.add_argument("queue")
+    enqueue.add_argument("--models", nargs="+", required=True)
+    enqueue.add_argument("--secrets", nargs="+", help="default: every object in the attribute dataset")
+    enqueue.add_argument("--seeds", type=int, default=1, help="games per (model, secret)")
+
+    work = sub.add_parser("work", help="play jobs until the queue is drained")
+    work.add_argument("queue")
+    work.add_argument("--log", help="append finished games to this game log")
+    work.add_argument("--threads", type=int, default=1)
+    work.add_argument("--max-questions", type=int, default=20)
+    work.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS)
+
+    status = sub.add_parser("status", help="job counts by status")
+    status.add_argument("queue")
+
+    export = sub.add_parser("export", help="write every finished game once to a new log")
+    export.add_argument("queue")
+    export.add_argument("log", help="game log to (re)create")
+
+    args = parser.parse_args(argv)
+    if args.command == "enqueue":
+        queue = WorkQueue(args.queue)
+        secrets = args.secrets or AttributeMatrix.load().objects
+        added = queue.enqueue(itertools.product(args.models, secrets, range(args.seeds)))
+        print(f"Queued {added} new jobs.")
+    elif args.command == "work":
+        queue = WorkQueue(args.queue, lease_seconds=args.lease)
+        log = GameLogWriter(args.log) if args.log else None
+        try:
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                futures = [
+                    pool.submit(run_worker, queue, game_log=log, max_questions=args.max_questions)
+                    for _ in range(args.threads)
+                ]
+                played = sum(f.result() for f in futures)
+        finally:
+            if log is not None:
+                log.close()
+        print(f"Played {played} games.")
+    elif args.command == "export":
+        queue = WorkQueue(args.queue)
+        # Build next to the target and swap it in, so a failed export keeps the old log
+        tmp = f"{args.log}.tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        log = GameLogWriter(tmp)
+        try:
+            written = export_results(queue, log)
+        finally:
+            log.close()
+        os.replace(tmp, args.log)
+        print(f"Exported {written} games to {args.log}.")
+    else:
+        queue = WorkQueue(args.queue)
+    print(queue.counts())
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+from app.app_cli import main
+from common.game_log import GameLogReader
+from common.token_budget import TokenBudgeter
+
+
+def test_help_does_not_import_the_engine():
+    code = (
+        "import sys, app.app_cli as cli; cli.build_parser().format_help();"
+        "print(any(m in sys.modules for m in ('requests', 'dotenv', 'common.llm_client')))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_run_tournament_then_eval(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    path = str(tmp_path / "games.tqlog")
+    argv = ["run-tournament", "--games", "3", "--workers", "2", "--mock", "--max-questions", "4"]
+    assert main(argv + ["--model", "mock-model", "--out", path]) == 0
+    with GameLogReader(path) as reader:
+        assert reader.summarize().games == 3
+    assert main(["eval", "--log", path, "--workers", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "3 games" in out
+    assert "mock-model" in out
+
+
+def test_run_tournament_saves_learned_token_budgets(tmp_path, monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    path = str(tmp_path / "budgets.json")
+    argv = ["run-tournament", "--games", "2", "--workers", "1", "--mock", "--max-questions", "3"]
+    assert main(argv + ["--secrets", "cat", "--token-budgets", path]) == 0
+    reloaded = TokenBudgeter(path)
+    assert reloaded.stats["answer"].calls > 0
+    assert reloaded.stats["final_guess"].calls == 2
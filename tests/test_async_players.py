@@ -0,0 +1,77 @@
+import asyncio
+
+from common.async_llm_client import AsyncLLMClient
+from common.async_players import allm_answer_question, allm_generate_question
+from common.game_models import GameState
+from common.response_cache import ResponseCache
+from common.token_budget import TokenBudgeter
+
+
+class MockAsyncLLM:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    async def aask(self, *_args, **_kwargs):
+        return self.responses.pop(0)
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self):
+        self.tokens = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.tokens.append(json["max_output_tokens"])
+        if len(self.tokens) == 1:
+            return FakeResponse(
+                {"status": "incomplete", "incomplete_details": {"reason": "max_output_tokens"}}
+            )
+        return FakeResponse({"status": "completed", "output": [{"content": [{"text": "YES"}]}]})
+
+
+def test_aask_doubles_token_budget_on_truncation(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    session = FakeSession()
+    llm = AsyncLLMClient(session=session, max_concurrency=2)
+    text = asyncio.run(llm.aask([{"role": "user", "content": "hi"}], max_output_tokens=256))
+    llm.close()
+    assert text == "YES"
+    assert session.tokens == [256, 512]
+
+
+def test_allm_answer_question_retries_until_clean():
+    llm = MockAsyncLLM(["maybe", "YES"])
+    assert asyncio.run(allm_answer_question(llm, "cat", "Is it alive?")) == "yes"
+
+
+def test_allm_generate_question_skips_hinted_questions():
+    llm = MockAsyncLLM(["Is it red, like an apple?", "Is it alive?"])
+    assert asyncio.run(allm_generate_question(llm, GameState())) == "Is it alive?"
+
+
+def test_aask_shares_cache_and_budget_bookkeeping(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    session = FakeSession()
+    budgeter = TokenBudgeter()
+    cache = ResponseCache()
+    llm = AsyncLLMClient(session=session, budgeter=budgeter, cache=cache)
+    messages = [{"role": "user", "content": "hi"}]
+    for _ in range(2):
+        text = asyncio.run(llm.aask(messages, max_output_tokens=256, call_site="answer"))
+        assert text == "YES"
+    llm.close()
+    # Served from the cache the second time, like LLMClient.ask
+    assert session.tokens == [256, 512]
+    assert cache.stats.hits == 1
+    # The reply had no usage block, so there was nothing to learn from
+    assert not budgeter.samples["answer"]
+    assert budgeter.stats["answer"].calls == 0
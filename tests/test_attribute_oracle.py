@@ -0,0 +1,97 @@
+from common.attribute_oracle import AttributeMatrix, OracleAnswerer, score_answers
+
+
+class MockLLM:
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def ask(self, *_args, **_kwargs):
+        self.calls += 1
+        return self.response
+
+
+def _small_matrix():
+    return AttributeMatrix(
+        ["cat", "apple"],
+        {"alive": [r"alive", r"living thing"], "fruit": [r"fruits?"]},
+        {"cat": ["alive"], "apple": ["fruit"]},
+    )
+
+
+def test_matrix_maps_paraphrases_to_one_attribute():
+    matrix = _small_matrix()
+    assert matrix.lookup("cat", "Is it alive?") == "yes"
+    assert matrix.lookup("Cat", "Is it a living thing?") == "yes"
+    assert matrix.lookup("apple", "Is it alive?") == "no"
+    assert matrix.lookup("apple", "Is it a fruit?") == "yes"
+
+
+def test_matrix_leaves_negated_compound_and_unknown_questions_unmapped():
+    matrix = _small_matrix()
+    assert matrix.lookup("cat", "Is it not alive?") is None
+    assert matrix.lookup("cat", "Is it an alive fruit?") is None
+    assert matrix.lookup("cat", "Is it red?") is None
+    assert matrix.lookup("dog", "Is it alive?") is None
+
+
+def test_matrix_leaves_prefix_and_quantifier_negations_unmapped():
+    matrix = AttributeMatrix(
+        ["cat"],
+        {"alive": [r"alive", r"living thing"], "has_legs": [r"(have|has) legs?"]},
+        {"cat": ["alive", "has_legs"]},
+    )
+    assert matrix.lookup("cat", "Is it a non-living thing?") is None
+    assert matrix.lookup("cat", "Is it a nonliving thing?") is None
+    assert matrix.lookup("cat", "Does it have no legs?") is None
+    assert matrix.lookup("cat", "Is it without legs?") is None
+    assert matrix.lookup("cat", "Does it lack legs?") is None
+    assert matrix.lookup("cat", "Does it lacks legs?") is None
+    assert matrix.lookup("cat", "Is it a living thing?") == "yes"
+    assert matrix.lookup("cat", "Does it have legs?") == "yes"
+
+
+def test_oracle_only_calls_llm_for_unmapped_questions():
+    llm = MockLLM("YES")
+    oracle = OracleAnswerer(_small_matrix())
+    assert oracle(llm, "apple", "Is it alive?") == "no"
+    assert oracle(llm, "apple", "Is it red?") == "yes"
+    assert llm.calls == 1
+    assert oracle.stats.oracle_answers == 1
+    assert oracle.stats.llm_answers == 1
+
+
+def test_default_dataset_loads_and_scores_history():
+    matrix = AttributeMatrix.load()
+    history = [("Is it alive?", "yes"), ("Is it a mammal?", "no"), ("Is it red?", "no")]
+    assert score_answers(matrix, "cat", history) == (1, 2)
+
+
+def test_oracle_treats_category_questions_as_attributes():
+    matrix = AttributeMatrix(
+        ["cat", "apple"], {"animal": [r"animals?"]}, {"cat": ["animal"], "apple": []}
+    )
+    oracle = OracleAnswerer(matrix)
+    assert oracle(None, "cat", "Is it an animal?") == "yes"
+    assert oracle(None, "cat", "Is it a cat?") == "yes"
+
+
+def test_default_dataset_leaves_qualified_questions_to_the_llm():
+    matrix = AttributeMatrix.load()
+    qualified = [
+        ("cow", "Does it eat plants?"),
+        ("penguin", "Does it eat fish?"),
+        ("dog", "Can it swim?"),
+        ("eagle", "Does it have four legs?"),
+        ("dog", "Does it have more than two legs?"),
+        ("cow", "Does it eat other animals?"),
+        ("cat", "Is it commonly eaten by animals?"),
+        ("apple", "Does it grow on a plant?"),
+        ("chair", "Is it something you sit on indoors?"),
+    ]
+    for secret, question in qualified:
+        assert matrix.lookup(secret, question) is None, question
+    assert matrix.lookup("eagle", "Does it have legs?") == "yes"
+    assert matrix.lookup("cow", "Is the object usually an animal?") == "yes"
+    for attr, question in matrix.questions.items():
+        assert matrix.attributes[matrix.match_attribute(question)] == attr
@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from common.batch_answerer import BatchingAnswerer, parse_batch_answers
+
+
+class BatchLLM:
+    """
+    Answers a numbered batch with YES for odd items and NO for even ones,
+    but omits the row for item 2 to exercise the per-item fallback.
+    """
+
+    def __init__(self):
+        self.batch_calls = 0
+        self.single_calls = 0
+
+    def ask(self, messages, **_kwargs):
+        user = messages[1]["content"]
+        if "| Question:" in user:
+            self.batch_calls += 1
+            rows = user.splitlines()
+            return "\n".join(
+                f"{i + 1}. {'YES' if i % 2 == 0 else 'NO'}"
+                for i in range(len(rows))
+                if i != 1
+            )
+        self.single_calls += 1
+        return "YES"
+
+
+def test_parse_batch_answers_skips_malformed_rows():
+    text = "1. YES\n2) no\n3. maybe\n4: YES\n4: NO\nnoise"
+    assert parse_batch_answers(text, 4) == {0: "yes", 1: "no"}
+
+
+def test_batching_answerer_coalesces_concurrent_questions():
+    llm = BatchLLM()
+    answerer = BatchingAnswerer(llm, window=0.2, max_batch_size=4)
+    questions = [("cat", f"Question {i}?") for i in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        answers = list(pool.map(lambda sq: answerer(None, *sq), questions))
+    answerer.close()
+
+    assert llm.batch_calls == 1
+    assert llm.single_calls == 1
+    assert answers == ["yes", "yes", "yes", "no"]
+    assert answerer.stats.fallbacks == 1
+
+
+class BrokenBatchLLM(BatchLLM):
+    """
+    The batch request fails with a parse error; single questions work.
+    """
+
+    def ask(self, messages, **kwargs):
+        if "| Question:" in messages[1]["content"]:
+            raise ValueError("Expecting value: line 1 column 1 (char 0)")
+        return super().ask(messages, **kwargs)
+
+
+def test_batch_errors_fall_back_to_single_questions():
+    llm = BrokenBatchLLM()
+    answerer = BatchingAnswerer(llm, window=0.2, max_batch_size=3)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        answers = list(pool.map(lambda i: answerer(None, "cat", f"Question {i}?"), range(3)))
+    answerer.close()
+
+    assert answers == ["yes"] * 3
+    assert llm.single_calls == 3
+    assert answerer.stats.fallbacks == 3
+    assert answerer.stats.single_prompt_tokens == 0  # nothing answered in the batch
+
+
+def test_batching_reports_prompt_tokens_saved():
+    llm = BatchLLM()
+    answerer = BatchingAnswerer(llm, window=0.2, max_batch_size=4)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda i: answerer(None, "cat", f"Question {i}?"), range(4)))
+    answerer.close()
+    # Three rows answered by one request instead of three full answer prompts
+    assert answerer.stats.prompt_tokens_saved > 0
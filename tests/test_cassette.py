@@ -0,0 +1,100 @@
+import pytest
+
+from app.app_cli import main
+from common.cassette import RECORD, REPLAY, Cassette
+from common.game_models import early_yes_no
+from common.llm_client import LLMClient
+from common.mock_server import MockConfig, MockResponsesServer
+
+MESSAGES = [{"role": "user", "content": "Secret object: cat"}]
+
+
+def _record(path, answers, calls):
+    config = MockConfig(latency_median=0, answers=list(answers))
+    with MockResponsesServer(config) as server:
+        cassette = Cassette(path, RECORD)
+        llm = LLMClient(base_url=server.url, share_pool=False, cassette=cassette)
+        replies = [call(llm) for call in calls]
+        llm.close()
+        cassette.close()
+    return replies
+
+
+def test_replay_serves_recorded_responses_without_network(tmp_path, monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    path = str(tmp_path / "run.tqcas")
+    calls = [
+        lambda llm: llm.ask(MESSAGES),
+        lambda llm: llm.ask(MESSAGES),
+        lambda llm: llm.ask_stream(MESSAGES, early_exit=early_yes_no).text,
+    ]
+    recorded = _record(path, ["YES", "NO", "YES"], calls)
+    assert recorded == ["YES", "NO", "YES"]
+
+    monkeypatch.delenv("CANDIDATE_API_KEY")
+    cassette = Cassette(path, REPLAY)
+    assert len(cassette) == 3
+    llm = LLMClient(base_url="http://127.0.0.1:9/unreachable", cassette=cassette)
+    # Repeats of one request come back in recorded order, then cycle
+    assert [call(llm) for call in calls] == recorded
+    assert llm.ask(MESSAGES) == "YES"
+    assert cassette.stats.hits == 4
+    assert cassette.stats.repeats == 1
+
+    with pytest.raises(RuntimeError, match="no recorded response"):
+        llm.ask([{"role": "user", "content": "Secret object: dog"}])
+    assert cassette.stats.misses == 1
+    cassette.close()
+
+
+def test_replay_rejects_other_files(tmp_path):
+    path = tmp_path / "games.tqlog"
+    path.write_bytes(b"TQLOG1")
+    with pytest.raises(ValueError):
+        Cassette(str(path), REPLAY)
+
+
+def test_tournament_replays_from_cassette(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    path = str(tmp_path / "mini.tqcas")
+    argv = ["run-tournament", "--games", "2", "--workers", "1", "--max-questions", "3"]
+    argv += ["--secrets", "cat", "--model", "mock-model"]
+    assert main(argv + ["--mock", "--record", path]) == 0
+    recorded = capsys.readouterr().out
+
+    monkeypatch.delenv("CANDIDATE_API_KEY")
+    assert main(argv + ["--replay", path]) == 0
+    replayed = capsys.readouterr().out
+    assert "misses=0" in replayed
+    # Same games, only the speed differs
+    assert recorded.splitlines()[0].split(")")[1] == replayed.splitlines()[0].split(")")[1]
+
+
+def test_tournament_replays_default_secret_choice(tmp_path, capsys, monkeypatch):
+    # Secrets drawn at random from the proposed list while recording are
+    # stored in the cassette, and each game replays its own responses
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    path = str(tmp_path / "mini.tqcas")
+    argv = ["run-tournament", "--games", "6", "--workers", "3", "--max-questions", "4"]
+    argv += ["--model", "mock-model"]
+    assert main(argv + ["--mock", "--record", path]) == 0
+    recorded = capsys.readouterr().out
+    cassette = Cassette(path, REPLAY)
+    assert len(cassette.recorded_secrets()) == 6
+    cassette.close()
+
+    monkeypatch.delenv("CANDIDATE_API_KEY")
+    assert main(argv + ["--replay", path]) == 0
+    replayed = capsys.readouterr().out
+    assert "misses=0" in replayed
+    assert "errors 0" in replayed
+    assert recorded.splitlines()[0].split(")")[1] == replayed.splitlines()[0].split(")")[1]
+
+
+def test_replay_without_recorded_secrets_needs_secrets(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    path = str(tmp_path / "calls.tqcas")
+    _record(path, ["YES"], [lambda llm: llm.ask(MESSAGES)])
+    monkeypatch.delenv("CANDIDATE_API_KEY")
+    assert main(["run-tournament", "--games", "1", "--replay", path]) == 2
+    assert "--secrets" in capsys.readouterr().err
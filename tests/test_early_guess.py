@@ -0,0 +1,82 @@
+import pytest
+
+from common.attribute_oracle import AttributeMatrix, OracleAnswerer
+from common.early_guess import EarlyGuessPolicy, PosteriorConfidence
+from common.game_engine import play_llm_vs_llm_game
+from common.game_models import GameState
+from common.info_gain import InfoGainQuestioner
+
+
+class ScriptedLLM:
+    def ask(self, *_args, **_kwargs):
+        return "Is it alive?"
+
+
+def _matrix():
+    return AttributeMatrix(
+        ["cat", "dog", "apple", "chair"],
+        {"alive": [r"alive"], "animal": [r"animals?"], "barks": [r"barks?"]},
+        {"cat": ["alive", "animal"], "dog": ["alive", "animal", "barks"], "apple": ["alive"]},
+        {"alive": "Is it alive?", "animal": "Is the object an animal?", "barks": "Does it bark?"},
+    )
+
+
+def test_confirmed_direct_guess_is_certain_but_categories_are_not():
+    scorer = PosteriorConfidence(_matrix())
+    assert scorer(GameState(history=[("Is it a dog?", "yes")])) == (1.0, "dog")
+    confidence, _ = scorer(GameState(history=[("Is it an animal?", "yes")]))
+    assert confidence < 1.0
+
+
+def test_policy_waits_for_threshold_and_min_questions():
+    policy = EarlyGuessPolicy(PosteriorConfidence(_matrix()), threshold=0.9, min_questions=2)
+    one = GameState(history=[("Does it bark?", "yes")], num_questions_asked=1)
+    assert policy.decide(one) is None  # too early
+    two = GameState(
+        history=[("Does it bark?", "yes"), ("Is it alive?", "yes")], num_questions_asked=2
+    )
+    assert policy.decide(two) == "dog"
+    with pytest.raises(ValueError):
+        EarlyGuessPolicy(threshold=0)
+
+
+def _play(secret, answerer, policy):
+    matrix = _matrix()
+    questioner = InfoGainQuestioner(matrix)
+    return play_llm_vs_llm_game(
+        ScriptedLLM(),
+        secret=secret,
+        answerer=answerer,
+        questioner=questioner,
+        guesser=questioner.final_guess,
+        early_guess=policy,
+    )
+
+
+def test_engine_stops_once_confident():
+    policy = EarlyGuessPolicy(PosteriorConfidence(_matrix()), min_questions=0)
+    result = _play("dog", OracleAnswerer(_matrix()), policy)
+    assert result.winner == "player2"
+    assert result.early_guess_turn is not None and result.num_turns < 5
+    assert result.calls_saved == 2 * (20 - 1 - result.num_turns)
+    assert policy.stats.correct == 1
+
+
+def _liar(llm, secret, question):
+    # Answers as if the secret were the dog
+    return OracleAnswerer(_matrix())(llm, "dog", question)
+
+
+def test_wrong_early_guess_loses_by_default():
+    policy = EarlyGuessPolicy(PosteriorConfidence(_matrix()), min_questions=0)
+    result = _play("cat", _liar, policy)
+    assert result.winner == "player1"
+    assert result.final_guess == "dog"
+    assert policy.stats.wrong == 1
+
+
+def test_penalty_mode_keeps_playing_and_forfeits_questions():
+    policy = EarlyGuessPolicy(PosteriorConfidence(_matrix()), min_questions=0, penalty=3)
+    result = _play("cat", _liar, policy)
+    assert result.wrong_early_guesses >= 1
+    assert ("Is it a dog?", "no") in result.history
@@ -0,0 +1,106 @@
+from common.attribute_oracle import AttributeMatrix
+from common.evaluator import (
+    EvalAggregate,
+    evaluate_logs,
+    format_table,
+    is_valid_question,
+    score_game,
+)
+from common.game_engine import GameResult
+from common.game_log import FLAG_EARLY_GUESS, GameLogReader, GameLogWriter
+
+
+def _result(secret, winner, history, early_guess_turn=None, wrong_early_guesses=0):
+    return GameResult(
+        secret_object=secret,
+        history=history,
+        winner=winner,
+        num_turns=len(history),
+        final_guess=secret if winner == "player2" else "cat",
+        early_guess_turn=early_guess_turn,
+        wrong_early_guesses=wrong_early_guesses,
+    )
+
+
+def test_is_valid_question():
+    assert is_valid_question("Is it alive?")
+    assert not is_valid_question("Is it alive or dead?")
+    assert not is_valid_question("Tell me its colour.")
+    assert not is_valid_question("Does it have seeds (like an apple)?")
+
+
+def test_score_game_counts_contradictions_redundancy_and_accuracy():
+    matrix = AttributeMatrix.load()
+    agg = EvalAggregate()
+    history = [
+        ("Is it alive?", "yes"),
+        ("Is it living?", "no"),  # same attribute, flipped answer
+        ("What is it?", "no"),
+        ("Is it alive?", "yes"),
+    ]
+    score_game(matrix, agg, "dog", history, "player1", FLAG_EARLY_GUESS)
+    assert agg.questions == 4
+    assert agg.invalid_questions == 1
+    assert agg.redundant_questions == 2
+    assert agg.contradictions == 2
+    assert (agg.correct_answers, agg.checkable_answers) == (2, 3)
+    assert agg.premature_false_guesses == 1
+    assert agg.penalised_win_rate < 0
+
+
+def test_wrong_direct_guesses_before_the_last_move_are_premature():
+    matrix = AttributeMatrix.load()
+    history = [
+        ("Is it an animal?", "no"),  # category question, not a guess
+        ("Is it a cat?", "no"),
+        ("Is it alive?", "yes"),
+        ("Is it a toaster?", "no"),
+    ]
+    agg = EvalAggregate()
+    score_game(matrix, agg, "dog", history, "player2", 0, final_guess="dog")
+    assert agg.premature_false_guesses == 2
+    assert agg.penalised_win_rate < agg.win_rate
+
+    # Without a forced final guess the last question was the last move
+    agg = EvalAggregate()
+    score_game(matrix, agg, "dog", history, "player1", 0)
+    assert agg.premature_false_guesses == 1
+
+
+def test_penalty_mode_early_guesses_are_read_from_the_log(tmp_path):
+    path = str(tmp_path / "penalty.tqlog")
+    writer = GameLogWriter(path)
+    # The penalty-mode guess is also in the history; it counts once
+    history = [("Is it alive?", "yes"), ("Is it a cat?", "no"), ("Is it a mammal?", "yes")]
+    writer.append_result(_result("dog", "player2", history, wrong_early_guesses=1))
+    writer.append_result(_result("dog", "player2", history[:1], wrong_early_guesses=2))
+    writer.close()
+    with GameLogReader(path) as reader:
+        assert reader.summarize().wrong_early_guesses == 3
+    agg = evaluate_logs([path])["penalty"]
+    assert agg.premature_false_guesses == 3
+
+
+def test_evaluate_logs_merges_models_across_shards(tmp_path):
+    paths = []
+    for model, wins in (("model-a", 3), ("model-b", 1)):
+        path = str(tmp_path / f"{model}.tqlog")
+        writer = GameLogWriter(path, model=model)
+        for i in range(4):
+            winner = "player2" if i < wins else "player1"
+            history = [("Is it alive?", "yes"), ("Is the object an animal?", "yes")]
+            writer.append_result(_result("dog", winner, history))
+        writer.close()
+        paths.append(path)
+
+    inline = evaluate_logs(paths, workers=1, shards_per_log=3)
+    pooled = evaluate_logs(paths, workers=2)
+    for aggregates in (inline, pooled):
+        assert aggregates["model-a"].games == 4
+        assert aggregates["model-a"].wins == 3
+        assert aggregates["model-b"].wins == 1
+        assert aggregates["model-a"].answer_accuracy == 1.0
+        assert aggregates["model-a"].avg_entropy_reduction > 0
+    table = format_table(inline).splitlines()
+    assert table[1].startswith("model-a")
+    assert "early_redund" in table[0]
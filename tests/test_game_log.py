@@ -0,0 +1,118 @@
+import pytest
+
+from common.game_engine import GameResult
+from common.game_log import CompactGame, GameLogReader, GameLogWriter, StringTable
+
+
+def _result(secret, winner, answers, error=None):
+    history = [(f"Question {i}?", a) for i, a in enumerate(answers)]
+    return GameResult(
+        secret_object=secret,
+        history=history,
+        winner=winner,
+        num_turns=len(history),
+        final_guess=secret if winner == "player2" else "dog",
+        error=error,
+    )
+
+
+def test_compact_game_round_trips_history():
+    table = StringTable()
+    result = _result("cat", "player2", ["yes", "no", "no", "yes"])
+    game = CompactGame.from_result(result, table)
+    assert game.answers == 0b1001
+    assert game.history(table) == result.history
+    assert game.winner_name() == "player2"
+    assert table.lookup(game.secret_id) == "cat"
+    # Questions shared between games are stored once
+    CompactGame.from_result(_result("dog", "player1", ["no", "no"]), table)
+    assert len(table) == 6  # cat, 4 questions, dog (secret and guess)
+    assert table.strings.count("dog") == 1
+
+
+def test_log_summarises_and_reopens(tmp_path):
+    path = str(tmp_path / "games.tqlog")
+    writer = GameLogWriter(path)
+    writer.append_result(_result("cat", "player2", ["yes"] * 3))
+    writer.append_result(_result("dog", "player1", ["no"] * 19, error="boom"))
+    writer.close()
+
+    # Appending later keeps the existing string ids valid
+    writer = GameLogWriter(path)
+    writer.append_result(_result("cat", "player2", ["no", "yes"]))
+    writer.close()
+
+    with GameLogReader(path) as reader:
+        summary = reader.summarize()
+        games = list(reader.games())
+        table = StringTable(reader.strings())
+    assert summary.games == 3
+    assert summary.wins == {"player2": 2, "player1": 1}
+    assert summary.total_questions == 24
+    assert summary.errors == 1
+    assert table.lookup(games[2].secret_id) == "cat"
+    assert games[2].history(table) == [("Question 0?", "no"), ("Question 1?", "yes")]
+
+
+def test_untagged_reopen_resets_the_model(tmp_path):
+    path = str(tmp_path / "games.tqlog")
+    writer = GameLogWriter(path, model="a")
+    writer.append_result(_result("cat", "player2", ["yes"]))
+    writer.close()
+    writer = GameLogWriter(path)
+    writer.append_result(_result("dog", "player1", ["no"]))
+    writer.close()
+
+    with GameLogReader(path) as reader:
+        models = [model for model, _game in reader.iter_games()]
+    assert models == ["a", None]
+
+
+def test_torn_tail_is_ignored_and_truncated(tmp_path):
+    path = str(tmp_path / "games.tqlog")
+    writer = GameLogWriter(path)
+    writer.append_result(_result("cat", "player2", ["yes"]))
+    writer.close()
+    with open(path, "ab") as fh:
+        fh.write(b"\x02\xff\x00\x00\x00partial")
+
+    with GameLogReader(path) as reader:
+        assert reader.summarize().games == 1
+    writer = GameLogWriter(path)
+    writer.append_result(_result("dog", "player1", ["no"]))
+    writer.close()
+    with GameLogReader(path) as reader:
+        assert reader.summarize().games == 2
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_log"
+    path.write_bytes(b"hello")
+    with pytest.raises(ValueError):
+        GameLogReader(str(path))
+
+
+def test_byte_range_shards_cover_every_game_once(tmp_path):
+    path = str(tmp_path / "games.tqlog")
+    writer = GameLogWriter(path, model="a")
+    for i in range(30):
+        if i == 12:
+            writer.set_model("b")
+        writer.append_result(_result(f"object {i}", "player2", ["yes"] * (i % 5)))
+    writer.close()
+
+    def decoded(reader, games):
+        return [
+            (model, reader.string(game.secret_id), game.num_questions) for model, game in games
+        ]
+
+    with GameLogReader(path) as reader:
+        expected = decoded(reader, reader.iter_games())
+        for n in (1, 2, 3, 7, 100):
+            shards = reader.shards(n)
+            assert len(shards) <= n
+            assert all(a.end == b.start for a, b in zip(shards, shards[1:]))
+            seen = []
+            for shard in shards:
+                seen += decoded(reader, reader.iter_shard(shard))
+            assert seen == expected
@@ -1,4 +1,4 @@
-from common.game_models import parse_yes_no, parse_llm_guess
+from common.game_models import early_guess_line, early_yes_no, parse_yes_no, parse_llm_guess
 
 
 def test_parse_yes_no_basic():
@@ -11,3 +11,15 @@ def test_parse_llm_guess():
     assert parse_llm_guess("GUESS: cat") == "cat"
     assert parse_llm_guess("guess: apple") == "apple"
     assert parse_llm_guess("not a guess") is None
+
+
+def test_early_yes_no_waits_for_a_complete_word():
+    assert early_yes_no("NO") is None  # could still become "NOT"
+    assert early_yes_no("NOT really") is None
+    assert early_yes_no("No, it") == "no"
+    assert early_yes_no("**YES** because") == "yes"
+
+
+def test_early_guess_line_waits_for_the_newline():
+    assert early_guess_line("GUESS: red ap") is None
+    assert early_guess_line("GUESS: red apple\nIt is") == "GUESS: red apple"
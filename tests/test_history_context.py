@@ -0,0 +1,66 @@
+from common.game_models import GameState
+from common.history_context import HistoryContext, compact_question
+from common.players import _question_messages
+
+
+def test_compact_question_strips_lead_in():
+    assert compact_question("Is it a living thing?") == "living thing"
+    assert compact_question("Does it have wheels?") == "have wheels"
+    assert compact_question("Alive?") == "Alive"
+
+
+def test_context_folds_old_turns_into_facts():
+    ctx = HistoryContext(recent_turns=2)
+    history = [
+        ("Is it a living thing?", "yes"),
+        ("Is it a mammal?", "no"),
+        ("Is it bigger than a breadbox?", "yes"),
+        ("Is it found in the ocean?", "no"),
+        ("Can it fly?", "yes"),
+        ("Is it a bird?", "yes"),
+    ]
+    text = ctx.render(history)
+    assert "Facts from Q1-4:" in text
+    assert "YES: living thing" in text
+    assert "NO: mammal" in text
+    assert "5. Q: Can it fly?  A: yes" in text
+    assert "1. Q:" not in text
+    assert ctx.stats.tokens_saved > 0
+
+
+def test_context_rebuilds_for_diverging_history():
+    ctx = HistoryContext(recent_turns=1)
+    questions = [
+        "Is it a living thing?",
+        "Is it bigger than a breadbox?",
+        "Is it used in the kitchen?",
+        "Is it red?",
+    ]
+    ctx.render([(q, "yes") for q in questions])
+    text = ctx.render([(q, "no") for q in questions])
+    assert "NO: living thing; bigger than a breadbox; used in the kitchen" in text
+    assert "YES: -" in text
+
+
+def test_context_respects_token_ceiling():
+    ctx = HistoryContext(recent_turns=1, token_ceiling=30)
+    history = [(f"Is it thing number {i}?", "yes") for i in range(10)]
+    text = ctx.render(history)
+    assert "older facts omitted" in text
+
+
+def test_question_prompt_uses_context():
+    state = GameState(history=[("Is it alive?", "yes")] * 6, num_questions_asked=6)
+    state.context = HistoryContext(recent_turns=2)
+    user = _question_messages(state)[1]["content"]
+    assert "Facts from Q1-4:" in user
+
+
+def test_copies_keep_their_own_stats():
+    ctx = HistoryContext(recent_turns=2)
+    history = [(f"Is it thing number {i}?", "no") for i in range(6)]
+    ctx.render(history)
+    branch = ctx.copy()
+    branch.render(history + [("Is it alive?", "yes")])
+    assert ctx.stats.renders == 1
+    assert branch.stats.renders == 1
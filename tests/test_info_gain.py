@@ -0,0 +1,96 @@
+from common.attribute_oracle import AttributeMatrix, OracleAnswerer
+from common.game_engine import play_llm_vs_llm_game
+from common.game_models import GameState
+from common.info_gain import InfoGainQuestioner, compute_posterior, expected_gain
+from common.players import _direct_guess_target
+
+
+class ScriptedLLM:
+    def __init__(self, reply="Is it something you can hold in your hand?"):
+        self.reply = reply
+        self.calls = 0
+
+    def ask(self, *_args, **_kwargs):
+        self.calls += 1
+        return self.reply
+
+
+def _matrix(questions=None):
+    return AttributeMatrix(
+        ["cat", "dog", "apple", "chair"],
+        {"alive": [r"alive"], "animal": [r"animals?"], "barks": [r"barks?"]},
+        {"cat": ["alive", "animal"], "dog": ["alive", "animal", "barks"], "apple": ["alive"]},
+        questions if questions is not None else {
+            "alive": "Is it alive?", "animal": "Is the object an animal?", "barks": "Does it bark?"
+        },
+    )
+
+
+def test_posterior_follows_answers():
+    post = compute_posterior(_matrix(), [("Is it alive?", "yes"), ("Does it bark?", "no")])
+    best, p = post.top()
+    assert post.contradictions == [0, 1, 0, 1]
+    assert p < 0.5  # cat and apple are still tied
+    assert post.entropy < compute_posterior(_matrix(), []).entropy
+
+
+def test_most_informative_question_splits_the_mass():
+    q = InfoGainQuestioner(_matrix())
+    # Only "animal" splits the four candidates in half
+    assert q(ScriptedLLM(), GameState()) == "Is the object an animal?"
+    state = GameState(history=[("Is the object an animal?", "yes")])
+    assert q(ScriptedLLM(), state) == "Does it bark?"
+    assert expected_gain(0.5) > expected_gain(0.9)
+
+
+def test_matrix_games_need_no_llm_calls():
+    matrix = AttributeMatrix.load()
+    questioner = InfoGainQuestioner(matrix)
+    llm = ScriptedLLM()
+    for secret in ("cat", "guitar", "banana"):
+        result = play_llm_vs_llm_game(
+            llm,
+            secret=secret,
+            answerer=OracleAnswerer(matrix),
+            questioner=questioner,
+            guesser=questioner.final_guess,
+        )
+        assert result.winner == "player2"
+    assert llm.calls == 0
+    assert questioner.stats.matrix_guesses == 3
+
+
+def test_off_matrix_secret_falls_back_to_llm():
+    q = InfoGainQuestioner(_matrix())
+    # Every candidate now contradicts at least two answers
+    history = [
+        ("Is it alive?", "no"),
+        ("Is the object an animal?", "yes"),
+        ("Is it a cat?", "no"),
+        ("Is it a dog?", "no"),
+        ("Is it a chair?", "no"),
+    ]
+    llm = ScriptedLLM("GUESS: teapot")
+    assert q.final_guess(llm, GameState(history=history)) == "GUESS: teapot"
+    assert q.stats.llm_guesses == 1
+
+
+def test_attribute_without_wording_is_phrased_once_by_llm():
+    q = InfoGainQuestioner(_matrix(questions={}))
+    llm = ScriptedLLM("Is it an animal?")
+    # "Is it an animal?" would be answered as a direct guess, so it is
+    # reworded the way the dataset asks category questions
+    assert q(llm, GameState()) == "Is the object an animal?"
+    assert q(llm, GameState()) == "Is the object an animal?"
+    assert llm.calls == 1
+    assert q.stats.llm_phrased == 1
+
+
+def test_llm_wording_is_never_a_direct_guess():
+    q = InfoGainQuestioner(_matrix(questions={}))
+    assert q._wording("Is it an animal?", 1) == "Is the object an animal?"
+    # Qualified wordings no longer read back as the attribute
+    assert q._wording("Is it the kind of thing that barks?", 2) is None
+    assert q._wording("Is it a dog that barks?", 2) is None
+    assert not _direct_guess_target(q._wording("Does it bark?", 2))
+    assert q._wording("Is it alive?", 0) == "Is it alive?"
@@ -1,9 +1,144 @@
 import pytest
 import os
 from common.llm_client import LLMClient
+from common.players import llm_answer_question
+from common.response_cache import ResponseCache
+from common.token_budget import MIN_SAMPLES, TokenBudgeter
 
 
 def test_llm_client_requires_key(monkeypatch):
     monkeypatch.delenv("CANDIDATE_API_KEY", raising=False)
     with pytest.raises(ValueError):
         LLMClient()
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self._data = data
+        self.status_code = status_code
+        self.text = str(data)
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.calls.append(json)
+        return self.responses.pop(0)
+
+
+def _completed(text):
+    return {"status": "completed", "output": [{"content": [{"text": text}]}]}
+
+
+def test_llm_client_uses_given_session(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    session = FakeSession([FakeResponse(_completed("YES")), FakeResponse(_completed("NO"))])
+    llm = LLMClient(session=session)
+    assert llm.ask([{"role": "user", "content": "q1"}]) == "YES"
+    assert llm.ask([{"role": "user", "content": "q2"}]) == "NO"
+    assert len(session.calls) == 2
+
+
+def test_llm_client_shares_pool_between_instances(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    assert LLMClient().session is LLMClient().session
+    private = LLMClient(share_pool=False)
+    assert private.session is not LLMClient().session
+    private.close()
+
+
+def test_llm_client_serves_repeated_calls_from_cache(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    session = FakeSession([FakeResponse(_completed("YES"))])
+    cache = ResponseCache()
+    llm = LLMClient(session=session, cache=cache)
+    messages = [{"role": "user", "content": "Is it alive?"}]
+    assert llm.ask(messages) == "YES"
+    assert llm.ask(messages) == "YES"
+    assert len(session.calls) == 1
+    assert cache.stats.hits == 1
+
+
+def test_answer_retries_are_not_served_the_cached_bad_reply(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    replies = ["Maybe", "YES"]
+    session = FakeSession([FakeResponse(_completed(text)) for text in replies])
+    cache = ResponseCache()
+    llm = LLMClient(session=session, cache=cache)
+    assert llm_answer_question(llm, "cat", "Is it alive?") == "yes"
+    assert len(session.calls) == 2
+    # Only the reply that passed the format check was stored
+    assert llm_answer_question(llm, "cat", "Is it alive?") == "yes"
+    assert len(session.calls) == 2
+    assert cache.stats.stores == 1
+
+
+def test_object_list_calls_are_not_cached(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    session = FakeSession([FakeResponse(_completed("cat\ndog")) for _ in range(2)])
+    cache = ResponseCache()
+    llm = LLMClient(session=session, cache=cache)
+    messages = [{"role": "user", "content": "Propose 10 different secret objects."}]
+    llm.ask(messages, call_site="object_list")
+    llm.ask(messages, call_site="object_list")
+    assert len(session.calls) == 2
+    assert cache.stats.stores == 0
+
+
+def test_llm_client_starts_at_learned_budget(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    data = dict(_completed("YES"), usage={"output_tokens": 700})
+    session = FakeSession([FakeResponse(data) for _ in range(MIN_SAMPLES + 1)])
+    llm = LLMClient(session=session, budgeter=TokenBudgeter())
+    for _ in range(MIN_SAMPLES + 1):
+        llm.ask([{"role": "user", "content": "q"}], call_site="answer")
+    assert session.calls[0]["max_output_tokens"] == 512
+    assert session.calls[-1]["max_output_tokens"] == 896
+
+
+def _truncated():
+    return {"status": "incomplete", "incomplete_details": {"reason": "max_output_tokens"}}
+
+
+def test_low_learned_budget_still_escalates_to_default_ladder(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    budgeter = TokenBudgeter()
+    for _ in range(MIN_SAMPLES):
+        budgeter.record("answer", 40, truncations=0, default=512, start_budget=512)
+    session = FakeSession(
+        [FakeResponse(_truncated()), FakeResponse(_truncated()), FakeResponse(_completed("YES"))]
+    )
+    llm = LLMClient(session=session, budgeter=budgeter)
+    assert llm.ask([{"role": "user", "content": "q"}], call_site="answer") == "YES"
+    assert [c["max_output_tokens"] for c in session.calls] == [128, 1024, 2048]
+
+
+def test_calls_cut_off_on_every_attempt_are_recorded(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    budgeter = TokenBudgeter()
+    session = FakeSession([FakeResponse(_truncated()) for _ in range(3)])
+    llm = LLMClient(session=session, budgeter=budgeter)
+    with pytest.raises(RuntimeError):
+        llm.ask([{"role": "user", "content": "q"}], call_site="answer")
+    # Recorded with the last budget sent, which the reply needed at least
+    assert list(budgeter.samples["answer"]) == [2048]
+    assert budgeter.stats["answer"].truncation_retries == 3
+    assert budgeter.stats["answer"].retries_avoided == 0
+
+
+def test_replies_without_usage_are_not_recorded(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    budgeter = TokenBudgeter()
+    session = FakeSession([FakeResponse(_completed("YES")) for _ in range(MIN_SAMPLES * 3)])
+    llm = LLMClient(session=session, budgeter=budgeter)
+    for _ in range(MIN_SAMPLES * 3):
+        llm.ask([{"role": "user", "content": "q"}], call_site="answer")
+    # The budget sent is not usage; learning from it would ratchet upwards
+    assert session.calls[-1]["max_output_tokens"] == 512
+    assert not budgeter.samples.get("answer")
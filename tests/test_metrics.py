@@ -0,0 +1,59 @@
+from common import metrics
+from common.players import llm_answer_question
+from common.tournament import run_tournament
+
+
+class MockLLM:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def ask(self, *_args, **_kwargs):
+        return self.responses.pop(0)
+
+
+class ScriptedLLM:
+    def ask(self, messages, **_kwargs):
+        system = messages[0]["content"]
+        if "final guess" in system:
+            return "GUESS: cat"
+        if "ONLY answer yes/no" in system:
+            return "YES"
+        return "Is it alive?"
+
+
+def test_in_memory_sink_records_format_retries_and_turns():
+    sink = metrics.InMemorySink()
+    metrics.add_sink(sink)
+    try:
+        assert llm_answer_question(MockLLM(["hmm", "YES"]), "cat", "Is it alive?") == "yes"
+        report = run_tournament(1, workers=1, secrets=["cat"], llm=ScriptedLLM(), max_questions=3)
+    finally:
+        metrics.remove_sink(sink)
+
+    assert sink.counter("format_retries_total", call_site="answer") == 1
+    assert sink.counter("games_total", winner="player2") == 1
+    assert len(report.results[0].turn_times) == 3
+    assert sink.percentile("turn_seconds", 0.5, phase="question") is not None
+
+
+def test_histogram_percentiles_and_prometheus_text():
+    sink = metrics.InMemorySink()
+    for v in [0.02] * 98 + [3.0, 3.0]:
+        sink.observe("llm_call_seconds", v, {"call_site": "answer"})
+    sink.increment("llm_truncation_retries_total", 2, {"call_site": "answer"})
+
+    assert sink.percentile("llm_call_seconds", 0.5, call_site="answer") == 0.025
+    assert sink.percentile("llm_call_seconds", 0.99, call_site="answer") == 5.0
+    text = sink.prometheus_text()
+    assert 'llm_truncation_retries_total{call_site="answer"} 2' in text
+    assert 'llm_call_seconds_bucket{call_site="answer",le="+Inf"} 100' in text
+    assert 'llm_call_seconds_count{call_site="answer"} 100' in text
+
+
+def test_jsonl_sink_writes_one_event_per_line(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    sink = metrics.JsonlSink(str(path))
+    sink.observe("llm_call_seconds", 0.5, {"call_site": "question"})
+    sink.increment("games_total", 1, {"winner": "player1"})
+    sink.close()
+    assert len(path.read_text().splitlines()) == 2
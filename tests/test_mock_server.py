@@ -0,0 +1,93 @@
+import pytest
+
+from bench.bench_throughput import main as bench_main
+from common.game_models import early_guess_line, early_yes_no
+from common.llm_client import LLMClient
+from common.mock_server import MockConfig, MockResponsesServer
+from common.resilience import BackoffPolicy
+from common.players import llm_answer_question
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+
+
+def test_client_talks_to_mock_server(api_key):
+    config = MockConfig(latency_median=0, answers=["YES"])
+    with MockResponsesServer(config) as server:
+        llm = LLMClient(base_url=server.url, share_pool=False)
+        assert llm_answer_question(llm, "cat", "Is it alive?") == "yes"
+        llm.close()
+    assert server.request_count == 1
+
+
+def test_mock_server_truncation_is_retried(api_key):
+    config = MockConfig(latency_median=0, truncation_rate=1.0)
+    with MockResponsesServer(config) as server:
+        llm = LLMClient(base_url=server.url, share_pool=False)
+        with pytest.raises(RuntimeError):
+            llm.ask([{"role": "user", "content": "Secret object: cat"}])
+        llm.close()
+    assert server.request_count == 3
+
+
+def test_mock_server_injects_errors(api_key):
+    config = MockConfig(latency_median=0, error_rate=1.0, error_status=429)
+    with MockResponsesServer(config) as server:
+        backoff = BackoffPolicy(max_attempts=2, base_delay=0)
+        llm = LLMClient(base_url=server.url, share_pool=False, backoff=backoff)
+        with pytest.raises(RuntimeError, match="429"):
+            llm.ask([{"role": "user", "content": "hi"}])
+        llm.close()
+    assert server.request_count == 2
+
+
+def test_benchmark_reports_throughput(api_key):
+    results = bench_main(["--games", "2", "--workers", "2", "--latency", "0", "--calls", "2"])
+    assert results["games"] == 2
+    assert results["requests_per_game"] > 0
+    assert results["games_per_sec"] > 0
+
+
+def test_streamed_answer_exits_before_the_tail(api_key):
+    config = MockConfig(
+        latency_median=0, answers=["YES, because"], stream_chunk_delay=0.05, stream_tail_chunks=20
+    )
+    with MockResponsesServer(config) as server:
+        llm = LLMClient(base_url=server.url, share_pool=False)
+        result = llm.ask_stream(
+            [{"role": "user", "content": "Secret object: cat"}], early_exit=early_yes_no
+        )
+        llm.close()
+    assert result.value == "yes"
+    assert result.early_exit
+    # The 20 filler deltas would take a second to arrive
+    assert result.time_to_answer < 0.5
+
+
+def test_streamed_response_runs_to_completion(api_key):
+    config = MockConfig(latency_median=0, answers=["NO"])
+    with MockResponsesServer(config) as server:
+        llm = LLMClient(base_url=server.url, share_pool=False)
+        # Unterminated "NO" never triggers the early exit; the full text is parsed
+        assert llm_answer_question(llm, "cat", "Is it alive?", stream=True) == "no"
+        result = llm.ask_stream(
+            [{"role": "system", "content": "Make your final guess"},
+             {"role": "user", "content": "history"}],
+            early_exit=early_guess_line,
+        )
+        llm.close()
+    assert result.value is None
+    assert result.time_to_full == result.time_to_answer
+    assert result.text.startswith("GUESS:")
+
+
+def test_streamed_truncation_is_retried(api_key):
+    config = MockConfig(latency_median=0, truncation_rate=1.0)
+    with MockResponsesServer(config) as server:
+        llm = LLMClient(base_url=server.url, share_pool=False)
+        with pytest.raises(RuntimeError):
+            llm.ask_stream([{"role": "user", "content": "Secret object: cat"}])
+        llm.close()
+    assert server.request_count == 3
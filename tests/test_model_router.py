@@ -0,0 +1,71 @@
+import pytest
+
+from common.llm_client import LLMClient
+from common.game_engine import play_llm_vs_llm_game
+from common.model_router import ModelRouter
+from common.players import llm_answer_question
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self._data = {"status": "completed", "output": [{"content": [{"text": text}]}]}
+        self.text = text
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.models = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.models.append(json["model"])
+        return FakeResponse(self.replies.pop(0))
+
+
+def test_router_picks_tier_by_call_site_and_escalation():
+    router = ModelRouter({"answer": ["small", "large"]}, default_tiers=["medium"])
+    assert router.model_for("answer") == "small"
+    assert router.model_for("answer", escalation=1) == "large"
+    assert router.model_for("answer", escalation=5) == "large"
+    assert router.model_for("question") == "medium"
+    assert ModelRouter().model_for("answer", fallback="base") == "base"
+    with pytest.raises(ValueError):
+        ModelRouter({"answer": []})
+
+
+def test_format_retry_escalates_and_is_tracked(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    session = FakeSession(["Maybe, it depends.", "YES"])
+    router = ModelRouter({"answer": ["small", "large"]})
+    llm = LLMClient(session=session, router=router)
+
+    assert llm_answer_question(llm, "cat", "Is it alive?") == "yes"
+    assert session.models == ["small", "large"]
+
+    rows = {row["model"]: row for row in router.report()}
+    assert rows["small"]["calls"] == 1
+    assert rows["small"]["success_rate"] == 0.0
+    assert rows["large"]["success_rate"] == 1.0
+    assert rows["large"]["avg_seconds"] >= 0.0
+
+
+def test_unparseable_final_guess_retries_on_next_tier(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    session = FakeSession(["I think it might be a cat.", "GUESS: cat"])
+    router = ModelRouter({"final_guess": ["small", "large"]}, default_tiers=["medium"])
+    llm = LLMClient(session=session, router=router)
+
+    result = play_llm_vs_llm_game(
+        llm, secret="cat", max_questions=1, answerer=lambda *_: "no"
+    )
+
+    assert result.winner == "player2"
+    assert session.models == ["small", "large"]
+    rows = {row["model"]: row for row in router.report()}
+    assert rows["small"]["success_rate"] == 0.0
+    assert rows["large"]["success_rate"] == 1.0
@@ -0,0 +1,63 @@
+import pytest
+
+from common.game_models import GameState
+from common.players import FALLBACK_QUESTION
+from common.question_candidates import CandidateQuestioner, parse_candidates, score_candidate
+
+
+class CandidateLLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def ask(self, messages, **kwargs):
+        self.calls.append((messages, kwargs))
+        return self.reply
+
+
+def test_parse_candidates_strips_markers_and_sanitises():
+    text = "1. Is it alive\n- Does it have seeds (like an apple)?\n\n* Is it big?"
+    assert parse_candidates(text) == ["Is it alive?", "Does it have seeds ?", "Is it big?"]
+
+
+def test_picks_best_clean_candidate_in_one_call():
+    llm = CandidateLLM(
+        "Is it an animal, like a cat?\n"
+        "Is it a living thing?\n"
+        "Is it a dog?\n"
+        "Is it made of metal?"
+    )
+    state = GameState(history=[("Is it alive?", "yes")], num_questions_asked=1)
+    questioner = CandidateQuestioner(k=4)
+
+    # The paraphrase of an asked question and the direct guess rank below
+    # the new general question
+    assert questioner(llm, state) == "Is it made of metal?"
+    assert len(llm.calls) == 1
+    assert "produce 4 different candidate questions" in llm.calls[0][0][1]["content"]
+    assert questioner.stats.retries_avoided == 1
+    assert questioner.stats.rejected == 1
+    assert questioner.stats.turns == 1
+
+
+def test_falls_back_without_another_call():
+    llm = CandidateLLM("Is it red, like a tomato?\nDoes it fly, such as a bird?\nIs it e.g. food?")
+    questioner = CandidateQuestioner(k=3)
+    assert questioner(llm, GameState()) == FALLBACK_QUESTION
+    assert len(llm.calls) == 1
+    # The sequential chain would have tried twice more
+    assert questioner.stats.retries_avoided == 2
+    assert questioner.stats.fallbacks == 1
+
+
+def test_direct_guesses_rank_low_until_the_end():
+    early = score_candidate("Is it a cat?", [], remaining=15)
+    late = score_candidate("Is it a cat?", [], remaining=2)
+    general = score_candidate("Does it have fur?", [], remaining=15)
+    assert early < general
+    assert late == general
+
+
+def test_needs_at_least_two_candidates():
+    with pytest.raises(ValueError):
+        CandidateQuestioner(k=1)
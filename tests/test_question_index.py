@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from common.question_index import DedupAnswerer, question_signature
+
+
+class CountingAnswerer:
+    def __init__(self, answer="yes"):
+        self.answer = answer
+        self.calls = 0
+
+    def __call__(self, llm, secret, question):
+        self.calls += 1
+        return self.answer
+
+
+def test_signature_folds_paraphrases_but_keeps_negation():
+    assert question_signature("Is it alive?") == question_signature("Is it a living thing?")
+    assert question_signature("Is it found in kitchens?") == question_signature(
+        "Is the object typically found in a kitchen?"
+    )
+    assert question_signature("Is it not alive?")[1]
+    assert not question_signature("Is it alive?")[1]
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("Is it edible?", "Does it eat?"),
+        ("Is it eaten by people?", "Does it eat people?"),
+        ("Is a cat bigger than it?", "Is it bigger than a cat?"),
+        ("Does it live in water?", "Does it live on water?"),
+        ("Can you eat it?", "Can it eat you?"),
+    ],
+)
+def test_signature_keeps_direction(first, second):
+    assert question_signature(first) != question_signature(second)
+    inner = CountingAnswerer()
+    answerer = DedupAnswerer(inner, threshold=0.5)
+    answerer(None, "cat", first)
+    answerer(None, "cat", second)
+    assert inner.calls == 2
+    assert answerer.stats.hits == 0
+
+
+def test_paraphrase_is_served_from_the_index():
+    inner = CountingAnswerer()
+    answerer = DedupAnswerer(inner)
+    assert answerer(None, "cat", "Is it alive?") == "yes"
+    assert answerer(None, "cat", "Is it a living thing?") == "yes"
+    # Different secret, negated question and different content all miss
+    answerer(None, "dog", "Is it alive?")
+    answerer(None, "cat", "Is it not alive?")
+    answerer(None, "cat", "Is it bigger than a car?")
+    assert inner.calls == 4
+    assert answerer.stats.exact_hits == 1
+    assert answerer.stats.calls_avoided == 1
+    assert answerer.stats.hit_rate == pytest.approx(1 / 5)
+
+
+def test_fuzzy_match_respects_threshold():
+    inner = CountingAnswerer()
+    answerer = DedupAnswerer(inner, threshold=0.6)
+    answerer(None, "cat", "Does it have whiskers and a tail?")
+    answerer(None, "cat", "Does it have wiskers and a tail?")  # typo
+    answerer(None, "cat", "Does it have feathers and a tail?")
+    assert answerer.stats.fuzzy_hits == 1
+    assert inner.calls == 2
+
+
+def test_concurrent_duplicates_get_one_answer():
+    answers = iter(["yes", "no"] * 8)
+    answerer = DedupAnswerer(lambda llm, secret, q: next(answers))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: answerer(None, "cat", "Is it alive?"), range(8)))
+    assert len(set(results)) == 1
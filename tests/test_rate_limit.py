@@ -0,0 +1,108 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from common.llm_client import LLMClient
+from common.mock_server import MockConfig, MockResponsesServer
+from common.rate_limit import ConcurrencyController, FileTokenBucket, LocalTokenBucket
+from common.resilience import BackoffPolicy, post_with_policies
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = LocalTokenBucket(rate=50, burst=2)
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits[:2] == [0.0, 0.0]
+    assert time.monotonic() - start >= 3 / 50 * 0.9
+    empty = LocalTokenBucket(rate=0.1, burst=1)
+    empty.acquire()
+    with pytest.raises(RuntimeError):
+        empty.acquire(deadline_at=time.monotonic() + 0.01)
+
+
+def test_file_bucket_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "bucket")
+    first = FileTokenBucket(path, rate=0.1, burst=2)
+    second = FileTokenBucket(path, rate=0.1, burst=2)
+    first.acquire()
+    second.acquire()
+    # Both tokens are gone whichever instance asks next
+    with pytest.raises(RuntimeError):
+        first.acquire(deadline_at=time.monotonic() + 0.01)
+    first.close()
+    second.close()
+
+
+def test_aimd_grows_on_health_and_halves_on_overload():
+    ctl = ConcurrencyController(initial=4, max_limit=8)
+    for _ in range(4):
+        ctl.acquire()
+        ctl.release(0.01, ok=True)
+    assert ctl.limit == 4  # never saturated, no increase
+    for _ in range(4):
+        ctl.acquire()
+    for _ in range(4):
+        ctl.release(0.01, ok=True)
+    assert ctl.limit == 5
+    for _ in range(3):
+        ctl.acquire()
+        ctl.release(0.01, ok=False)
+    assert ctl.limit == 2  # one cut per window
+    assert ctl.stats.decreases == 1
+
+
+def test_controller_backs_off_a_capped_endpoint(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+    config = MockConfig(latency_median=0.01, latency_sigma=0, max_inflight=3)
+    ctl = ConcurrencyController(initial=8, max_limit=16)
+    with MockResponsesServer(config) as server:
+        llm = LLMClient(
+            base_url=server.url,
+            share_pool=False,
+            pool_size=16,
+            concurrency=ctl,
+            backoff=BackoffPolicy(max_attempts=6, base_delay=0.01),
+        )
+        messages = [{"role": "user", "content": "Secret object: cat\nQuestion: Is it alive?"}]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(lambda _: llm.ask(messages), range(60)))
+        llm.close()
+    assert ctl.stats.decreases >= 1
+    assert ctl.limit < 8
+
+
+class _StreamResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+
+
+class _StreamSession:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def post(self, url, json=None, headers=None, timeout=None, stream=False):
+        assert stream
+        return _StreamResponse(self.status_code)
+
+
+def test_streamed_response_holds_its_slot_until_closed():
+    ctl = ConcurrencyController(initial=4, max_limit=8)
+    deadline = time.monotonic() + 5
+    resp = post_with_policies(
+        _StreamSession(200), "http://x", {}, {}, deadline, None, stream=True, concurrency=ctl
+    )
+    assert ctl.in_flight == 1  # body still unread
+    resp.close()
+    resp.close()
+    assert ctl.in_flight == 0
+    assert resp.closed == 2
+
+    resp = post_with_policies(
+        _StreamSession(400), "http://x", {}, {}, deadline, None, stream=True, concurrency=ctl
+    )
+    assert ctl.in_flight == 0  # error bodies are not streamed
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from common.llm_client import LLMClient
+from common.resilience import BackoffPolicy, HedgePolicy, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="YES", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+    def json(self):
+        return {"status": "completed", "output": [{"content": [{"text": self.text}]}]}
+
+    def close(self):
+        pass
+
+
+class ScriptedSession:
+    """
+    Returns the scripted (delay, response) pairs in order, thread-safely.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        with self._lock:
+            delay, resp = self.script[min(self.calls, len(self.script) - 1)]
+            self.calls += 1
+        time.sleep(delay)
+        return resp
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_API_KEY", "test-key")
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_backoff_honours_retry_after_and_cap():
+    policy = BackoffPolicy(max_delay=5)
+    assert policy.delay(0, "3") == 3
+    assert policy.delay(0, "120") == 5
+    assert 0 <= policy.delay(3) <= 4
+
+
+def test_client_retries_retryable_statuses():
+    session = ScriptedSession([
+        (0, FakeResponse(503, headers={"Retry-After": "0"})),
+        (0, FakeResponse(429)),
+        (0, FakeResponse(200, "NO")),
+    ])
+    llm = LLMClient(session=session, backoff=BackoffPolicy(base_delay=0))
+    assert llm.ask([{"role": "user", "content": "q"}]) == "NO"
+    assert session.calls == 3
+
+
+def test_client_does_not_retry_client_errors():
+    session = ScriptedSession([(0, FakeResponse(400, "bad request"))])
+    llm = LLMClient(session=session, backoff=BackoffPolicy(base_delay=0))
+    with pytest.raises(RuntimeError, match="400"):
+        llm.ask([{"role": "user", "content": "q"}])
+    assert session.calls == 1
+
+
+def test_deadline_stops_backoff():
+    session = ScriptedSession([(0, FakeResponse(503, headers={"Retry-After": "5"}))])
+    llm = LLMClient(session=session, backoff=BackoffPolicy(max_delay=10))
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="503"):
+        llm.ask([{"role": "user", "content": "q"}], deadline=1.0)
+    assert time.monotonic() - start < 1.0
+
+
+def test_hedge_fires_for_slow_primary():
+    hedge = HedgePolicy(min_samples=3, min_delay=0.01)
+    for _ in range(3):
+        hedge.record_latency(0.01)
+    session = ScriptedSession([(0.5, FakeResponse(200, "SLOW")), (0, FakeResponse(200, "FAST"))])
+    llm = LLMClient(session=session, hedge=hedge, share_pool=False)
+    start = time.monotonic()
+    assert llm.ask([{"role": "user", "content": "q"}]) == "FAST"
+    assert time.monotonic() - start < 0.4
+    assert hedge.stats.fired == 1
+    assert hedge.stats.hedge_wins == 1
+    time.sleep(0.6)
+    assert hedge.stats.p99_saved() > 0.3
+    llm.close()
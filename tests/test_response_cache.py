@@ -0,0 +1,39 @@
+from common.response_cache import ResponseCache, cache_key
+
+
+def test_cache_key_depends_on_model_messages_and_budget():
+    messages = [{"role": "user", "content": "Is it alive?"}]
+    key = cache_key("m", messages, 512)
+    assert key == cache_key("m", [dict(m) for m in messages], 512)
+    assert key != cache_key("other", messages, 512)
+    assert key != cache_key("m", messages, 1024)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_memory_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats.memory_hits == 2
+    assert cache.stats.misses == 1
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = ResponseCache(path=path)
+    first.put("k", "YES")
+    first.close()
+
+    second = ResponseCache(path=path)
+    assert second.get("k") == "YES"
+    assert second.stats.disk_hits == 1
+    second.close()
+
+
+def test_expired_entries_are_misses():
+    cache = ResponseCache(ttl=-1)
+    cache.put("k", "YES")
+    assert cache.get("k") is None
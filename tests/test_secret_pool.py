@@ -0,0 +1,66 @@
+import threading
+
+from common.secret_pool import SecretPool
+
+
+class ListLLM:
+    """
+    Replies to object-list prompts with the next scripted batch.
+    """
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.calls = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def ask(self, messages, *_args, **_kwargs):
+        with self._lock:
+            self.calls += 1
+            self.prompts.append(messages[-1]["content"])
+            return self.batches.pop(0) if self.batches else ""
+
+
+def test_one_object_list_call_serves_many_games():
+    llm = ListLLM(["cat\ndog\napple\nchair\nguitar\nbanana"])
+    pool = SecretPool(low_water=0)
+    served = {pool(llm) for _ in range(6)}
+    assert served == {"cat", "dog", "apple", "chair", "guitar", "banana"}
+    assert llm.calls == 1
+    pool.close()
+
+
+def test_background_refill_starts_below_low_water():
+    llm = ListLLM(["cat\ndog\napple", "chair\nguitar"])
+    pool = SecretPool(low_water=3)
+    pool.take(llm)
+    pool._refill.result()  # the refill triggered by the take above
+    assert len(pool) == 4
+    assert llm.calls == 2
+    pool.close()
+
+
+def test_recent_and_duplicate_objects_are_dropped():
+    llm = ListLLM(["cat\nCat\ndog", "cat\ndog\nhorse"])
+    pool = SecretPool(low_water=0, recent_window=5)
+    first = {pool.take(llm), pool.take(llm)}
+    assert first == {"cat", "dog"}
+    assert pool.take(llm) == "horse"
+    assert pool.stats.repeats_dropped == 2
+    # The refill prompt asked the model to avoid recent objects
+    assert "cat" in llm.prompts[-1] and "dog" in llm.prompts[-1]
+    pool.close()
+
+
+def test_pool_is_persisted(tmp_path):
+    path = str(tmp_path / "pool.json")
+    pool = SecretPool(path=path, low_water=0)
+    pool.take(ListLLM(["cat\ndog\napple"]))
+    pool.close()
+
+    reloaded = SecretPool(path=path, low_water=0)
+    assert len(reloaded) == 2
+    llm = ListLLM([])
+    assert reloaded.take(llm) in {"cat", "dog", "apple"}
+    assert llm.calls == 0
+    reloaded.close()
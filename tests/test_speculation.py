@@ -0,0 +1,73 @@
+import pytest
+
+from common.game_engine import play_llm_vs_llm_game
+from common.game_models import GameState
+from common.speculation import SpeculativeQuestioner
+
+
+def _generate(_llm, state):
+    if not state.history:
+        return "Is it alive?"
+    return f"After {state.history[-1][1]}?"
+
+
+def test_speculative_questioner_uses_matching_branch():
+    spec = SpeculativeQuestioner(llm=None, generate=_generate)
+    state = GameState()
+    question = spec.next_question(state)
+    spec.prefetch(state, question)
+
+    state.history.append((question, "no"))
+    state.num_questions_asked += 1
+    assert spec.next_question(state) == "After no?"
+    spec.close()
+
+    assert spec.stats.prefetched == 2
+    assert spec.stats.used == 1
+    assert spec.stats.discarded == 1
+
+
+def test_speculative_questioner_skips_prefetch_before_final_guess():
+    spec = SpeculativeQuestioner(llm=None, generate=_generate)
+    state = GameState(max_questions=3, num_questions_asked=1)
+    spec.prefetch(state, "Is it alive?")
+    spec.close()
+    assert spec.stats.prefetched == 0
+
+
+def test_aborted_game_closes_the_speculator(monkeypatch):
+    closed = []
+    monkeypatch.setattr(SpeculativeQuestioner, "close", lambda self: closed.append(self))
+
+    def checkpoint(state):
+        if state.history:
+            raise RuntimeError("lease lost")
+
+    with pytest.raises(RuntimeError, match="lease lost"):
+        play_llm_vs_llm_game(
+            None,
+            secret="cat",
+            answerer=lambda *_: "no",
+            questioner=_generate,
+            speculative=True,
+            checkpoint=checkpoint,
+        )
+    assert len(closed) == 1
+
+
+def test_failed_prefetch_is_not_counted_as_used():
+    def generate(_llm, state):
+        if state.history:
+            raise RuntimeError("LLM down")
+        return "Is it alive?"
+
+    spec = SpeculativeQuestioner(llm=None, generate=generate)
+    state = GameState()
+    question = spec.next_question(state)
+    spec.prefetch(state, question)
+    state.history.append((question, "yes"))
+    state.num_questions_asked += 1
+    with pytest.raises(RuntimeError):
+        spec.next_question(state)
+    spec.close()
+    assert spec.stats.used == 0
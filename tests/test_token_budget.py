@@ -0,0 +1,33 @@
+from common.token_budget import MIN_SAMPLES, TokenBudgeter
+
+
+def test_budgeter_uses_default_until_enough_samples():
+    budgeter = TokenBudgeter()
+    for _ in range(MIN_SAMPLES - 1):
+        budgeter.record("answer", 40, truncations=0, default=512, start_budget=512)
+    assert budgeter.initial_budget("answer", 512, 4096) == 512
+
+
+def test_budgeter_learns_high_quantile_with_headroom():
+    budgeter = TokenBudgeter()
+    for used in [100] * 19 + [900]:
+        budgeter.record("question", used, truncations=0, default=512, start_budget=512)
+    # p95 of the samples is 100 -> 125 with headroom -> rounded to 128
+    assert budgeter.initial_budget("question", 512, 4096) == 128
+
+    for _ in range(20):
+        budgeter.record("final_guess", 900, truncations=1, default=512, start_budget=512)
+    assert budgeter.initial_budget("final_guess", 512, 4096) == 1152
+    assert budgeter.stats["final_guess"].truncation_retries == 20
+
+
+def test_budgeter_persists_samples(tmp_path):
+    path = str(tmp_path / "budgets.json")
+    budgeter = TokenBudgeter(path=path)
+    for _ in range(MIN_SAMPLES):
+        budgeter.record("answer", 700, truncations=0, default=512, start_budget=1024)
+    budgeter.save()
+
+    reloaded = TokenBudgeter(path=path)
+    assert reloaded.initial_budget("answer", 512, 4096) == 896
+    assert reloaded.stats["answer"].retries_avoided == MIN_SAMPLES
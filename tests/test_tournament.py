@@ -0,0 +1,44 @@
+from common.tournament import run_tournament
+
+
+class ScriptedLLM:
+    """
+    Thread-safe fake: always asks the same question, answers YES,
+    and guesses 'cat'.
+    """
+
+    def ask(self, messages, **_kwargs):
+        system = messages[0]["content"]
+        if "final guess" in system:
+            return "GUESS: cat"
+        if "ONLY answer yes/no" in system:
+            return "YES"
+        return "Is it alive?"
+
+
+def test_run_tournament_returns_results_in_order():
+    report = run_tournament(
+        4, workers=2, secrets=["cat", "dog"], llm=ScriptedLLM(), max_questions=3
+    )
+    assert [r.secret_object for r in report.results] == ["cat", "dog", "cat", "dog"]
+    assert [r.winner for r in report.results] == ["player2", "player1"] * 2
+    assert all(r.num_turns == 2 for r in report.results)
+    assert report.results[0].history == [("Is it alive?", "yes")] * 2
+    assert report.questioner_win_rate == 0.5
+    assert report.games_per_minute > 0
+
+
+def test_run_tournament_speculative_mode_matches_plain_results():
+    report = run_tournament(
+        2, workers=2, secrets=["cat"], llm=ScriptedLLM(), max_questions=5, speculative=True
+    )
+    assert [r.winner for r in report.results] == ["player2", "player2"]
+    assert all(r.speculation.used == 3 for r in report.results)
+
+
+def test_run_tournament_compact_history_reports_savings():
+    report = run_tournament(
+        1, workers=1, secrets=["cat"], llm=ScriptedLLM(), compact_history=True
+    )
+    assert report.results[0].winner == "player2"
+    assert report.prompt_tokens_saved > 0
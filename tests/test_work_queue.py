@@ -0,0 +1,122 @@
+import time
+
+import pytest
+
+from common.game_engine import play_llm_vs_llm_game
+from common.game_log import GameLogReader, GameLogWriter
+from common.game_models import GameState
+from common.work_queue import LeaseLost, WorkQueue, export_results, run_worker
+
+
+class CountingLLM:
+    """
+    Numbers its questions, answers YES and guesses 'cat'.
+    """
+
+    def __init__(self):
+        self.questions = 0
+        self.model = "fake"
+
+    def ask(self, messages, **_kwargs):
+        system = messages[0]["content"]
+        if "final guess" in system:
+            return "GUESS: cat"
+        if "ONLY answer yes/no" in system:
+            return "YES"
+        self.questions += 1
+        return f"Is it question {self.questions}?"
+
+    def close(self):
+        pass
+
+
+def test_enqueue_is_idempotent_and_acked_jobs_are_not_leased_again(tmp_path):
+    queue = WorkQueue(str(tmp_path / "q.db"))
+    assert queue.enqueue([("m", "cat", 0), ("m", "dog", 0)]) == 2
+    assert queue.enqueue([("m", "cat", 0)]) == 0
+    first = queue.lease("w1")
+    second = queue.lease("w2")
+    assert (first.secret, second.secret) == ("cat", "dog")
+    assert queue.lease("w3") is None
+    assert queue.ack(first, {"winner": "player2"})
+    assert not queue.ack(first, {"winner": "player2"})
+    queue.fail(second, "boom")
+    assert queue.lease("w3").secret == "dog"
+    assert queue.counts() == {"done": 1, "leased": 1}
+
+
+def test_expired_lease_is_fenced_off(tmp_path):
+    queue = WorkQueue(str(tmp_path / "q.db"), lease_seconds=0.05)
+    queue.enqueue([("m", "cat", 0)])
+    stale = queue.lease("w1")
+    time.sleep(0.1)
+    fresh = queue.lease("w2")
+    assert fresh.job_id == stale.job_id and fresh.attempt == 2
+    with pytest.raises(LeaseLost):
+        queue.checkpoint(stale, GameState(secret_object="cat"))
+    assert not queue.ack(stale, {})
+    assert queue.ack(fresh, {})
+
+
+def test_interrupted_game_resumes_from_checkpoint(tmp_path):
+    queue = WorkQueue(str(tmp_path / "q.db"))
+    queue.enqueue([("m", "cat", 0)])
+
+    # First worker dies after three answered turns
+    lease = queue.lease("w1")
+
+    def crash_after_three(state):
+        queue.checkpoint(lease, state)
+        if len(state.history) == 3:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        play_llm_vs_llm_game(
+            CountingLLM(), secret="cat", max_questions=6, checkpoint=crash_after_three
+        )
+    queue.fail(lease, "worker died")
+
+    llm = CountingLLM()
+    log_path = str(tmp_path / "games.tqlog")
+    writer = GameLogWriter(log_path)
+    assert run_worker(queue, lambda model: llm, owner="w2", game_log=writer, max_questions=6) == 1
+    writer.close()
+
+    # Only the two remaining questions were asked again
+    assert llm.questions == 2
+    (_model, secret, _seed, result), = queue.results()
+    assert [q for q, _ in result["history"]][:3] == [f"Is it question {i}?" for i in (1, 2, 3)]
+    assert result["winner"] == "player2"
+    with GameLogReader(log_path) as reader:
+        assert [model for model, _ in reader.iter_games()] == ["m"]
+
+
+def test_finished_game_is_acked_before_it_is_logged(tmp_path, monkeypatch):
+    queue = WorkQueue(str(tmp_path / "q.db"))
+    queue.enqueue([("m", "cat", 0)])
+    log_path = str(tmp_path / "games.tqlog")
+    writer = GameLogWriter(log_path)
+
+    def crash(*_args, **_kwargs):
+        raise KeyboardInterrupt
+
+    # The worker dies between acking and writing the log
+    monkeypatch.setattr(writer, "append_result", crash)
+    with pytest.raises(KeyboardInterrupt):
+        run_worker(queue, lambda model: CountingLLM(), owner="w1", game_log=writer, max_questions=4)
+    writer.close()
+
+    # The game is done and is not played again
+    assert queue.counts() == {"done": 1}
+    assert run_worker(queue, lambda model: CountingLLM(), owner="w2") == 0
+
+    # The queue rebuilds the log with every finished game exactly once
+    export_path = str(tmp_path / "export.tqlog")
+    exporter = GameLogWriter(export_path)
+    assert export_results(queue, exporter) == 1
+    exporter.close()
+    with GameLogReader(export_path) as reader:
+        [(model, game)] = list(reader.iter_games())
+        assert model == "m"
+        assert reader.string(game.secret_id) == "cat"
+        assert game.num_questions == 3